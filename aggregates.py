@@ -0,0 +1,189 @@
+import sqlite3
+
+import pandas as pd
+
+from db import PITCH_TABLE, column_list, partition
+
+PITCH_TYPE_COLUMNS = ['RelSpeed', 'SpinRate', 'HorzBreak', 'InducedVertBreak', 'ExitSpeed', 'Angle']
+
+PITCH_TYPE_TABLE = 'agg_pitch_type'
+HITTER_RV_TABLE = 'agg_hitter_rv'
+META_TABLE = 'agg_meta'
+
+SOURCE_COLUMNS = ['Date', 'Pitcher', 'Batter', 'AutoPitchType', 'PitcherThrows', 'RV'] + PITCH_TYPE_COLUMNS
+
+_current = {}
+
+
+def pitch_type_sums(pitches_df):
+    values = pitches_df[PITCH_TYPE_COLUMNS].astype('float64')
+    parts = {'pitches': pd.Series(1, index=pitches_df.index)}
+    for column in PITCH_TYPE_COLUMNS:
+        parts[f'{column}_sum'] = values[column].fillna(0)
+        parts[f'{column}_count'] = values[column].notna().astype('int64')
+    keys = pitches_df[['Pitcher', 'AutoPitchType']].astype(object)
+    sums = pd.concat([keys, pd.DataFrame(parts)], axis=1)
+    return sums.groupby(['Pitcher', 'AutoPitchType'], dropna=False).sum().reset_index()
+
+
+def hitter_rv_sums(pitches_df):
+    rv = pitches_df['RV'].astype('float64')
+    sums = pitches_df[['Batter', 'AutoPitchType', 'PitcherThrows']].astype(object).assign(
+        RV_sum=rv.fillna(0), RV_count=rv.notna().astype('int64'))
+    return sums.groupby(['Batter', 'AutoPitchType', 'PitcherThrows']).sum().reset_index()
+
+
+def merge_sums(existing_df, new_df, keys):
+    if existing_df is None or existing_df.empty:
+        return new_df
+    return pd.concat([existing_df, new_df]).groupby(keys, dropna=False).sum().reset_index()
+
+
+def pitch_type_means(sums_df):
+    means = sums_df[['AutoPitchType']].copy()
+    for column in PITCH_TYPE_COLUMNS:
+        means[column] = sums_df[f'{column}_sum'] / sums_df[f'{column}_count'].where(sums_df[f'{column}_count'] > 0)
+    return means
+
+
+def hitter_rv_means(sums_df):
+    return pd.DataFrame({
+        'AutoPitchType': sums_df['AutoPitchType'],
+        'PitcherThrows': sums_df['PitcherThrows'],
+        'mean': sums_df['RV_sum'] / sums_df['RV_count'].where(sums_df['RV_count'] > 0),
+        'count': sums_df['RV_count'],
+    })
+
+
+def read_player_sums(database, table, role, name):
+    try:
+        return database.read_sql(f"SELECT * FROM '{table}' WHERE {role} = ? ORDER BY AutoPitchType", (name,))
+    except (sqlite3.Error, pd.errors.DatabaseError):
+        return None
+
+
+def pitch_table_rows(conn, season):
+    return conn.execute(f"SELECT COUNT(*), MAX(rowid) FROM '{partition(PITCH_TABLE, season)}'").fetchone()
+
+
+def pitch_table_version(conn, season):
+    count, last_row = pitch_table_rows(conn, season)
+    return f'{count}:{last_row}'
+
+
+def aggregates_current(database, season):
+    version = database.version()
+    cached = _current.get((database.db_location, season))
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    conn = database.connection()
+    try:
+        stored = conn.execute(f"SELECT value FROM '{META_TABLE}' WHERE key = ?",
+                              (f'source_version_{season}',)).fetchone()
+        current = stored is not None and stored[0] == pitch_table_version(conn, season)
+    except sqlite3.Error:
+        current = False
+    _current[(database.db_location, season)] = (version, current)
+    return current
+
+
+def _season_sums(database, table, role, name, seasons, keys):
+    sums_df = None
+    for season in seasons:
+        if not aggregates_current(database, season):
+            return None
+        part = read_player_sums(database, partition(table, season), role, name)
+        if part is None:
+            return None
+        if not part.empty:
+            sums_df = merge_sums(sums_df, part, keys)
+    return sums_df
+
+
+def pitcher_pitch_types(database, selected_pitcher, pitches_df, seasons, filtered=False):
+    if filtered:
+        return pitch_type_sums(pitches_df)
+    sums_df = _season_sums(database, PITCH_TYPE_TABLE, 'Pitcher', selected_pitcher, seasons,
+                           ['Pitcher', 'AutoPitchType'])
+    if sums_df is None or sums_df.empty:
+        sums_df = pitch_type_sums(pitches_df)
+    return sums_df
+
+
+def hitter_rv_by_pitch(database, selected_batter_name, hitter_df, seasons, filtered=False):
+    if filtered:
+        return hitter_rv_sums(hitter_df)
+    sums_df = _season_sums(database, HITTER_RV_TABLE, 'Batter', selected_batter_name, seasons,
+                           ['Batter', 'AutoPitchType', 'PitcherThrows'])
+    if sums_df is None or sums_df.empty:
+        sums_df = hitter_rv_sums(hitter_df)
+    return sums_df
+
+
+def _read_existing(conn, table):
+    try:
+        return pd.read_sql_query(f"SELECT * FROM '{table}'", conn)
+    except (sqlite3.Error, pd.errors.DatabaseError):
+        return None
+
+
+def aggregated_through(conn, season):
+    conn.execute(f"CREATE TABLE IF NOT EXISTS '{META_TABLE}' (key TEXT PRIMARY KEY, value TEXT)")
+    row = conn.execute(f"SELECT value FROM '{META_TABLE}' WHERE key = ?", (f'last_rowid_{season}',)).fetchone()
+    return None if row is None else int(row[0])
+
+
+def _set_meta(conn, key, value):
+    conn.execute(f"INSERT OR REPLACE INTO '{META_TABLE}' VALUES (?, ?)", (key, value))
+
+
+def refresh_aggregates(database, season, full=False):
+    source_table = partition(PITCH_TABLE, season)
+    pitch_type_table = partition(PITCH_TYPE_TABLE, season)
+    hitter_rv_table = partition(HITTER_RV_TABLE, season)
+    conn = database.write_connection()
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        count, last_rowid = pitch_table_rows(conn, season)
+        source_version = f'{count}:{last_rowid}'
+        since = None if full else aggregated_through(conn, season)
+
+        existing_types = existing_rv = None
+        if since is not None:
+            existing_types = _read_existing(conn, pitch_type_table)
+            existing_rv = _read_existing(conn, hitter_rv_table)
+            new_rows = conn.execute(f"SELECT COUNT(*) FROM '{source_table}' WHERE rowid > ?", (since,)).fetchone()[0]
+            aggregated = None if existing_types is None else int(existing_types['pitches'].sum())
+            if existing_rv is None or aggregated is None or aggregated + new_rows != count:
+                since = existing_types = existing_rv = None
+
+        existing = set(database.table_columns(source_table))
+        columns = [column for column in SOURCE_COLUMNS if column in existing]
+        query = f"SELECT {column_list(columns)} FROM '{source_table}'"
+        if since is None:
+            new_df = pd.read_sql_query(query, conn)
+        else:
+            new_df = pd.read_sql_query(query + " WHERE rowid > ?", conn, params=(since,))
+
+        if new_df.empty:
+            if since is None:
+                conn.execute(f"DROP TABLE IF EXISTS '{pitch_type_table}'")
+                conn.execute(f"DROP TABLE IF EXISTS '{hitter_rv_table}'")
+            _set_meta(conn, f'last_rowid_{season}', str(last_rowid or 0))
+            _set_meta(conn, f'source_version_{season}', source_version)
+            conn.commit()
+            return 0
+
+        pitch_types = merge_sums(existing_types, pitch_type_sums(new_df), ['Pitcher', 'AutoPitchType'])
+        hitter_rv = merge_sums(existing_rv, hitter_rv_sums(new_df), ['Batter', 'AutoPitchType', 'PitcherThrows'])
+
+        pitch_types.to_sql(pitch_type_table, conn, if_exists='replace', index=False)
+        hitter_rv.to_sql(hitter_rv_table, conn, if_exists='replace', index=False)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS 'idx_{pitch_type_table}_pitcher' ON '{pitch_type_table}' (Pitcher)")
+        conn.execute(f"CREATE INDEX IF NOT EXISTS 'idx_{hitter_rv_table}_batter' ON '{hitter_rv_table}' (Batter)")
+        _set_meta(conn, f'last_rowid_{season}', str(last_rowid))
+        _set_meta(conn, f'source_version_{season}', source_version)
+        conn.commit()
+        return len(new_df)
+    finally:
+        conn.close()
@@ -1,49 +1,111 @@
-from flask import Flask, render_template, request, jsonify
-import sqlite3
-import pandas as pd
+import hmac
+from functools import partial
+
+from flask import Flask, abort, render_template, request, jsonify
+import click
+
+from aggregates import (PITCH_TYPE_COLUMNS, hitter_rv_by_pitch, hitter_rv_means, pitch_type_means,
+                        pitcher_pitch_types, refresh_aggregates)
+from batted_ball import batted_ball_profile, batted_ball_profiles
+from comps import DEFAULT_COMPS, MAX_COMPS, CompEngine
+from db import PITCH_TABLE, Database, partition
+from framing import FramingEngine
+from heatmap import MAX_VELOCITY_BINS, league_velocity_thresholds, velo_grid
+from ingest import INGEST_CHUNK_ROWS, ingest_files
+from leaderboards import leaderboard_page
+from metrics import Metrics
+from payloads import compress_response, encode_frame, get_data_format
+from percentiles import PercentileEngine, get_percentile_options
+from prerender import ROSTER_COLUMNS, ROSTER_PARAMS, player_digests, prerender
+from prewarm import PREWARM_TOP_N, Prewarmer
+from pitch_store import SeasonPitchStores
+from response_cache import ResponseCache, cached_view
+from rosters import RosterIndex
+from search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, SEARCH_ROLES, PlayerSearch
+from seasons import get_seasons, read_seasons
+from splits import get_pitch_filter
+from umpires import EDGES, UmpireEngine
+from zone_grid import (BIG_ZONE, CALLED_PITCHES, UMPIRE_CHART_ZONE, called_pitch_grid, get_resolution, get_zone,
+                       in_zone)
 
 app = Flask(__name__)
+app.config.from_prefixed_env()
 db_location = "Frontier League.db"
+shared_pitch_dir = "pitch_columns"
+database = Database(db_location)
+for season in database.seasons():
+    database.ensure_indexes(partition(PITCH_TABLE, season))
+pitch_stores = SeasonPitchStores(database, shared_dir=shared_pitch_dir)
+percentile_engine = PercentileEngine(pitch_stores)
+framing_engine = FramingEngine(pitch_stores)
+umpire_engine = UmpireEngine(pitch_stores)
+comp_engine = CompEngine(pitch_stores)
+rosters = RosterIndex(database, db_location + '.rosters.json')
+player_search = PlayerSearch(database, rosters)
+response_cache = ResponseCache()
+metrics = Metrics(app, slow_request_ms=app.config.get('SLOW_REQUEST_MS'))
+prewarmer = Prewarmer(app, database.version, top_n=app.config.get('PREWARM_TOP_N', PREWARM_TOP_N))
+cached = cached_view(response_cache, database.version, prewarmer)
+metrics.register('flsavant_response_cache_bytes', 'gauge', 'Bytes held by the response cache.',
+                 lambda: response_cache.stats()['bytes'])
+metrics.register('flsavant_response_cache_hits_total', 'counter', 'Response cache hits.',
+                 lambda: response_cache.stats()['hits'])
+metrics.register('flsavant_response_cache_misses_total', 'counter', 'Response cache misses.',
+                 lambda: response_cache.stats()['misses'])
+metrics.register('flsavant_prewarm_renders_total', 'counter', 'Responses recomputed in the background.',
+                 lambda: prewarmer.stats()['renders'])
+metrics.register('flsavant_prewarm_failures_total', 'counter', 'Background recomputes that raised.',
+                 lambda: prewarmer.stats()['failures'])
+metrics.register('flsavant_prewarm_pending', 'gauge', 'Background recomputes queued or running.',
+                 lambda: prewarmer.stats()['pending'])
+app.after_request(compress_response)
+
+
+def read(name, *params):
+    return read_seasons(database, name, params, get_seasons(database))
+
+
+def percentiles_data(role, name, savant):
+    options = get_percentile_options(live=savant.empty)
+    if options is None:
+        return {'success': True, 'data': savant.to_dict(orient='records')}
+
+    live = percentile_engine.percentiles(role, name, get_seasons(database), **options)
+    if live is None:
+        return {'success': False, 'message': 'No pitches found for the selected player'}
+    snapshot = savant.to_dict(orient='records')[0] if not savant.empty else dict.fromkeys(savant.columns)
+    if options['pitch_filter'] is not None:
+        snapshot = dict.fromkeys(snapshot)
+    return {'success': True, 'data': [{**snapshot, **live}]}
 
-fastballs = ['Fastball', 'Sinker', 'Cutter']
-offspeed = ['Changeup', 'Splitter']
-breaking = ['Slider', 'Curveball']
 
 """ Pitcher Endpoints and Functions """
 
 
-def get_pitchers(min_pitch_count=100):
-    conn = sqlite3.connect(db_location)
-    try:
-        query = f"SELECT Pitcher, COUNT(*) as pitch_count FROM 'fl_pbp_23' GROUP BY Pitcher HAVING pitch_count >= {min_pitch_count}"
-        pitchers_df = pd.read_sql_query(query, conn).dropna(subset=['Pitcher'])
-        return pitchers_df['Pitcher'].tolist()
-    finally:
-        conn.close()
+def get_pitchers(season, min_pitch_count=100):
+    pitchers_df = database.read('pitchers', min_pitch_count, season=season).dropna(subset=['Pitcher'])
+    return pitchers_df['Pitcher'].tolist()
 
 
-pitchers = get_pitchers(300)
+rosters.register('pitchers', partial(get_pitchers, min_pitch_count=300))
 
 
-def get_pitch_data(selected_pitcher):
-    conn = sqlite3.connect(db_location)
-    try:
-        query = f"SELECT * FROM 'fl_pbp_23' WHERE Pitcher = ?"
-        pitches_df = pd.read_sql_query(
-            query, conn, params=[selected_pitcher]).sort_values('Date', ascending=True)
-        return pitches_df
-    finally:
-        conn.close()
+def get_pitch_data(selected_pitcher, columns=None):
+    return pitch_stores.rows('Pitcher', selected_pitcher, get_seasons(database), columns, get_pitch_filter())
 
 
-def calculate_pitch_distribution(pitches_df):
+def get_pitch_types(selected_pitcher, pitches_df):
+    return pitcher_pitch_types(database, selected_pitcher, pitches_df, get_seasons(database),
+                               get_pitch_filter() is not None)
+
+
+def calculate_pitch_distribution(pitch_types_df):
     pitch_distribution = {}
-    unique_pitch_names = pitches_df[~pitches_df.AutoPitchType.isna(
-    )].AutoPitchType.unique()
+    total_pitches = pitch_types_df['pitches'].sum()
+    named_pitch_types = pitch_types_df.dropna(subset=['AutoPitchType'])
 
-    for pitch_name in unique_pitch_names:
-        pitch_count = (pitches_df['AutoPitchType'] == pitch_name).sum()
-        pitch_percentage = pitch_count / len(pitches_df) * 100
+    for pitch_name, pitch_count in zip(named_pitch_types['AutoPitchType'], named_pitch_types['pitches']):
+        pitch_percentage = pitch_count / total_pitches * 100
         pitch_distribution[pitch_name] = {
             'percentage': pitch_percentage, 'count': pitch_count}
 
@@ -54,20 +116,12 @@ def calculate_pitch_distribution(pitches_df):
     return sorted_pitch_distribution
 
 
-def categorize_pitch_group(pitch_type):
-    if pitch_type in fastballs:
-        return 'Fastball'
-    elif pitch_type in breaking:
-        return 'Breaking'
-    elif pitch_type in offspeed:
-        return 'Offspeed'
-
+def pitcher_summary_data(selected_pitcher, pitches_df, pitch_types_df):
+    if pitches_df.empty:
+        return {'summary': f"<strong>{selected_pitcher}</strong> has not thrown a pitch in this sample.",
+                'teamAndHand': ''}
 
-@app.route('/pitch_summary', methods=['POST'])
-def pitch_summary():
-    selected_pitcher = request.form.get('Pitcher')
-    pitches_df = get_pitch_data(selected_pitcher)
-    pitch_distribution = calculate_pitch_distribution(pitches_df)
+    pitch_distribution = calculate_pitch_distribution(pitch_types_df)
 
     summary_sentence = f"<strong>{selected_pitcher}</strong> relies on {len(pitch_distribution)} pitches. "
 
@@ -81,500 +135,567 @@ def pitch_summary():
     hand = 'RHP' if pitches_df['PitcherThrows'].iloc[0] == 'Right' else 'LHP'
     team_hand = hand + ', ' + team
 
-    return jsonify({'summary': summary_sentence.strip(), 'teamAndHand': team_hand})
+    return {'summary': summary_sentence.strip(), 'teamAndHand': team_hand}
 
 
-@app.route('/update_pitcher_table', methods=['POST'])
-def update_pitcher_table():
-    selected_pitcher = request.form.get('Pitcher')
-
-    with sqlite3.connect(db_location) as conn:
-        query = f"SELECT * FROM 'fl_pbp_23' WHERE Pitcher = '{selected_pitcher}'"
-        pitches_df = pd.read_sql_query(query, conn)
+def pitcher_table_data(pitch_types_df):
+    pitch_stats = pitch_type_means(pitch_types_df).dropna()
 
-        pitch_stats = pitches_df.groupby('AutoPitchType')[
-            ['RelSpeed', 'SpinRate', 'HorzBreak', 'InducedVertBreak', 'ExitSpeed',
-             'Angle']].mean().reset_index().dropna()
+    return {'success': True, 'data': pitch_stats.to_dict(orient='records')}
 
-        data = pitch_stats.to_dict(orient='records')
 
-    return jsonify({'success': True, 'data': data})
-
-
-@app.route('/update_pitcher_stats', methods=['POST'])
-def update_pitcher_stats():
+def pitcher_stats_data(selected_pitcher):
     try:
-        selected_pitcher = request.form.get('Pitcher')
-
-        with sqlite3.connect(db_location) as conn:
-            query = "SELECT * FROM pitching_bref WHERE Name = ?"
-            pitches_df = pd.read_sql_query(
-                query, conn, params=(selected_pitcher,)).dropna()
+        pitches_df = database.read('pitcher_stats', selected_pitcher).dropna()
 
         if not pitches_df.empty:
             data = pitches_df.to_dict(orient='records')
-            return jsonify({'success': True, 'data': data})
+            return {'success': True, 'data': data}
         else:
-            return jsonify({'success': False, 'message': 'No data found for the selected pitcher'})
+            return {'success': False, 'message': 'No data found for the selected pitcher'}
 
     except Exception as e:
-        return jsonify({'success': False, 'message': str(e)})
-
-
-@app.route('/update_pitch_chart', methods=['POST'])
-def update_pitch_chart():
-    selected_pitcher = request.form.get('Pitcher')
+        return {'success': False, 'message': str(e)}
 
-    with sqlite3.connect(db_location) as conn:
-        query = f"SELECT AutoPitchType, InducedVertBreak, HorzBreak FROM 'fl_pbp_23' WHERE Pitcher = '{selected_pitcher}'"
-        pitches_df = pd.read_sql_query(query, conn)
 
+def pitch_chart_data(pitches_df, data_format='records'):
     pitch_counts = pitches_df['AutoPitchType'].value_counts()
     selected_pitches = pitch_counts[pitch_counts >= 15].index
     pitches_df = pitches_df[pitches_df['AutoPitchType'].isin(selected_pitches)]
 
     chart_data = pitches_df[['AutoPitchType', 'InducedVertBreak', 'HorzBreak']].dropna(
-        subset=['AutoPitchType', 'InducedVertBreak', 'HorzBreak']).to_dict(
-        orient='records')
+        subset=['AutoPitchType', 'InducedVertBreak', 'HorzBreak'])
 
-    return jsonify({'success': True, 'data': chart_data})
+    return {'success': True, 'data': encode_frame(chart_data, data_format)}
 
 
-@app.route('/update_pitcher_percentiles', methods=['POST'])
-def update_pitcher_percentiles():
-    with sqlite3.connect(db_location) as conn:
-        selected_pitcher = request.form.get('Pitcher')
-        query = f"SELECT * FROM 'fl_savant_stats' WHERE Name = '{selected_pitcher}'"
-        savant = pd.read_sql_query(query, conn).dropna()
+def pitcher_percentiles_data(selected_pitcher):
+    savant = read('pitcher_percentiles', selected_pitcher).dropna()
+
+    return percentiles_data('Pitcher', selected_pitcher, savant)
+
+
+def pitcher_rv_data(selected_pitcher):
+    rv = read('pitcher_rv', selected_pitcher).dropna()
+
+    return {'success': True, 'data': rv.to_dict(orient='records')}
+
+
+@app.route('/pitch_summary', methods=['GET', 'POST'])
+@cached
+def pitch_summary():
+    selected_pitcher = request.values.get('Pitcher')
+    pitches_df = get_pitch_data(selected_pitcher)
+    pitch_types_df = get_pitch_types(selected_pitcher, pitches_df)
+    return jsonify(pitcher_summary_data(selected_pitcher, pitches_df, pitch_types_df))
 
-    return jsonify({'success': True, 'data': savant.to_dict(orient='records')})
 
+@app.route('/update_pitcher_table', methods=['GET', 'POST'])
+@cached
+def update_pitcher_table():
+    selected_pitcher = request.values.get('Pitcher')
+    pitches_df = get_pitch_data(selected_pitcher, ['Pitcher', 'AutoPitchType'] + PITCH_TYPE_COLUMNS)
+    pitch_types_df = get_pitch_types(selected_pitcher, pitches_df)
+    return jsonify(pitcher_table_data(pitch_types_df))
+
+
+@app.route('/update_pitcher_stats', methods=['GET', 'POST'])
+@cached
+def update_pitcher_stats():
+    selected_pitcher = request.values.get('Pitcher')
+    return jsonify(pitcher_stats_data(selected_pitcher))
+
+
+@app.route('/update_pitch_chart', methods=['GET', 'POST'])
+@cached
+def update_pitch_chart():
+    selected_pitcher = request.values.get('Pitcher')
+    pitches_df = get_pitch_data(
+        selected_pitcher, ['AutoPitchType', 'InducedVertBreak', 'HorzBreak'])
+    return jsonify(pitch_chart_data(pitches_df, get_data_format()))
 
-@app.route('/update_yakker_pitcher', methods=['POST'])
+
+@app.route('/update_pitcher_percentiles', methods=['GET', 'POST'])
+@cached
+def update_pitcher_percentiles():
+    selected_pitcher = request.values.get('Pitcher')
+    return jsonify(pitcher_percentiles_data(selected_pitcher))
+
+
+@app.route('/update_yakker_pitcher', methods=['GET', 'POST'])
+@cached
 def update_yakker_pitcher():
-    with sqlite3.connect(db_location) as conn:
-        selected_pitcher = request.form.get('Pitcher')
-        query = f"SELECT * FROM 'yakker_23' WHERE Pitcher = '{selected_pitcher}'"
-        yakker = pd.read_sql_query(query, conn).dropna()
+    selected_pitcher = request.values.get('Pitcher')
+    yakker = read('pitcher_yakker', selected_pitcher).dropna()
 
     return jsonify({'success': True, 'data': yakker.to_dict(orient='records')})
 
 
-@app.route('/update_rv_pitcher', methods=['POST'])
+@app.route('/update_rv_pitcher', methods=['GET', 'POST'])
+@cached
 def update_rv_pitcher():
-    with sqlite3.connect(db_location) as conn:
-        selected_pitcher = request.form.get('Pitcher')
-        query = f"SELECT * FROM 'run_value_23' WHERE Pitcher = '{selected_pitcher}'"
-        rv = pd.read_sql_query(query, conn).dropna()
+    selected_pitcher = request.values.get('Pitcher')
+    return jsonify(pitcher_rv_data(selected_pitcher))
 
-    return jsonify({'success': True, 'data': rv.to_dict(orient='records')})
+
+@app.route('/pitcher_bundle', methods=['GET', 'POST'])
+@cached
+def pitcher_bundle():
+    selected_pitcher = request.values.get('Pitcher')
+    pitches_df = get_pitch_data(selected_pitcher)
+    pitch_types_df = get_pitch_types(selected_pitcher, pitches_df)
+
+    return jsonify({
+        'summary': pitcher_summary_data(selected_pitcher, pitches_df, pitch_types_df),
+        'table': pitcher_table_data(pitch_types_df),
+        'stats': pitcher_stats_data(selected_pitcher),
+        'chart': pitch_chart_data(pitches_df, get_data_format()),
+        'percentiles': pitcher_percentiles_data(selected_pitcher),
+        'rv': pitcher_rv_data(selected_pitcher),
+    })
+
+
+@app.route('/pitch_comps', methods=['GET', 'POST'])
+@cached
+def pitch_comps():
+    index = comp_engine.index(get_seasons(database))
+    pitchers = request.values.getlist('Pitcher')
+    team = request.values.get('team')
+    if team:
+        pitchers += index.staff(team)
+    if not pitchers:
+        abort(400, description='Pass one or more Pitcher values or a team.')
+    k = min(max(request.values.get('k', DEFAULT_COMPS, type=int), 1), MAX_COMPS)
+    pitch_type = request.values.get('pitch_type') or None
+    any_type = request.values.get('any_type', '').lower() in ('1', 'true')
+    comps = {pitcher: index.comps(pitcher, pitch_type, k, any_type) for pitcher in dict.fromkeys(pitchers)}
+
+    return jsonify({'comps': comps})
 
 
 @app.route('/pitcher')
 def pitcher():
-    return render_template('pitcher.html', pitchers=pitchers)
+    return render_template('pitcher.html', pitcher=next(iter(rosters.get('pitchers', get_seasons(database))), None))
 
 
 """ Hitter Endpoints and Functions """
 
 
-def get_hitter_list(min_pitch_count=100):
-    conn = sqlite3.connect(db_location)
+def get_hitter_list(season, min_pitch_count=100):
+    hitters_df = database.read('hitters', min_pitch_count, season=season).dropna(subset=['Batter'])
 
-    query = f"SELECT Batter, COUNT(*) as pitch_count FROM 'fl_pbp_23' GROUP BY Batter HAVING pitch_count >= {min_pitch_count}"
+    return hitters_df['Batter'].tolist()
 
-    hitters_df = pd.read_sql_query(query, conn).dropna(subset=['Batter'])
 
-    conn.close()
+rosters.register('hitters', partial(get_hitter_list, min_pitch_count=100))
 
-    return hitters_df['Batter'].tolist()
 
+def get_hitter_data(selected_batter_name, columns=None):
+    return pitch_stores.rows('Batter', selected_batter_name, get_seasons(database), columns, get_pitch_filter())
 
-hitters = get_hitter_list(100)
 
+def get_velocity_bins():
+    bins = request.values.get('bins', 3, type=int)
+    return bins if 2 <= bins <= MAX_VELOCITY_BINS else 3
 
-@app.route('/hit_summary', methods=['POST'])
-def hit_summary():
-    selected_batter_name = request.form.get('Hitter')
-    conn = sqlite3.connect(db_location)
 
-    query = f"SELECT * FROM 'fl_pbp_23' WHERE Batter = ?"
-    hitter_df = pd.read_sql_query(query, conn, params=[
-                                  selected_batter_name, ]).sort_values('Date', ascending=True)
-    conn.close()
+def hitter_summary_data(selected_batter_name, hitter_df, bins=3):
+    if hitter_df.empty:
+        return {'summary': f"<p><strong>{selected_batter_name}</strong> has not seen a pitch in this sample.</p>",
+                'teamAndHand': '', 'data': [], 'batted_ball': []}
 
-    batted_balls = get_batted_ball_stats(hitter_df)
+    seasons = get_seasons(database)
+    batted_balls = batted_ball_profile(hitter_df)
 
-    agg_hitter_df = hitter_df.groupby(['AutoPitchType', 'PitcherThrows'])['RV'].agg(
-        ['mean', 'count']).reset_index()
+    agg_hitter_df = hitter_rv_means(hitter_rv_by_pitch(database, selected_batter_name, hitter_df, seasons,
+                                                       get_pitch_filter() is not None))
     agg_hitter_df = agg_hitter_df.rename(
         columns={'mean': 'RV', 'count': 'pitch_count'})
 
     agg_hitter_df = agg_hitter_df[agg_hitter_df['pitch_count'] >= 20]
     agg_hitter_df = agg_hitter_df.sort_values('RV', ascending=False)
 
-    best_pitch = agg_hitter_df.AutoPitchType.iloc[0]
-    best_hand = agg_hitter_df.PitcherThrows.iloc[0]
-    best_rv = agg_hitter_df.RV.max()
+    if agg_hitter_df.empty:
+        summary_sentence = (f"<p><strong>{selected_batter_name}</strong> has not seen 20 pitches of any type from "
+                            f"either hand in this sample.</p>")
+    else:
+        best_pitch = agg_hitter_df.AutoPitchType.iloc[0]
+        best_hand = agg_hitter_df.PitcherThrows.iloc[0]
+        best_rv = agg_hitter_df.RV.max()
 
-    worst_pitch = agg_hitter_df.AutoPitchType.iloc[-1]
-    worst_hand = agg_hitter_df.PitcherThrows.iloc[-1]
+        worst_pitch = agg_hitter_df.AutoPitchType.iloc[-1]
+        worst_hand = agg_hitter_df.PitcherThrows.iloc[-1]
 
-    best_hand = 'left-handed' if best_hand == 'Left' else 'right-handed'
-    worst_hand = 'left-handed' if worst_hand == 'Left' else 'right-handed'
+        best_hand = 'left-handed' if best_hand == 'Left' else 'right-handed'
+        worst_hand = 'left-handed' if worst_hand == 'Left' else 'right-handed'
 
-    summary_sentence = (
-        f"<p><strong>{selected_batter_name}</strong> is best against {best_hand} <span class='{best_pitch}'> {best_pitch}"
-        f"s.</span> \n"
-        f"He carries an RV/100 of {round(best_rv * 100, 1)} against them.</p>\n")
+        summary_sentence = (
+            f"<p><strong>{selected_batter_name}</strong> is best against {best_hand} <span class='{best_pitch}'> "
+            f"{best_pitch}s.</span> \n"
+            f"He carries an RV/100 of {round(best_rv * 100, 1)} against them.</p>\n")
 
-    if worst_pitch + worst_hand != best_pitch + best_hand:
-        summary_sentence += f"He performs worst against {worst_hand} <span class='{worst_pitch}'> {worst_pitch}s.</span>"
+        if worst_pitch + worst_hand != best_pitch + best_hand:
+            summary_sentence += (f"He performs worst against {worst_hand} <span class='{worst_pitch}'> "
+                                 f"{worst_pitch}s.</span>")
 
     team = hitter_df['BatterTeam'].iloc[-1]
     hand = 'RHH' if hitter_df['BatterSide'].iloc[0] == 'Right' else (
         'LHH' if hitter_df['BatterSide'].iloc[0] == 'Left' else 'Switch Hitter')
     team_hand = hand + ', ' + team
 
-    hitter_df['pitch_group'] = hitter_df['AutoPitchType'].apply(
-        categorize_pitch_group)
-
-    hitter_df['velo_quadrant'] = hitter_df.groupby('pitch_group')['RelSpeed'].transform(
-        lambda x: pd.qcut(x, q=[0, 0.33, 0.66, 1.0], labels=['0-33%', '33-66%', '66-100%']))
-
-    hitter_df['xwOBAcon_gb'] = hitter_df['xwOBAcon_gb'].astype(float)
+    thresholds = pitch_stores.combined(seasons, ('velocity_thresholds', bins),
+                                       partial(league_velocity_thresholds, bins=bins))
+    velo_df = velo_grid(hitter_df, thresholds)
 
-    hitter_df = hitter_df.groupby(['pitch_group', 'velo_quadrant'], observed=False)['xwOBAcon_gb'].mean().unstack(
-        fill_value=0).reset_index()
+    return {'summary': summary_sentence.strip(), 'teamAndHand': team_hand, 'data': velo_df.to_dict(orient='records'),
+            'batted_ball': batted_balls.to_dict(orient='records')}
 
-    columns_to_fill = ['0-33%', '33-66%', '66-100%']
-    for column in columns_to_fill:
-        hitter_df[column] = hitter_df[column].round(3).astype(str)
 
-    return jsonify({'summary': summary_sentence.strip(), 'teamAndHand': team_hand, 'data': hitter_df.to_dict(orient='records'),
-                    'batted_ball': batted_balls.to_dict(orient='records')})
-
-
-@app.route('/update_hitter_stats', methods=['POST'])
-def update_hitter_stats():
+def hitter_stats_data(selected_batter_name):
     try:
-        selected_batter_name = request.form.get('Hitter')
-
-        conn = sqlite3.connect(db_location)
-        query = "SELECT * FROM hitting_bref WHERE Name = ?"
-        hitter_df = pd.read_sql_query(
-            query, conn, params=(selected_batter_name,))
+        hitter_df = database.read('hitter_stats', selected_batter_name)
 
         if not hitter_df.empty:
             data = hitter_df.to_dict(orient='records')
-            return jsonify({'success': True, 'data': data})
+            return {'success': True, 'data': data}
         else:
-            return jsonify({'success': False, 'message': 'No data found for the selected hitter'})
+            return {'success': False, 'message': 'No data found for the selected hitter'}
 
     except Exception as e:
-        return jsonify({'success': False, 'message': str(e)})
-
-    finally:
-        conn.close()
-
-
-@app.route('/update_hitter_sz', methods=['POST'])
-def update_hitter_sz():
-    selected_batter_name = request.form.get('Hitter')
-    conn = sqlite3.connect(db_location)
+        return {'success': False, 'message': str(e)}
 
-    query = f"SELECT * FROM 'fl_pbp_23' WHERE Batter = '{selected_batter_name}'"
-    pitches_df = pd.read_sql_query(query, conn)
-    pitches_df['isSwing'] = pitches_df['PitchCall'].isin(
-        ['StrikeSwinging', 'Foul', 'FoulTip', 'CatchersInt', 'InPlay'])
 
+def hitter_sz_data(pitches_df, data_format='records'):
     pitches_df = pitches_df[(pitches_df['PlateLocSide'] >= -1) &
-                    (pitches_df['PlateLocSide'] <= 1)]
+                            (pitches_df['PlateLocSide'] <= 1)]
     pitches_df = pitches_df[(pitches_df['PlateLocHeight'] <= 3.5) &
-                    (pitches_df['PlateLocHeight'] >= 1.5)]
+                            (pitches_df['PlateLocHeight'] >= 1.5)]
 
     chart_data = pitches_df[['PlateLocSide', 'PlateLocHeight', 'xwOBAcon_gb', 'PlayResult']].dropna(
         subset=['PlateLocSide', 'PlateLocHeight', 'xwOBAcon_gb', 'PlayResult'])
 
-    return jsonify({'success': True, 'data': chart_data.to_dict(
-        orient='records')})
-
-
-def get_batted_ball_stats(fl):
-    bb = fl.copy().dropna(
-        subset=['Direction', 'BatterSide', 'Angle', 'ExitSpeed'])
-    bb['BatterSide'] = bb.apply(
-        lambda row: 'Right' if row['BatterSide'] == 'Switch' and row['PitcherThrows'] == 'Left' else 'Left' if
-        row['BatterSide'] == 'Switch' else row['BatterSide'], axis=1)
-
-    bb['HitType'] = pd.cut(bb['Angle'], bins=[-float('inf'), 10, 25, 50, float('inf')],
-                           labels=['Ground ball', 'Line drive', 'Fly ball', 'Pop up'], right=False)
-
-    bb['isPull'] = ((bb['BatterSide'] == 'Right') & (
-        bb['Direction'] <= -15) | (bb['BatterSide'] == 'Left') & (bb['Direction'] >= 15))
-    bb['isOppo'] = ((bb['BatterSide'] == 'Right') & (bb['Direction'] >= 15) | (
-        bb['BatterSide'] == 'Left') & (bb['Direction'] <= -15))
-    bb['isMiddle'] = (~bb['isPull']) & (~bb['isOppo'])
-
-    z_scores = bb.groupby('Batter')['ExitSpeed'].transform(
-        lambda x: (x - x.mean()) / x.std())
-    bb['isHard'] = z_scores >= 1
-    bb['isWeak'] = z_scores <= -1
-
-    bb = bb.groupby(['Batter']).agg(
-        Pitches=('Batter', 'count'),
-        Pulls=('isPull', 'sum'),
-        Oppos=('isOppo', 'sum'),
-        Middles=('isMiddle', 'sum'),
-        GroundBalls=('HitType', lambda x: (x == 'Ground ball').sum()),
-        LineDrives=('HitType', lambda x: (x == 'Line drive').sum()),
-        PopUps=('HitType', lambda x: (x == 'Pop up').sum()),
-        FlyBalls=('HitType', lambda x: (x == 'Fly ball').sum()),
-        Hards=('isHard', 'sum'),
-        Weaks=('isWeak', 'sum'),
-    ).reset_index().dropna()
-
-    bb['Pull%'] = bb['Pulls'] / bb['Pitches']
-    bb['Oppo%'] = bb['Oppos'] / bb['Pitches']
-    bb['Straight%'] = bb['Middles'] / bb['Pitches']
-    bb['GroundBall%'] = bb['GroundBalls'] / bb['Pitches']
-    bb['LineDrive%'] = bb['LineDrives'] / bb['Pitches']
-    bb['PopUp%'] = bb['PopUps'] / bb['Pitches']
-    bb['FlyBall%'] = bb['FlyBalls'] / bb['Pitches']
-    bb['Solid%'] = bb['Hards'] / bb['Pitches']
-    bb['Weak%'] = bb['Weaks'] / bb['Pitches']
-
-    bb = bb.drop(
-        ['Pulls', 'Oppos', 'Middles', 'GroundBalls', 'LineDrives',
-            'PopUps', 'FlyBalls', 'Hards', 'Weaks', 'Pitches'],
-        axis=1)
-
-    return bb
-
-
-@app.route('/update_hitter_percentiles', methods=['POST'])
-def update_hitter_percentiles():
-    conn = sqlite3.connect(db_location)
-    selected_hitter_name = request.form.get('Hitter')
-    query = f"SELECT * FROM 'fl_savant_stats_hit' WHERE Name = '{selected_hitter_name}'"
-    savant = pd.read_sql_query(query, conn)
-    conn.close()
+    return {'success': True, 'data': encode_frame(chart_data, data_format)}
 
-    return jsonify({'success': True, 'data': savant.to_dict(orient='records')})
 
+def hitter_percentiles_data(selected_hitter_name):
+    savant = read('hitter_percentiles', selected_hitter_name)
 
-@app.route('/update_rv_hitter', methods=['POST'])
-def update_rv_hitter():
-    conn = sqlite3.connect(db_location)
-    selected_hitter_name = request.form.get('Hitter')
-    query = f"SELECT * FROM 'run_value_hit_23' WHERE Batter = '{selected_hitter_name}'"
-    rv = pd.read_sql_query(query, conn).fillna(0).dropna()
+    return percentiles_data('Batter', selected_hitter_name, savant)
+
+
+def hitter_rv_data(selected_hitter_name):
+    rv = read('hitter_rv', selected_hitter_name).fillna(0).dropna()
+
+    return {'success': True, 'data': rv.to_dict(orient='records')}
+
+
+def discipline_data(selected_hitter_name):
+    discipline = read('discipline', selected_hitter_name)
 
-    conn.close()
+    return {'success': True, 'data': discipline.to_dict(orient='records')}
 
-    return jsonify({'success': True, 'data': rv.to_dict(orient='records')})
 
+@app.route('/hit_summary', methods=['GET', 'POST'])
+@cached
+def hit_summary():
+    selected_batter_name = request.values.get('Hitter')
+    return jsonify(hitter_summary_data(selected_batter_name, get_hitter_data(selected_batter_name),
+                                       get_velocity_bins()))
+
+
+@app.route('/update_hitter_stats', methods=['GET', 'POST'])
+@cached
+def update_hitter_stats():
+    selected_batter_name = request.values.get('Hitter')
+    return jsonify(hitter_stats_data(selected_batter_name))
+
+
+@app.route('/update_hitter_sz', methods=['GET', 'POST'])
+@cached
+def update_hitter_sz():
+    selected_batter_name = request.values.get('Hitter')
+    pitches_df = get_hitter_data(
+        selected_batter_name, ['PlateLocSide', 'PlateLocHeight', 'xwOBAcon_gb', 'PlayResult'])
+    return jsonify(hitter_sz_data(pitches_df, get_data_format()))
 
-@app.route('/update_discipline', methods=['POST'])
+
+@app.route('/update_hitter_percentiles', methods=['GET', 'POST'])
+@cached
+def update_hitter_percentiles():
+    selected_hitter_name = request.values.get('Hitter')
+    return jsonify(hitter_percentiles_data(selected_hitter_name))
+
+
+@app.route('/update_rv_hitter', methods=['GET', 'POST'])
+@cached
+def update_rv_hitter():
+    selected_hitter_name = request.values.get('Hitter')
+    return jsonify(hitter_rv_data(selected_hitter_name))
+
+
+@app.route('/update_discipline', methods=['GET', 'POST'])
+@cached
 def update_discipline():
-    conn = sqlite3.connect(db_location)
-    selected_hitter_name = request.form.get('Hitter')
-    query = f"SELECT * FROM 'discipline_23' WHERE Name = '{selected_hitter_name}'"
-    discipline = pd.read_sql_query(query, conn)
-    conn.close()
+    selected_hitter_name = request.values.get('Hitter')
+    return jsonify(discipline_data(selected_hitter_name))
 
-    return jsonify({'success': True, 'data': discipline.to_dict(orient='records')})
+
+@app.route('/hitter_bundle', methods=['GET', 'POST'])
+@cached
+def hitter_bundle():
+    selected_batter_name = request.values.get('Hitter')
+    hitter_df = get_hitter_data(selected_batter_name)
+
+    return jsonify({
+        'summary': hitter_summary_data(selected_batter_name, hitter_df, get_velocity_bins()),
+        'stats': hitter_stats_data(selected_batter_name),
+        'sz': hitter_sz_data(hitter_df, get_data_format()),
+        'percentiles': hitter_percentiles_data(selected_batter_name),
+        'rv': hitter_rv_data(selected_batter_name),
+        'discipline': discipline_data(selected_batter_name),
+    })
 
 
 @app.route('/hitter')
 def hitter():
-    return render_template('hitter.html', hitters=hitters)
+    return render_template('hitter.html', hitter=next(iter(rosters.get('hitters', get_seasons(database))), None))
 
 
 """ Catcher Endpoints and Functions """
 
 
-def get_catcher_list(min_pitch_count=100):
-    conn = sqlite3.connect(db_location)
-
-    query = f"SELECT Catcher, COUNT(*) as pitch_count FROM 'fl_pbp_23' GROUP BY Catcher HAVING pitch_count >= {min_pitch_count}"
+def get_catcher_list(season, min_pitch_count=100):
+    catchers_df = database.read('catchers', min_pitch_count, season=season).dropna(subset=['Catcher'])
 
-    catchers_df = pd.read_sql_query(query, conn).dropna(subset=['Catcher'])
+    return catchers_df['Catcher'].tolist()
 
-    conn.close()
 
-    return catchers_df['Catcher'].tolist()
+rosters.register('catchers', partial(get_catcher_list, min_pitch_count=0))
 
 
-catchers = get_catcher_list(0)
+def get_catcher_data(selected_catcher_name, columns=None):
+    return pitch_stores.rows('Catcher', selected_catcher_name, get_seasons(database), columns)
 
 
 @app.route('/catcher')
 def catcher():
-    return render_template('catcher.html', catchers=catchers)
+    return render_template('catcher.html', catcher=next(iter(rosters.get('catchers', get_seasons(database))), None))
 
 
-@app.route('/catch_summary', methods=['POST'])
+@app.route('/catch_summary', methods=['GET', 'POST'])
+@cached
 def catch_summary():
-    selected_catcher_name = request.form.get('Catcher')
-    conn = sqlite3.connect(db_location)
-    query = f"SELECT * FROM 'fl_pbp_23' WHERE Catcher = ?"
-    catcher_df = pd.read_sql_query(query, conn, params=[
-        selected_catcher_name, ]).sort_values('Date', ascending=True)
+    selected_catcher_name = request.values.get('Catcher')
+    one_catcher = framing_engine.leaderboard(get_seasons(database)).get(selected_catcher_name)
+    if one_catcher is None:
+        abort(404, description=f'No called pitches for catcher {selected_catcher_name!r}.')
+    catcher_df = get_catcher_data(selected_catcher_name, ['CatcherTeam'])
     team = catcher_df.CatcherTeam.iloc[-1]
-    query = f"SELECT * FROM 'catchers_23'"
-    catcher_df = pd.read_sql_query(query, conn)
-    conn.close()
 
-    one_catcher = catcher_df.copy()
-    one_catcher = catcher_df[catcher_df['Catcher'] == selected_catcher_name]
-    fr = one_catcher['Framing Runs'].iloc[0]
+    fr = one_catcher['Framing Runs']
     desc = "added" if fr >= 0 else "lost"
-    difference = abs(one_catcher['R-Strike%'].iloc[0] -
-                     one_catcher['L-Strike%'].iloc[0])
-    best_side = 'pitches to his left' if one_catcher['L-Strike%'].iloc[
-        0] >= one_catcher['R-Strike%'].iloc[0] else 'pitches to his right'
-    worst_side = 'pitches to his left' if one_catcher['L-Strike%'].iloc[
-        0] < one_catcher['R-Strike%'].iloc[0] else 'pitches to his right'
-    summary_sentence = f"<strong>{selected_catcher_name}</strong> has {desc} {fr} runs for his team on framing alone. <br><br>He frames {best_side} better than {worst_side} ({round(difference, 1)}% difference). "
+    summary_sentence = f"<strong>{selected_catcher_name}</strong> has {desc} {fr} runs for his team on framing alone. "
+    left, right = one_catcher['L-Strike%'], one_catcher['R-Strike%']
+    if left is not None and right is not None:
+        best_side = 'pitches to his left' if left >= right else 'pitches to his right'
+        worst_side = 'pitches to his right' if left >= right else 'pitches to his left'
+        summary_sentence += f"<br><br>He frames {best_side} better than {worst_side} ({round(abs(right - left), 1)}% difference). "
 
-    return jsonify({'team': team, 'summary': summary_sentence, 'leaderboard': catcher_df.to_dict(orient='records')})
+    return jsonify({'team': team, 'summary': summary_sentence})
 
 
-@app.route('/catcher_leaderboard', methods=['POST'])
+@app.route('/catcher_leaderboard', methods=['GET', 'POST'])
+@cached
 def catcher_leaderboard():
-    conn = sqlite3.connect(db_location)
-    query = f"SELECT * FROM 'catchers_23'"
-    catcher_df = pd.read_sql_query(query, conn)
-    conn.close()
-
-    return jsonify({'leaderboard': catcher_df.to_dict(orient='records')})
+    return jsonify(leaderboard_page(framing_engine.leaderboard(get_seasons(database))))
 
 
-@app.route('/catcher_data', methods=['POST'])
+@app.route('/catcher_data', methods=['GET', 'POST'])
+@cached
 def catcher_data():
-    selected_catcher_name = request.form.get('Catcher')
-    conn = sqlite3.connect(db_location)
-    query = f"SELECT * FROM 'fl_pbp_23' WHERE Catcher = ?"
-    catcher_df = pd.read_sql_query(query, conn, params=[selected_catcher_name]).dropna(
-        subset=['PlateLocSide', 'PlateLocHeight', 'PitchCall'])
-    conn.close()
-
-    strike_zone = {
-        'x': [-1, 1, 1, -1, -1],
-        'y': [1.5, 1.5, 3.5, 3.5, 1.5]
-    }
-
-    big_zone = {
-        'x': [-1.35, 1.35, 1.35, -1.35, -1.35],
-        'y': [1.35, 1.35, 3.65, 3.65, 1.35]
-    }
-
-    small_zone = {
-        'x': [-0.65, 0.65, 0.65, -0.65, -0.65],
-        'y': [1.65, 1.65, 3.35, 3.35, 1.65]
-    }
-
-    catcher_df = catcher_df[catcher_df['PitchCall'].isin(
-        ['StrikeCalled', 'BallCalled'])]
-
-    pitches_in_left = catcher_df[
-        (catcher_df['PlateLocSide'] >= big_zone['x'][0]) &
-        (catcher_df['PlateLocSide'] <= small_zone['x'][0]) &
-        (catcher_df['PlateLocHeight'] <= strike_zone['y'][2]) &
-        (catcher_df['PlateLocHeight'] >= strike_zone['y'][0])
-    ]
-
-    pitches_in_right = catcher_df[
-        (catcher_df['PlateLocSide'] <= big_zone['x'][1]) &
-        (catcher_df['PlateLocSide'] >= small_zone['x'][1]) &
-        (catcher_df['PlateLocHeight'] <= strike_zone['y'][2]) &
-        (catcher_df['PlateLocHeight'] >= strike_zone['y'][0])
-    ]
+    selected_catcher_name = request.values.get('Catcher')
+    if request.values.get('mode') == 'grid':
+        catcher_df = get_catcher_data(selected_catcher_name, ['PitchCall', 'PlateLocSide', 'PlateLocHeight']).dropna(
+            subset=['PlateLocSide', 'PlateLocHeight', 'PitchCall'])
+        return jsonify({'mode': 'grid', 'data': called_pitch_grid(catcher_df, get_zone(BIG_ZONE), get_resolution())})
 
-    strike_total = pd.concat([pitches_in_left[pitches_in_left['PitchCall'] == 'StrikeCalled'],
-                             pitches_in_right[pitches_in_right['PitchCall'] == 'StrikeCalled']])
-    ball_total = pd.concat([pitches_in_left[pitches_in_left['PitchCall'] == 'BallCalled'],
-                           pitches_in_right[pitches_in_right['PitchCall'] == 'BallCalled']])
-
-    catcher_df = pd.concat([strike_total, ball_total])
-
-    return jsonify({'data': catcher_df[['PitchCall', 'PlateLocSide', 'PlateLocHeight']].to_dict(orient='records')})
+    return jsonify({'data': encode_frame(framing_engine.shadow_pitches(selected_catcher_name, get_seasons(database)),
+                                         get_data_format())})
 
 
 """ Umpire Endpoints and Functions """
 
 
-def get_umpire_list(min_pitch_count=100):
-    conn = sqlite3.connect(db_location)
+def get_umpire_list(season, min_pitch_count=100):
+    tallies = umpire_engine.season(season).tallies
 
-    query = f"SELECT Umpire FROM 'umpires'"
+    return tallies.index[tallies['called'] >= max(min_pitch_count, 1)].tolist()
 
-    umps_df = pd.read_sql_query(query, conn).dropna(subset=['Umpire'])
 
-    conn.close()
+rosters.register('umpires', partial(get_umpire_list, min_pitch_count=0))
 
-    return umps_df['Umpire'].dropna().tolist()
 
-
-umpires = get_umpire_list(0)
+def get_umpire_data(selected_ump_name, columns=None):
+    return pitch_stores.rows('Umpire', selected_ump_name, get_seasons(database), columns)
 
 
 @app.route('/umpire')
 def umpire():
-    return render_template('umpire.html', umpires=umpires)
+    return render_template('umpire.html', umpire=next(iter(rosters.get('umpires', get_seasons(database))), None))
 
 
-@app.route('/ump_summary', methods=['POST'])
+@app.route('/ump_summary', methods=['GET', 'POST'])
+@cached
 def ump_summary():
-    selected_ump_name = request.form.get('Umpire')
-    conn = sqlite3.connect(db_location)
-    query = f"SELECT * FROM 'umpires'"
-    ump_df = pd.read_sql_query(query, conn)
-    conn.close()
-
-    one_ump = ump_df.copy()
-    one_ump = ump_df[ump_df['Umpire'] == selected_ump_name]
-    accuracy = round(one_ump['Total Pitch Accuracy'].iloc[0], 1)
-    pitches = one_ump['Pitches'].iloc[0]
-    zaa = round(one_ump['Zone Above Average'].iloc[0] * 12, 1)
-    desc = "bigger" if zaa > 0 else "smaller"
+    selected_ump_name = request.values.get('Umpire')
+    one_ump = umpire_engine.leaderboard(get_seasons(database)).get(selected_ump_name)
+    if one_ump is None:
+        abort(404, description=f'No called pitches for umpire {selected_ump_name!r}.')
+
+    accuracy = one_ump['Total Pitch Accuracy']
+    pitches = one_ump['Pitches']
+    zaa = round(one_ump['Zone Above Average'] * 100, 1)
+    desc = "more" if zaa > 0 else "fewer"
     gender_1 = "he" if selected_ump_name != 'Tanya Millette' else "she"
     gender_2 = "His" if selected_ump_name != 'Tanya Millette' else "Her"
+    regions = {region: one_ump[f'{region} Miss%'] for region in EDGES if one_ump[f'{region} Miss%'] is not None}
+    worst_edge = max(regions, key=regions.get) if regions else None
 
-    summary_sentence = f"<strong>{selected_ump_name}'s</strong> total pitch accuracy is {accuracy}%. Since umpire data has been tracked, {gender_1} has called {pitches} pitches. <br><br>{gender_2} zone size is {zaa} inches {desc} than the average FL ump."
+    summary_sentence = f"<strong>{selected_ump_name}'s</strong> total pitch accuracy is {accuracy}%. Since umpire data has been tracked, {gender_1} has called {pitches} pitches. <br><br>{gender_1.capitalize()} calls {abs(zaa)}% {desc} strikes than the average FL ump would on the same pitches."
+    if worst_edge is not None:
+        summary_sentence += f" {gender_2} most missed edge is the {worst_edge.lower()} ({regions[worst_edge]}% missed)."
 
     return jsonify({'summary': summary_sentence, })
 
 
-@app.route('/ump_data', methods=['POST'])
+@app.route('/ump_data', methods=['GET', 'POST'])
+@cached
 def ump_data():
-    selected_ump_name = request.form.get('Umpire')
-    conn = sqlite3.connect(db_location)
-    query = f"SELECT * FROM 'fl_pbp_23' WHERE Umpire = ?"
-    ump_df = pd.read_sql_query(query, conn, params=[selected_ump_name]).dropna(
+    selected_ump_name = request.values.get('Umpire')
+    ump_df = get_umpire_data(selected_ump_name, ['PitchCall', 'PlateLocSide', 'PlateLocHeight']).dropna(
         subset=['PlateLocSide', 'PlateLocHeight', 'PitchCall'])
-    conn.close()
 
-    ump_df = ump_df[ump_df['PitchCall'].isin(
-        ['StrikeCalled', 'BallCalled'])]
+    zone = get_zone(UMPIRE_CHART_ZONE)
+    if request.values.get('mode') == 'grid':
+        return jsonify({'mode': 'grid', 'data': called_pitch_grid(ump_df, zone, get_resolution())})
 
-    ump_df = ump_df[(ump_df['PlateLocSide'] >= -1.3) &
-                    (ump_df['PlateLocSide'] <= 1.3)]
-    ump_df = ump_df[(ump_df['PlateLocHeight'] <= 3.8) &
-                    (ump_df['PlateLocHeight'] >= 1.3)]
+    ump_df = ump_df[ump_df['PitchCall'].isin(CALLED_PITCHES)]
+    ump_df = ump_df[in_zone(ump_df, zone)]
 
-    return jsonify({'data': ump_df[['PitchCall', 'PlateLocSide', 'PlateLocHeight']].to_dict(orient='records')})
+    return jsonify({'data': encode_frame(ump_df[['PitchCall', 'PlateLocSide', 'PlateLocHeight']], get_data_format())})
 
-@app.route('/ump_leaderboard', methods=['POST'])
+@app.route('/ump_leaderboard', methods=['GET', 'POST'])
+@cached
 def ump_leaderboard():
-    conn = sqlite3.connect(db_location)
-    query = f"SELECT * FROM 'umpires'"
-    ump_df = pd.read_sql_query(query, conn).sort_values('Total Pitch Accuracy', ascending=False)
-    conn.close()
-
-    return jsonify({'leaderboard': ump_df.to_dict(orient='records')})
+    return jsonify(leaderboard_page(umpire_engine.leaderboard(get_seasons(database))))
 
 @app.route('/')
 def index():
     return render_template('index.html')
+
+
+@app.route('/search', methods=['GET', 'POST'])
+@cached
+def search():
+    role = request.values.get('role') or None
+    if role is not None and role not in SEARCH_ROLES:
+        abort(400, description=f'Invalid role {role!r}; use one of {", ".join(SEARCH_ROLES)}.')
+    limit = min(max(request.values.get('limit', DEFAULT_SEARCH_LIMIT, type=int), 1), MAX_SEARCH_LIMIT)
+    results = player_search.search(request.values.get('q', ''), get_seasons(database), role, limit)
+
+    return jsonify({'results': results})
+
+
+@app.route('/cache_stats')
+def cache_stats():
+    return jsonify({**response_cache.stats(), 'prewarm': prewarmer.stats()})
+
+
+def ingest_games(files, chunk_rows=INGEST_CHUNK_ROWS):
+    summary = ingest_files(database, files, chunk_rows)
+    for season in summary['seasons']:
+        pitch_stores[season].refresh()
+    prewarmer.trigger()
+    return summary
+
+
+@app.route('/ingest', methods=['POST'])
+def ingest():
+    token = app.config.get('INGEST_TOKEN')
+    if not token:
+        abort(404)
+    if not hmac.compare_digest(request.headers.get('X-Ingest-Token', ''), token):
+        abort(403)
+    files = request.files.getlist('files')
+    if not files:
+        abort(400, description='Upload one or more game CSVs in the files field.')
+
+    return jsonify(ingest_games([(file.filename, file.stream) for file in files]))
+
+
+@app.cli.command('precompute')
+@click.option('--full', is_flag=True, help='Rebuild the aggregates from every pitch instead of only new rows.')
+def precompute(full):
+    for season in database.seasons():
+        rows = refresh_aggregates(database, season, full=full)
+        click.echo(f"Aggregated {rows} new {season} pitches.")
+
+
+@app.cli.command('ingest')
+@click.argument('paths', nargs=-1, required=True, type=click.Path(exists=True, dir_okay=False))
+@click.option('--chunk-rows', type=int, default=INGEST_CHUNK_ROWS, show_default=True,
+              help='Rows read and inserted per batch.')
+def ingest_command(paths, chunk_rows):
+    streams = [open(path, 'rb') for path in paths]
+    try:
+        summary = ingest_games(list(zip(paths, streams)), chunk_rows)
+    finally:
+        for stream in streams:
+            stream.close()
+    for result in summary['files']:
+        status = 'already ingested' if result['duplicate'] else f"{result['rows']} pitches"
+        click.echo(f"{result['file']}: {status}.")
+    seasons = summary['seasons'].items()
+    click.echo(', '.join(f"{rows} new {season} pitches" for season, rows in seasons) or 'No new pitches.')
+
+
+@app.cli.command('rosters')
+def refresh_rosters():
+    counts = rosters.refresh()
+    click.echo(', '.join(f"{count} {name}" for name, count in counts.items()))
+
+
+@app.cli.command('export-pitches')
+def export_pitches():
+    for season in database.seasons():
+        store = pitch_stores[season]
+        generation = store.export()
+        click.echo(f"Exported {len(store.frame)} {season} pitches to {store.shared_dir} (generation {generation}).")
+
+
+@app.cli.command('prerender')
+@click.option('--output', type=click.Path(file_okay=False), default='prerendered', show_default=True)
+@click.option('--workers', type=int, help='Render processes (defaults to the CPU count).')
+@click.option('--full', is_flag=True, help='Re-render every player instead of only those whose pitches changed.')
+def prerender_command(output, workers, full):
+    seasons = [database.latest_season()]
+    pitches_df = pitch_stores[seasons[0]].frame
+    names = {roster: rosters.get(roster, seasons) for roster in ROSTER_PARAMS}
+    digests = {roster: player_digests(pitches_df, column) for roster, column in ROSTER_COLUMNS.items()}
+    framing_engine.leaderboard(seasons)
+    umpire_engine.leaderboard(seasons)
+    comp_engine.index(seasons)
+    counts = prerender(app, names, digests, output, database.version(), seasons, workers, full)
+    click.echo(f"Rendered {counts['rendered']} players, reused {counts['reused']}, "
+               f"removed {counts['removed']} stale files in {output}.")
+
+
+@app.cli.command('batted-ball')
+@click.option('--baseline', type=click.Choice(['batter', 'league']), default='batter',
+              help='Exit velocity baseline for the Solid%/Weak% z-scores.')
+@click.option('--output', type=click.Path(dir_okay=False), default='batted_ball_profiles.csv')
+@click.option('--season', type=int, help='Season to profile (defaults to the latest).')
+def batted_ball(baseline, output, season):
+    profiles = batted_ball_profiles(pitch_stores[season or database.latest_season()].frame, baseline)
+    profiles.to_csv(output, index=False)
+    click.echo(f"Wrote {len(profiles)} batted-ball profiles to {output}.")
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+BATTED_BALL_COLUMNS = ['Batter', 'BatterSide', 'PitcherThrows', 'Direction', 'Angle', 'ExitSpeed']
+REQUIRED_COLUMNS = ['BatterSide', 'Direction', 'Angle', 'ExitSpeed']
+
+HIT_TYPES = ['GroundBall', 'LineDrive', 'FlyBall', 'PopUp']
+HIT_TYPE_ANGLES = [10, 25, 50]
+SPRAY_ANGLE = 15
+
+PROFILE_COLUMNS = ['Batter', 'Pull%', 'Oppo%', 'Straight%', 'GroundBall%', 'LineDrive%', 'PopUp%', 'FlyBall%',
+                   'Solid%', 'Weak%']
+
+
+def _batter_codes(batters):
+    if isinstance(batters.dtype, pd.CategoricalDtype):
+        return batters.cat.codes.to_numpy(), batters.cat.categories
+    codes, names = pd.factorize(batters)
+    return codes, names
+
+
+def exit_speed_baseline(pitches_df):
+    exit_speed = pitches_df.dropna(subset=REQUIRED_COLUMNS)['ExitSpeed'].to_numpy(dtype='float64')
+    return exit_speed.mean(), exit_speed.std(ddof=1)
+
+
+def _spray_and_hit_types(bb):
+    side = bb['BatterSide'].to_numpy(dtype=object)
+    throws = bb['PitcherThrows'].to_numpy(dtype=object)
+    switch = side == 'Switch'
+    is_right = np.where(switch, throws == 'Left', side == 'Right')
+    is_left = np.where(switch, throws != 'Left', side == 'Left')
+
+    direction = bb['Direction'].to_numpy(dtype='float64')
+    pull = (is_right & (direction <= -SPRAY_ANGLE)) | (is_left & (direction >= SPRAY_ANGLE))
+    oppo = (is_right & (direction >= SPRAY_ANGLE)) | (is_left & (direction <= -SPRAY_ANGLE))
+
+    hit_type = np.searchsorted(HIT_TYPE_ANGLES, bb['Angle'].to_numpy(dtype='float64'), side='right')
+    return pull, oppo, hit_type
+
+
+def _batted_balls(pitches_df):
+    bb = pitches_df[BATTED_BALL_COLUMNS].dropna(subset=REQUIRED_COLUMNS)
+    return bb[bb['Batter'].notna()]
+
+
+def batted_ball_profiles(pitches_df, baseline='batter'):
+    bb = _batted_balls(pitches_df)
+    codes, names = _batter_codes(bb['Batter'])
+    n_batters = len(names)
+    pull, oppo, hit_type = _spray_and_hit_types(bb)
+
+    exit_speed = bb['ExitSpeed'].to_numpy(dtype='float64')
+    pitches = np.bincount(codes, minlength=n_batters)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if baseline == 'batter':
+            mean = np.bincount(codes, weights=exit_speed, minlength=n_batters) / pitches
+            deviation = exit_speed - mean[codes]
+            std = np.sqrt(np.bincount(codes, weights=deviation ** 2, minlength=n_batters) / (pitches - 1))
+            z_scores = deviation / std[codes]
+        else:
+            mean, std = exit_speed_baseline(bb) if baseline == 'league' else baseline
+            z_scores = (exit_speed - mean) / std
+
+        hit_counts = np.bincount(codes * len(HIT_TYPES) + hit_type,
+                                 minlength=n_batters * len(HIT_TYPES)).reshape(n_batters, len(HIT_TYPES))
+        counts = {
+            'Pull%': np.bincount(codes, weights=pull, minlength=n_batters),
+            'Oppo%': np.bincount(codes, weights=oppo, minlength=n_batters),
+            'Straight%': np.bincount(codes, weights=~pull & ~oppo, minlength=n_batters),
+            **{f'{hit_name}%': hit_counts[:, i] for i, hit_name in enumerate(HIT_TYPES)},
+            'Solid%': np.bincount(codes, weights=z_scores >= 1, minlength=n_batters),
+            'Weak%': np.bincount(codes, weights=z_scores <= -1, minlength=n_batters),
+        }
+        profiles = pd.DataFrame({'Batter': np.asarray(names, dtype=object),
+                                 **{column: count / pitches for column, count in counts.items()}})
+
+    return profiles[pitches > 0][PROFILE_COLUMNS].sort_values('Batter').reset_index(drop=True)
+
+
+def batted_ball_profile(hitter_df, baseline='batter', league_df=None):
+    bb = _batted_balls(hitter_df)
+    if bb.empty:
+        return pd.DataFrame(columns=PROFILE_COLUMNS)
+    pull, oppo, hit_type = _spray_and_hit_types(bb)
+
+    exit_speed = bb['ExitSpeed'].to_numpy(dtype='float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if baseline == 'batter':
+            mean = exit_speed.mean()
+            std = exit_speed.std(ddof=1) if len(exit_speed) > 1 else np.nan
+        elif baseline == 'league':
+            if league_df is None:
+                raise ValueError("baseline='league' needs the league's pitches in league_df")
+            mean, std = exit_speed_baseline(_batted_balls(league_df))
+        else:
+            mean, std = baseline
+        z_scores = (exit_speed - mean) / std
+
+    hit_share = np.bincount(hit_type, minlength=len(HIT_TYPES)) / len(bb)
+    profile = {
+        'Batter': bb['Batter'].iloc[0],
+        'Pull%': pull.mean(),
+        'Oppo%': oppo.mean(),
+        'Straight%': (~pull & ~oppo).mean(),
+        **{f'{hit_name}%': hit_share[i] for i, hit_name in enumerate(HIT_TYPES)},
+        'Solid%': (z_scores >= 1).mean(),
+        'Weak%': (z_scores <= -1).mean(),
+    }
+    return pd.DataFrame([profile], columns=PROFILE_COLUMNS)
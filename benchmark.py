@@ -0,0 +1,186 @@
+import argparse
+import importlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from prerender import ROSTER_PARAMS, ROUTE_ROSTERS
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+RSS_SAMPLE_SECONDS = 0.01
+
+
+def _rss_mb():
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2 ** 20
+
+
+def _peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class RssSampler:
+    def __init__(self, interval=RSS_SAMPLE_SECONDS):
+        self.interval = interval
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, _rss_mb())
+
+    def __enter__(self):
+        self.peak_mb = _rss_mb()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, _rss_mb())
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=APP_DIR, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_app(data_dir):
+    os.chdir(data_dir)
+    sys.path.insert(0, APP_DIR)
+    return importlib.import_module('app')
+
+
+def route_requests(app_module, rule, players, requests):
+    roster = ROUTE_ROSTERS.get(rule)
+    if roster is None:
+        return [{} for _ in range(requests)]
+    names = app_module.rosters.get(roster, [app_module.database.latest_season()])[:players]
+    if not names:
+        return []
+    return [{ROSTER_PARAMS[roster]: names[i % len(names)]} for i in range(requests)]
+
+
+def run_endpoint(app_module, rule, method, params, concurrency):
+    def send(data):
+        client = app_module.app.test_client()
+        start = time.perf_counter()
+        if method == 'POST':
+            response = client.post(rule, data=data)
+        else:
+            response = client.get(rule, query_string=data)
+        return time.perf_counter() - start, response.status_code, len(response.get_data())
+
+    with RssSampler() as rss:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(send, params))
+        elapsed = time.perf_counter() - started
+
+    latencies = np.array([latency for latency, _, _ in results]) * 1000
+    return {
+        'method': method,
+        'requests': len(results),
+        'errors': sum(status >= 400 for _, status, _ in results),
+        'p50_ms': round(float(np.percentile(latencies, 50)), 3),
+        'p95_ms': round(float(np.percentile(latencies, 95)), 3),
+        'p99_ms': round(float(np.percentile(latencies, 99)), 3),
+        'mean_ms': round(float(latencies.mean()), 3),
+        'throughput_rps': round(len(results) / elapsed, 2),
+        'mean_bytes': int(np.mean([size for _, _, size in results])),
+        'peak_rss_mb': round(rss.peak_mb, 1),
+    }
+
+
+def benchmark(app_module, requests=50, concurrency=8, players=25, cache=False, routes=None):
+    if not cache:
+        app_module.response_cache.max_bytes = 0
+
+    endpoints = {}
+    for rule in sorted(app_module.app.url_map.iter_rules(), key=lambda rule: rule.rule):
+        if rule.arguments or rule.endpoint == 'static' or (routes and rule.rule not in routes):
+            continue
+        if 'GET' not in rule.methods:
+            continue
+        params = route_requests(app_module, rule.rule, players, requests)
+        if not params:
+            continue
+        method = 'POST' if 'POST' in rule.methods else 'GET'
+        endpoints[rule.rule] = run_endpoint(app_module, rule.rule, method, params, concurrency)
+    return endpoints
+
+
+def compare(baseline, current):
+    rows = []
+    for rule, stats in current['endpoints'].items():
+        before = baseline['endpoints'].get(rule)
+        if before is None:
+            continue
+        rows.append((rule, before['p95_ms'], stats['p95_ms'], stats['p95_ms'] / max(before['p95_ms'], 1e-9)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test every route in app.py and report per-endpoint latency.')
+    parser.add_argument('--data-dir', default='.', help="Directory holding 'Frontier League.db'.")
+    parser.add_argument('--requests', type=int, default=50, help='Requests per endpoint.')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--players', type=int, default=25, help='Distinct players cycled through per endpoint.')
+    parser.add_argument('--cache', action='store_true', help='Leave the response cache enabled.')
+    parser.add_argument('--route', action='append', dest='routes', help='Only benchmark this route (repeatable).')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout.')
+    parser.add_argument('--compare', help='Print p95 changes against an earlier JSON report.')
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    baseline_path = os.path.abspath(args.compare) if args.compare else None
+
+    started = time.perf_counter()
+    app_module = load_app(args.data_dir)
+    import_seconds = time.perf_counter() - started
+
+    report = {
+        'meta': {
+            'commit': _commit(),
+            'python': platform.python_version(),
+            'database_bytes': os.path.getsize(app_module.db_location),
+            'pitches': sum(len(app_module.pitch_stores[season].frame) for season in app_module.database.seasons()),
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'players': args.players,
+            'cache': args.cache,
+            'import_seconds': round(import_seconds, 3),
+            'baseline_rss_mb': round(_rss_mb(), 1),
+        },
+        'endpoints': benchmark(app_module, args.requests, args.concurrency, args.players, args.cache, args.routes),
+    }
+    report['meta']['peak_rss_mb'] = round(_peak_rss_mb(), 1)
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if baseline_path:
+        with open(baseline_path) as f:
+            baseline = json.load(f)
+        for rule, before, after, ratio in compare(baseline, report):
+            print(f'{rule:32s} p95 {before:9.2f}ms -> {after:9.2f}ms  x{ratio:.2f}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+import threading
+from abc import ABC, abstractmethod
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from leaderboards import Leaderboard
+from splits import DATE_KEY_COLUMN
+from zone_grid import CALLED_PITCHES, Zone
+
+GRID_ZONE = Zone(-2.0, 2.0, 0.5, 4.5)
+GRID_RESOLUTION = 40
+SIDE_PLANES = {'Left': 0, 'Right': 1}
+PLANE_CELLS = GRID_RESOLUTION * GRID_RESOLUTION
+GRID_CELLS = (len(SIDE_PLANES) + 1) * PLANE_CELLS
+
+CalledPitches = namedtuple('CalledPitches', ['names', 'rows', 'codes', 'strike', 'cells'])
+
+
+def flags(series):
+    return series.to_numpy(dtype=bool, na_value=False)
+
+
+def _bins(values, low, high):
+    bins = ((values - low) / (high - low) * GRID_RESOLUTION).astype(np.int64)
+    return np.clip(bins, 0, GRID_RESOLUTION - 1)
+
+
+def location_cells(pitches_df):
+    side = pitches_df['PlateLocSide'].to_numpy(dtype='float64')
+    height = pitches_df['PlateLocHeight'].to_numpy(dtype='float64')
+    plane = pitches_df['BatterSide'].map(SIDE_PLANES).to_numpy(dtype='float64', na_value=len(SIDE_PLANES))
+    return (plane.astype(np.int64) * PLANE_CELLS + _bins(height, GRID_ZONE.y_min, GRID_ZONE.y_max)
+            * GRID_RESOLUTION + _bins(side, GRID_ZONE.x_min, GRID_ZONE.x_max))
+
+
+def called_pitches(pitches_df, column):
+    located = flags(pitches_df['PlateLocSide'].notna() & pitches_df['PlateLocHeight'].notna())
+    players = pitches_df[column]
+    if not isinstance(players.dtype, pd.CategoricalDtype):
+        players = players.astype('category')
+    codes = players.cat.codes.to_numpy().astype(np.int64)
+    rows = flags(pitches_df['PitchCall'].isin(CALLED_PITCHES)) & located & (codes >= 0)
+    return CalledPitches(pd.Index(players.cat.categories, name=column), rows, codes[rows],
+                         flags(pitches_df['PitchCall'] == 'StrikeCalled')[rows], location_cells(pitches_df)[rows])
+
+
+def rate(numerator, denominator):
+    return (numerator / denominator.where(denominator > 0) * 100).round(1)
+
+
+def _merge(existing, new):
+    return pd.concat([existing, new]).groupby(level=0).sum()
+
+
+class SeasonCalls:
+    column = None
+
+    def __init__(self):
+        self.frame = None
+        self.tallies = None
+        self.cell_counts = None
+        self.grid_strikes = None
+        self.last_key = None
+        self.processed = 0
+        self.version = 0
+
+    def count(self, pitches_df, calls):
+        return {}
+
+    def extend(self, pitches_df, calls, start):
+        pass
+
+    def sync(self, pitches_df):
+        if pitches_df is self.frame:
+            return
+        keys = pitches_df[DATE_KEY_COLUMN].to_numpy()
+        start = 0
+        if self.tallies is not None and self.last_key is not None:
+            boundary = int(np.searchsorted(keys, self.last_key, 'right'))
+            if boundary == self.processed:
+                start = boundary
+
+        new_df = pitches_df.iloc[start:]
+        calls = called_pitches(new_df, self.column)
+        size = len(calls.names)
+        tallies = pd.DataFrame({
+            'called': np.bincount(calls.codes, minlength=size),
+            'strikes': np.bincount(calls.codes[calls.strike], minlength=size),
+            **self.count(new_df, calls),
+        }, index=calls.names)
+        cell_counts = pd.DataFrame(np.bincount(calls.codes * GRID_CELLS + calls.cells, minlength=size * GRID_CELLS)
+                                   .reshape(size, GRID_CELLS), index=calls.names)
+        grid_strikes = np.bincount(calls.cells[calls.strike], minlength=GRID_CELLS)
+        if start:
+            self.tallies = _merge(self.tallies, tallies)
+            self.cell_counts = _merge(self.cell_counts, cell_counts)
+            self.grid_strikes = self.grid_strikes + grid_strikes
+        else:
+            self.tallies, self.cell_counts, self.grid_strikes = tallies, cell_counts, grid_strikes
+        self.extend(new_df, calls, start)
+
+        self.frame = pitches_df
+        self.last_key = int(keys[-1]) if len(keys) else None
+        self.processed = len(keys)
+        self.version += 1
+
+    def strike_probability(self):
+        pitches = self.cell_counts.to_numpy().sum(axis=0)
+        return np.divide(self.grid_strikes, pitches, out=np.zeros(GRID_CELLS), where=pitches > 0)
+
+    def expected_strikes(self):
+        return pd.Series(self.cell_counts.to_numpy() @ self.strike_probability(), index=self.cell_counts.index)
+
+
+class CalledPitchEngine(ABC):
+    season_class = SeasonCalls
+    sort = None
+
+    def __init__(self, pitch_stores):
+        self.pitch_stores = pitch_stores
+        self._lock = threading.Lock()
+        self._seasons = {}
+        self._leaderboards = {}
+
+    def season(self, season):
+        with self._lock:
+            calls = self._seasons.setdefault(season, self.season_class())
+            calls.sync(self.pitch_stores[season].frame)
+        return calls
+
+    def versions(self, seasons):
+        season_calls = [self.season(season) for season in seasons]
+        return season_calls, tuple((id(calls), calls.version) for calls in season_calls)
+
+    @abstractmethod
+    def summarize(self, tallies):
+        pass
+
+    def leaderboard(self, seasons):
+        season_calls, versions = self.versions(seasons)
+        cached = self._leaderboards.get(tuple(seasons))
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+
+        tallies = pd.concat([calls.tallies.assign(expected=calls.expected_strikes()) for calls in season_calls])
+        tallies = tallies.groupby(level=0).sum()
+        tallies = tallies[tallies['called'] > 0]
+        leaderboard = Leaderboard(self.summarize(tallies), self.season_class.column, self.sort)
+        self._leaderboards[tuple(seasons)] = (versions, leaderboard)
+        return leaderboard
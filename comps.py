@@ -0,0 +1,140 @@
+import heapq
+import threading
+
+import numpy as np
+import pandas as pd
+
+SHAPE_COLUMNS = ['RelSpeed', 'SpinRate', 'HorzBreak', 'InducedVertBreak']
+MIN_COMP_PITCHES = 25
+DEFAULT_COMPS = 5
+MAX_COMPS = 25
+LEAF_SIZE = 16
+ANY_TYPE = None
+
+
+class KDTree:
+    def __init__(self, points, leaf_size=LEAF_SIZE):
+        self.points = np.ascontiguousarray(points, dtype='float64')
+        self.order = np.arange(len(self.points))
+        starts, ends, children, lower, upper = [], [], [], [], []
+
+        def add(start, end):
+            rows = self.points[self.order[start:end]]
+            starts.append(start)
+            ends.append(end)
+            children.append(None)
+            lower.append(rows.min(axis=0) if len(rows) else np.zeros(self.points.shape[1]))
+            upper.append(rows.max(axis=0) if len(rows) else np.zeros(self.points.shape[1]))
+            return len(starts) - 1
+
+        stack = [add(0, len(self.points))]
+        while stack:
+            node = stack.pop()
+            start, end = starts[node], ends[node]
+            if end - start <= leaf_size:
+                continue
+            dimension = int(np.argmax(upper[node] - lower[node]))
+            middle = (start + end) // 2
+            values = self.points[self.order[start:end], dimension]
+            self.order[start:end] = self.order[start:end][np.argpartition(values, middle - start)]
+            children[node] = (add(start, middle), add(middle, end))
+            stack.extend(children[node])
+
+        self.starts, self.ends, self.children = starts, ends, children
+        self.lower, self.upper = np.array(lower), np.array(upper)
+
+    def _bound(self, node, point):
+        gap = np.maximum(self.lower[node] - point, 0) + np.maximum(point - self.upper[node], 0)
+        return float(gap @ gap)
+
+    def query(self, point, k):
+        point = np.asarray(point, dtype='float64')
+        best = []
+        nodes = [(self._bound(0, point), 0)] if len(self.points) else []
+        while nodes:
+            bound, node = heapq.heappop(nodes)
+            if len(best) == k and bound >= -best[0][0]:
+                break
+            if self.children[node] is None:
+                rows = self.order[self.starts[node]:self.ends[node]]
+                offsets = self.points[rows] - point
+                for distance, row in zip(np.einsum('ij,ij->i', offsets, offsets).tolist(), rows.tolist()):
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, row))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, row))
+                continue
+            for child in self.children[node]:
+                heapq.heappush(nodes, (self._bound(child, point), child))
+        best = sorted((-distance, row) for distance, row in best)
+        return np.array([row for _, row in best], dtype=np.intp), np.sqrt([distance for distance, _ in best])
+
+
+def pitch_shapes(pitches_df):
+    columns = ['Pitcher', 'AutoPitchType', 'PitcherThrows', 'PitcherTeam'] + SHAPE_COLUMNS
+    shapes = pitches_df[columns].dropna(subset=['Pitcher', 'AutoPitchType'] + SHAPE_COLUMNS)
+    shapes = shapes.assign(**{column: shapes[column].astype('float64') for column in SHAPE_COLUMNS}, Pitches=1)
+    return shapes.groupby(['Pitcher', 'AutoPitchType'], observed=True, sort=False).agg(
+        PitcherThrows=('PitcherThrows', 'last'), PitcherTeam=('PitcherTeam', 'last'), Pitches=('Pitches', 'sum'),
+        **{column: (column, 'sum') for column in SHAPE_COLUMNS})
+
+
+class CompIndex:
+    def __init__(self, sums):
+        shapes = sums[sums['Pitches'] >= MIN_COMP_PITCHES].reset_index()
+        for column in SHAPE_COLUMNS:
+            shapes[column] = shapes[column] / shapes['Pitches']
+        arm_side = np.where(shapes['PitcherThrows'] == 'Left', -1.0, 1.0)
+        features = shapes[SHAPE_COLUMNS].to_numpy(dtype='float64').copy()
+        features[:, SHAPE_COLUMNS.index('HorzBreak')] *= arm_side
+        scale = features.std(axis=0)
+        self.features = (features - features.mean(axis=0)) / np.where(scale > 0, scale, 1)
+
+        self.shapes = shapes
+        self.records = shapes[['Pitcher', 'PitcherThrows', 'AutoPitchType', 'Pitches'] + SHAPE_COLUMNS].round(
+            {column: 1 for column in SHAPE_COLUMNS}).astype(object).to_dict(orient='records')
+        self.rows = shapes.groupby('Pitcher', observed=True, sort=False).indices
+        self.teams = shapes.groupby('PitcherTeam', observed=True, sort=False)['Pitcher'].unique()
+        types = shapes.groupby('AutoPitchType', observed=True, sort=False).indices
+        self.trees = {ANY_TYPE: (np.arange(len(shapes)), KDTree(self.features))}
+        self.trees.update({pitch_type: (rows, KDTree(self.features[rows])) for pitch_type, rows in types.items()})
+
+    def staff(self, team):
+        return list(self.teams.get(team, []))
+
+    def comps(self, pitcher, pitch_type=None, k=DEFAULT_COMPS, any_type=False):
+        results = {}
+        for row in self.rows.get(pitcher, []):
+            record = self.records[row]
+            if pitch_type is not None and record['AutoPitchType'] != pitch_type:
+                continue
+            rows, tree = self.trees[ANY_TYPE if any_type else record['AutoPitchType']]
+            own = len(self.rows[pitcher])
+            neighbors, distances = tree.query(self.features[row], k + own)
+            comps = [{**self.records[rows[neighbor]], 'Distance': round(float(distance), 3)}
+                     for neighbor, distance in zip(neighbors, distances)
+                     if self.records[rows[neighbor]]['Pitcher'] != pitcher]
+            results[record['AutoPitchType']] = comps[:k]
+        return results
+
+
+class CompEngine:
+    def __init__(self, pitch_stores):
+        self.pitch_stores = pitch_stores
+        self._lock = threading.Lock()
+        self._indexes = {}
+
+    def index(self, seasons):
+        frames = tuple(self.pitch_stores[season].frame for season in seasons)
+        with self._lock:
+            cached = self._indexes.get(tuple(seasons))
+            if cached is not None and all(a is b for a, b in zip(cached[0], frames)):
+                return cached[1]
+            sums = [pitch_shapes(frame) for frame in frames]
+            if len(sums) > 1:
+                sums = [pd.concat(sums).groupby(level=[0, 1], observed=True, sort=False).agg(
+                    {'PitcherThrows': 'last', 'PitcherTeam': 'last', 'Pitches': 'sum',
+                     **{column: 'sum' for column in SHAPE_COLUMNS}})]
+            index = CompIndex(sums[0])
+            self._indexes[tuple(seasons)] = (frames, index)
+        return index
@@ -0,0 +1,174 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+from string import Formatter
+from urllib.parse import quote
+
+import pandas as pd
+
+from metrics import add_rows, phase
+
+logger = logging.getLogger(__name__)
+
+PRAGMAS = [
+    'PRAGMA query_only = ON',
+    'PRAGMA mmap_size = 268435456',
+    'PRAGMA cache_size = -65536',
+    'PRAGMA temp_store = MEMORY',
+]
+
+PITCH_INDEXES = {
+    'Pitcher': ['AutoPitchType', 'InducedVertBreak', 'HorzBreak'],
+    'Batter': ['PlateLocSide', 'PlateLocHeight', 'xwOBAcon_gb', 'PlayResult'],
+    'Catcher': ['PitchCall', 'PlateLocSide', 'PlateLocHeight'],
+    'Umpire': ['PitchCall', 'PlateLocSide', 'PlateLocHeight'],
+}
+
+YAKKER_COLUMNS = ['Pitches', 'BBE', 'Barrels', 'Barrel%', 'AvgEV', 'Max EV', 'LA', 'SweetSpot%', 'xBA', 'xSLG',
+                  'HardHit%', 'K%', 'BB%']
+PITCHER_PERCENTILE_COLUMNS = ['xERA', 'xBA', 'FastballVelo', 'AvgEV', 'Chase%', 'Whiff%', 'K%', 'BB%', 'Barrel%',
+                              'HardHit%', 'GB%', 'Extension']
+HITTER_PERCENTILE_COLUMNS = ['xwOBA', 'xBA', 'xSLG', 'AvgEV', 'Barrel%', 'HardHit%', 'Chase%', 'Whiff%', 'K%', 'BB%',
+                             'SweetSpot%']
+DISCIPLINE_COLUMNS = ['Pitches', 'Zone%', 'Z-Swing%', 'Z-Contact%', 'Chase%', 'O-Swing%', 'O-Contact%', 'Edge%',
+                      '1st Pitch Swing%', 'Swing%', 'Whiff%', 'Heart%', 'Heart Swing%']
+
+
+PITCH_TABLE = 'fl_pbp'
+PARTITIONED_TABLES = [PITCH_TABLE, 'yakker', 'run_value', 'run_value_hit', 'discipline', 'catchers']
+SNAPSHOT_TABLES = ['fl_savant_stats', 'fl_savant_stats_hit', 'umpires']
+SEASON_PATTERN = re.compile(rf'{PITCH_TABLE}_(\d\d)')
+
+
+def column_list(columns):
+    return ', '.join(f'"{column}"' for column in columns)
+
+
+def partition(table, season):
+    return f'{table}_{season % 100:02d}'
+
+
+QUERIES = {
+    'pitchers': "SELECT Pitcher, COUNT(*) AS pitch_count FROM {fl_pbp} GROUP BY Pitcher HAVING pitch_count >= ?",
+    'hitters': "SELECT Batter, COUNT(*) AS pitch_count FROM {fl_pbp} GROUP BY Batter HAVING pitch_count >= ?",
+    'catchers': "SELECT Catcher, COUNT(*) AS pitch_count FROM {fl_pbp} GROUP BY Catcher HAVING pitch_count >= ?",
+    'pitcher_stats': f"SELECT {column_list(['Year', 'G', 'W-L', 'FIP', 'IP', 'SO', 'WAR'])} "
+                     f"FROM pitching_bref WHERE Name = ?",
+    'pitcher_percentiles': f"SELECT {column_list([c + '_percentile' for c in PITCHER_PERCENTILE_COLUMNS])}, "
+                           f"{column_list(YAKKER_COLUMNS + ['xERA'])} FROM {{fl_savant_stats}} WHERE Name = ?",
+    'pitcher_yakker': f"SELECT {column_list(YAKKER_COLUMNS + ['xERA'])} FROM {{yakker}} WHERE Pitcher = ?",
+    'pitcher_rv': f"SELECT {column_list(['AutoPitchType', 'Pitches', 'HardHit%', 'Strike%', 'Whiff%', 'xwOBAcon', 'RV/100', 'RV'])} "
+                  "FROM {run_value} WHERE Pitcher = ?",
+    'hitter_stats': f"SELECT {column_list(['Year', 'BA', 'HR', 'SB', 'WAR'])} FROM hitting_bref WHERE Name = ?",
+    'hitter_percentiles': f"SELECT {column_list([c + '_percentile' for c in HITTER_PERCENTILE_COLUMNS])}, "
+                          f"{column_list(YAKKER_COLUMNS + ['xwOBA'])} FROM {{fl_savant_stats_hit}} WHERE Name = ?",
+    'hitter_rv': f"SELECT {column_list(['AutoPitchType', 'Pitches', 'HardHit%', 'Whiff%', 'xwOBAcon', 'RV/100', 'RV'])} "
+                 "FROM {run_value_hit} WHERE Batter = ?",
+    'discipline': f"SELECT {column_list(DISCIPLINE_COLUMNS)} FROM {{discipline}} WHERE Name = ?",
+}
+
+
+class Database:
+    def __init__(self, db_location):
+        self.db_location = db_location
+        self._local = threading.local()
+        self._tables = None
+        os.register_at_fork(after_in_child=self._forget_connections)
+
+    def _forget_connections(self):
+        self._local = threading.local()
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{quote(self.db_location)}?mode=ro", uri=True,
+                                   check_same_thread=False, cached_statements=256)
+            for pragma in PRAGMAS:
+                conn.execute(pragma)
+            self._local.conn = conn
+        return conn
+
+    def table_names(self):
+        version = self.version()
+        tables = self._tables
+        if tables is None or tables[0] != version:
+            names = {row[0] for row in self.connection().execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            tables = self._tables = (version, names)
+        return tables[1]
+
+    def seasons(self):
+        return sorted(2000 + int(match.group(1))
+                      for match in map(SEASON_PATTERN.fullmatch, self.table_names()) if match)
+
+    def latest_season(self):
+        seasons = self.seasons()
+        return seasons[-1] if seasons else None
+
+    def season_table(self, table, season):
+        name = partition(table, season)
+        if table in SNAPSHOT_TABLES and name not in self.table_names() and season == self.latest_season():
+            return table
+        return name
+
+    def query(self, name, season=None):
+        season = season or self.latest_season()
+        fields = {field for _, field, _, _ in Formatter().parse(QUERIES[name]) if field}
+        tables = {field: self.season_table(field, season) for field in fields}
+        if not all(table in self.table_names() for table in tables.values()):
+            return None
+        return QUERIES[name].format(**tables)
+
+    def read(self, name, *params, season=None):
+        query = self.query(name, season)
+        if query is None:
+            return pd.DataFrame()
+        return self.read_sql(query, params)
+
+    def read_sql(self, query, params=()):
+        with phase('query'):
+            result = pd.read_sql_query(query, self.connection(), params=params)
+        add_rows(len(result))
+        return result
+
+    def table_columns(self, table):
+        return [row[1] for row in self.connection().execute(f"PRAGMA table_info('{table}')")]
+
+    def table_version(self, table):
+        count, last_row = self.connection().execute(f"SELECT COUNT(*), MAX(rowid) FROM '{table}'").fetchone()
+        return f'{count}:{last_row}'
+
+    def version(self):
+        stamps = []
+        for path in (self.db_location, self.db_location + '-wal'):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            stamps.append(f"{stat.st_mtime_ns}:{stat.st_size}")
+        return '/'.join(stamps)
+
+    def write_connection(self):
+        return sqlite3.connect(self.db_location)
+
+    def ensure_indexes(self, table):
+        try:
+            conn = self.write_connection()
+        except sqlite3.Error as e:
+            logger.warning("Could not open %s to build indexes: %s", self.db_location, e)
+            return
+        try:
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info('{table}')")}
+            for role, hot_columns in PITCH_INDEXES.items():
+                columns = [role] + [column for column in hot_columns if column in existing]
+                if role not in existing:
+                    continue
+                conn.execute(f"CREATE INDEX IF NOT EXISTS 'idx_{table}_{role.lower()}' "
+                             f"ON '{table}' ({column_list(columns)})")
+            conn.execute('PRAGMA optimize')
+            conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("Could not build indexes on %s: %s", table, e)
+        finally:
+            conn.close()
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from called_pitches import CalledPitchEngine, SeasonCalls, flags, rate
+from zone_grid import BIG_ZONE, SMALL_ZONE, STRIKE_ZONE
+
+RUNS_PER_STRIKE = 0.13
+
+SHADOW_COLUMNS = ['PitchCall', 'PlateLocSide', 'PlateLocHeight']
+MAX_SHADOW_SETS = 256
+
+
+def shadow_sides(pitches_df):
+    side, height = pitches_df['PlateLocSide'], pitches_df['PlateLocHeight']
+    heights = (height <= STRIKE_ZONE.y_max) & (height >= STRIKE_ZONE.y_min)
+    left = flags((side >= BIG_ZONE.x_min) & (side <= SMALL_ZONE.x_min) & heights)
+    right = flags((side <= BIG_ZONE.x_max) & (side >= SMALL_ZONE.x_max) & heights)
+    return left, right
+
+
+class SeasonFraming(SeasonCalls):
+    column = 'Catcher'
+
+    def __init__(self):
+        super().__init__()
+        self.shadow_rows = None
+        self.shadow_sets = {}
+
+    def count(self, pitches_df, calls):
+        left, right = (sides[calls.rows] for sides in shadow_sides(pitches_df))
+        size = len(calls.names)
+        return {
+            'left_called': np.bincount(calls.codes[left], minlength=size),
+            'left_strikes': np.bincount(calls.codes[left & calls.strike], minlength=size),
+            'right_called': np.bincount(calls.codes[right], minlength=size),
+            'right_strikes': np.bincount(calls.codes[right & calls.strike], minlength=size),
+        }
+
+    def extend(self, pitches_df, calls, start):
+        left, right = (sides[calls.rows] for sides in shadow_sides(pitches_df))
+        shadow = left | right
+        shadow_rows = pd.DataFrame({'Catcher': calls.names[calls.codes[shadow]],
+                                    'position': np.flatnonzero(calls.rows)[shadow] + start,
+                                    'ball': ~calls.strike[shadow], 'right': right[shadow]})
+        if start:
+            shadow_rows = pd.concat([self.shadow_rows, shadow_rows], ignore_index=True)
+
+        shadow_rows = shadow_rows.sort_values(['Catcher', 'ball', 'right', 'position'], kind='stable',
+                                              ignore_index=True)
+        self.shadow_rows = shadow_rows
+        positions = shadow_rows['position'].to_numpy()
+        groups = shadow_rows.groupby('Catcher', sort=False).indices
+        self.shadow_sets = {name: positions[rows] for name, rows in groups.items()}
+
+
+class FramingEngine(CalledPitchEngine):
+    season_class = SeasonFraming
+    sort = 'Framing Runs'
+
+    def __init__(self, pitch_stores, max_shadow_sets=MAX_SHADOW_SETS):
+        super().__init__(pitch_stores)
+        self.max_shadow_sets = max_shadow_sets
+        self._shadow = OrderedDict()
+
+    def summarize(self, tallies):
+        return pd.DataFrame({
+            'Catcher': tallies.index,
+            'Pitches': tallies['called'].to_numpy(),
+            'Framing Runs': ((tallies['strikes'] - tallies['expected']) * RUNS_PER_STRIKE).round(1).to_numpy(),
+            'Strike%': rate(tallies['strikes'], tallies['called']).to_numpy(),
+            'R-Strike%': rate(tallies['right_strikes'], tallies['right_called']).to_numpy(),
+            'L-Strike%': rate(tallies['left_strikes'], tallies['left_called']).to_numpy(),
+        })
+
+    def shadow_pitches(self, name, seasons, columns=SHADOW_COLUMNS):
+        framings, versions = self.versions(seasons)
+        key = (name, tuple(seasons), tuple(columns))
+        with self._lock:
+            cached = self._shadow.get(key)
+            if cached is not None and cached[0] == versions:
+                self._shadow.move_to_end(key)
+                return cached[1]
+
+        parts = []
+        for framing in framings:
+            positions = framing.shadow_sets.get(name, np.array([], dtype=np.intp))
+            frame = framing.frame
+            parts.append(frame.iloc[positions, frame.columns.get_indexer(columns)].reset_index(drop=True))
+        shadow_df = parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True)
+        if len(parts) > 1:
+            _, right = shadow_sides(shadow_df)
+            order = np.lexsort((right, flags(shadow_df['PitchCall'] != 'StrikeCalled')))
+            shadow_df = shadow_df.iloc[order].reset_index(drop=True)
+
+        with self._lock:
+            self._shadow[key] = (versions, shadow_df)
+            while len(self._shadow) > self.max_shadow_sets:
+                self._shadow.popitem(last=False)
+        return shadow_df
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+fastballs = ['Fastball', 'Sinker', 'Cutter']
+offspeed = ['Changeup', 'Splitter']
+breaking = ['Slider', 'Curveball']
+
+PITCH_GROUP_NAMES = ['Breaking', 'Fastball', 'Offspeed']
+PITCH_GROUPS = {**{pitch_type: 'Fastball' for pitch_type in fastballs},
+                **{pitch_type: 'Offspeed' for pitch_type in offspeed},
+                **{pitch_type: 'Breaking' for pitch_type in breaking}}
+PITCH_GROUP_CODES = {pitch_type: PITCH_GROUP_NAMES.index(group) for pitch_type, group in PITCH_GROUPS.items()}
+
+TERCILE_CUTPOINTS = [0.33, 0.66]
+MAX_VELOCITY_BINS = 10
+
+
+def pitch_group_codes(pitch_types):
+    if isinstance(pitch_types.dtype, pd.CategoricalDtype):
+        lookup = np.array([PITCH_GROUP_CODES.get(pitch_type, -1) for pitch_type in pitch_types.cat.categories]
+                          + [-1], dtype=np.int64)
+        return lookup[pitch_types.cat.codes.to_numpy()]
+    return pitch_types.map(PITCH_GROUP_CODES).fillna(-1).to_numpy(dtype=np.int64)
+
+
+def velocity_cutpoints(bins):
+    if bins == 3:
+        return TERCILE_CUTPOINTS
+    return list(np.linspace(0, 1, bins + 1)[1:-1])
+
+
+def velocity_labels(bins):
+    edges = [0] + velocity_cutpoints(bins) + [1]
+    return [f"{round(lo * 100)}-{round(hi * 100)}%" for lo, hi in zip(edges[:-1], edges[1:])]
+
+
+def league_velocity_thresholds(pitches_dfs, bins=3):
+    groups = np.concatenate([pitch_group_codes(pitches_df['AutoPitchType']) for pitches_df in pitches_dfs])
+    velocity = np.concatenate([pitches_df['RelSpeed'].to_numpy(dtype='float64') for pitches_df in pitches_dfs])
+    valid = ~np.isnan(velocity)
+    cutpoints = velocity_cutpoints(bins)
+
+    thresholds = np.full((len(PITCH_GROUP_NAMES), len(cutpoints)), np.nan)
+    for group in range(len(PITCH_GROUP_NAMES)):
+        group_velocity = velocity[valid & (groups == group)]
+        if len(group_velocity):
+            thresholds[group] = np.quantile(group_velocity, cutpoints)
+    return thresholds
+
+
+def velo_grid(hitter_df, thresholds):
+    bins = thresholds.shape[1] + 1
+    groups = pitch_group_codes(hitter_df['AutoPitchType'])
+    velocity = hitter_df['RelSpeed'].to_numpy(dtype='float64')
+    xwoba = pd.to_numeric(hitter_df['xwOBAcon_gb'], errors='coerce').to_numpy(dtype='float64')
+
+    valid = (groups >= 0) & ~np.isnan(velocity)
+    velocity_bins = np.zeros(len(velocity), dtype=np.int64)
+    for group in range(len(PITCH_GROUP_NAMES)):
+        in_group = valid & (groups == group)
+        velocity_bins[in_group] = np.searchsorted(thresholds[group], velocity[in_group], side='left')
+
+    n_cells = len(PITCH_GROUP_NAMES) * bins
+    has_value = valid & ~np.isnan(xwoba)
+    cells = groups[has_value] * bins + velocity_bins[has_value]
+    sums = np.bincount(cells, weights=xwoba[has_value], minlength=n_cells)
+    counts = np.bincount(cells, minlength=n_cells)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = (sums / counts).reshape(len(PITCH_GROUP_NAMES), bins)
+
+    grid = pd.DataFrame(means.round(3).astype(str), columns=velocity_labels(bins))
+    grid.insert(0, 'pitch_group', PITCH_GROUP_NAMES)
+    present = np.bincount(groups[valid], minlength=len(PITCH_GROUP_NAMES)) > 0
+    return grid[present].reset_index(drop=True)
@@ -0,0 +1,159 @@
+import hashlib
+import sqlite3
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from aggregates import refresh_aggregates
+from db import PITCH_TABLE, column_list, partition
+
+INGEST_CHUNK_ROWS = 5000
+INGEST_LOG_TABLE = 'ingest_log'
+
+PITCH_RUN_VALUES = {'BallCalled': 0.055, 'BallIntentional': 0.055, 'StrikeCalled': -0.065, 'StrikeSwinging': -0.09,
+                    'Foul': -0.04, 'FoulBall': -0.04, 'FoulBallFieldable': -0.04, 'FoulBallNotFieldable': -0.04,
+                    'HitByPitch': 0.33}
+PLAY_RUN_VALUES = {'Out': -0.27, 'FieldersChoice': -0.27, 'Sacrifice': -0.27, 'Error': 0.47, 'Single': 0.47,
+                   'Double': 0.77, 'Triple': 1.04, 'HomeRun': 1.4}
+
+XWOBA_SPEED_BINS = (30, 2, 45)
+XWOBA_ANGLE_BINS = (-90, 4, 45)
+
+
+def _numeric(chunk, column):
+    if column not in chunk:
+        return np.full(len(chunk), np.nan)
+    return pd.to_numeric(chunk[column], errors='coerce').to_numpy(dtype='float64')
+
+
+def _bins(values, bins):
+    low, width, count = bins
+    return np.clip((values - low) // width, 0, count - 1).astype(np.int64)
+
+
+class XwobaTable:
+    def __init__(self, exit_speed, angle, xwoba):
+        speed_bins = _bins(exit_speed, XWOBA_SPEED_BINS)
+        cells = speed_bins * XWOBA_ANGLE_BINS[2] + _bins(angle, XWOBA_ANGLE_BINS)
+        size = XWOBA_SPEED_BINS[2] * XWOBA_ANGLE_BINS[2]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.cells = np.bincount(cells, weights=xwoba, minlength=size) / np.bincount(cells, minlength=size)
+            self.speeds = (np.bincount(speed_bins, weights=xwoba, minlength=XWOBA_SPEED_BINS[2])
+                           / np.bincount(speed_bins, minlength=XWOBA_SPEED_BINS[2]))
+        self.league = xwoba.mean() if len(xwoba) else np.nan
+
+    @classmethod
+    def from_tables(cls, conn, tables):
+        parts = []
+        for table in tables:
+            try:
+                parts.append(pd.read_sql_query(f"SELECT ExitSpeed, Angle, xwOBAcon_gb FROM '{table}' "
+                                               "WHERE xwOBAcon_gb IS NOT NULL AND ExitSpeed IS NOT NULL "
+                                               "AND Angle IS NOT NULL", conn))
+            except (sqlite3.Error, pd.errors.DatabaseError):
+                continue
+        batted = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(
+            columns=['ExitSpeed', 'Angle', 'xwOBAcon_gb'])
+        return cls(*(batted[column].to_numpy(dtype='float64') for column in ['ExitSpeed', 'Angle', 'xwOBAcon_gb']))
+
+    def predict(self, exit_speed, angle):
+        speed_bins = _bins(exit_speed, XWOBA_SPEED_BINS)
+        cells = self.cells[speed_bins * XWOBA_ANGLE_BINS[2] + _bins(angle, XWOBA_ANGLE_BINS)]
+        speeds = self.speeds[speed_bins]
+        return np.where(np.isnan(cells), np.where(np.isnan(speeds), self.league, speeds), cells).round(3)
+
+
+def derive_columns(chunk, xwoba_table):
+    dates = pd.to_datetime(chunk['Date'], errors='coerce', format='mixed')
+    chunk = chunk.assign(Date=dates.dt.strftime('%Y-%m-%d'))
+    calls = chunk['PitchCall']
+    in_play = calls == 'InPlay'
+
+    results = chunk['PlayResult'] if 'PlayResult' in chunk else pd.Series(np.nan, index=chunk.index)
+    run_value = calls.map(PITCH_RUN_VALUES).where(~in_play, results.map(PLAY_RUN_VALUES)).astype('float64')
+    chunk['RV'] = pd.Series(_numeric(chunk, 'RV'), index=chunk.index).fillna(run_value)
+
+    exit_speed, angle = _numeric(chunk, 'ExitSpeed'), _numeric(chunk, 'Angle')
+    batted = in_play.to_numpy(dtype=bool, na_value=False) & ~np.isnan(exit_speed) & ~np.isnan(angle)
+    xwoba = np.full(len(chunk), np.nan)
+    xwoba[batted] = xwoba_table.predict(exit_speed[batted], angle[batted])
+    chunk['xwOBAcon_gb'] = pd.Series(_numeric(chunk, 'xwOBAcon_gb'), index=chunk.index).fillna(
+        pd.Series(xwoba, index=chunk.index))
+    return chunk, dates.dt.year
+
+
+def file_digest(stream):
+    digest = hashlib.sha256()
+    for block in iter(lambda: stream.read(1 << 20), b''):
+        digest.update(block)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+class _PitchTables:
+    def __init__(self, conn, seasons):
+        self.conn = conn
+        self.template = partition(PITCH_TABLE, seasons[-1]) if seasons else None
+        self._columns = {}
+
+    def columns(self, season, chunk):
+        table = partition(PITCH_TABLE, season)
+        if table not in self._columns:
+            if self.template is not None:
+                self.conn.execute(f"CREATE TABLE IF NOT EXISTS '{table}' AS SELECT * FROM '{self.template}' WHERE 0")
+            else:
+                self.conn.execute(f"CREATE TABLE IF NOT EXISTS '{table}' ({column_list(chunk.columns)})")
+            self._columns[table] = [row[1] for row in self.conn.execute(f"PRAGMA table_info('{table}')")]
+        return table, [column for column in self._columns[table] if column in chunk]
+
+
+def _insert(conn, table, columns, rows_df):
+    rows = rows_df[columns]
+    values = rows.astype(object).where(rows.notna(), None).to_numpy().tolist()
+    conn.executemany(f"INSERT INTO '{table}' ({column_list(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                     values)
+
+
+def ingest_files(database, files, chunk_rows=INGEST_CHUNK_ROWS):
+    conn = database.write_connection()
+    season_rows, results = {}, []
+    try:
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute(f"CREATE TABLE IF NOT EXISTS '{INGEST_LOG_TABLE}' "
+                     "(digest TEXT PRIMARY KEY, name TEXT, rows INTEGER, ingested_at TEXT)")
+        conn.commit()
+        seasons = database.seasons()
+        xwoba_table = XwobaTable.from_tables(conn, [partition(PITCH_TABLE, season) for season in seasons])
+        tables = _PitchTables(conn, seasons)
+
+        for name, stream in files:
+            digest = file_digest(stream)
+            if conn.execute(f"SELECT 1 FROM '{INGEST_LOG_TABLE}' WHERE digest = ?", (digest,)).fetchone():
+                results.append({'file': name, 'rows': 0, 'undated': 0, 'duplicate': True})
+                continue
+
+            rows = undated = 0
+            with conn:
+                conn.execute('BEGIN IMMEDIATE')
+                for chunk in pd.read_csv(stream, chunksize=chunk_rows, low_memory=False):
+                    chunk, years = derive_columns(chunk, xwoba_table)
+                    undated += int(years.isna().sum())
+                    for season, season_df in chunk.groupby(years.to_numpy()):
+                        season = int(season)
+                        table, columns = tables.columns(season, season_df)
+                        _insert(conn, table, columns, season_df)
+                        rows += len(season_df)
+                        season_rows[season] = season_rows.get(season, 0) + len(season_df)
+                conn.execute(f"INSERT INTO '{INGEST_LOG_TABLE}' VALUES (?, ?, ?, ?)",
+                             (digest, name, rows, datetime.now(timezone.utc).isoformat(timespec='seconds')))
+            results.append({'file': name, 'rows': rows, 'undated': undated, 'duplicate': False})
+
+        conn.commit()
+    finally:
+        conn.close()
+
+    for season in sorted(season_rows):
+        database.ensure_indexes(partition(PITCH_TABLE, season))
+        refresh_aggregates(database, season)
+    return {'files': results, 'seasons': season_rows}
@@ -0,0 +1,54 @@
+from flask import abort, request
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+SORT_DIRECTIONS = ['desc', 'asc']
+
+
+class Leaderboard:
+    def __init__(self, frame, key, sort, direction='desc'):
+        frame = frame.sort_values(sort, ascending=direction == 'asc', kind='stable', na_position='last',
+                                  ignore_index=True)
+        self.records = frame.astype(object).where(frame.notna(), None).to_dict(orient='records')
+        self.positions = {name: position for position, name in enumerate(frame[key])}
+        self.columns = list(frame.columns)
+        self.text_columns = set(frame.select_dtypes(exclude='number').columns)
+        self.sort = sort
+        self.direction = direction
+        self.orders = {(column, order): frame.sort_values(column, ascending=order == 'asc', kind='stable',
+                                                          na_position='last').index.to_numpy()
+                       for column in self.columns for order in SORT_DIRECTIONS}
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, name):
+        position = self.positions.get(name)
+        return None if position is None else self.records[position]
+
+    def page(self, sort=None, direction=None, offset=0, limit=DEFAULT_PAGE_SIZE):
+        sort, direction = sort or self.sort, direction or self.direction
+        if (sort, direction) == (self.sort, self.direction):
+            return self.records[offset:offset + limit]
+        return [self.records[position] for position in self.orders[sort, direction][offset:offset + limit]]
+
+
+def get_page_options(leaderboard):
+    sort = request.values.get('sort') or leaderboard.sort
+    if sort not in leaderboard.columns:
+        abort(400, description=f'Invalid sort {sort!r}; use one of {", ".join(leaderboard.columns)}.')
+    direction = request.values.get('dir')
+    if not direction:
+        direction = 'asc' if sort in leaderboard.text_columns else 'desc'
+        direction = leaderboard.direction if sort == leaderboard.sort else direction
+    if direction not in SORT_DIRECTIONS:
+        abort(400, description=f'Invalid dir {direction!r}; use one of {", ".join(SORT_DIRECTIONS)}.')
+    offset = max(request.values.get('offset', 0, type=int), 0)
+    limit = min(max(request.values.get('limit', DEFAULT_PAGE_SIZE, type=int), 0), MAX_PAGE_SIZE)
+    return sort, direction, offset, limit
+
+
+def leaderboard_page(leaderboard):
+    sort, direction, offset, limit = get_page_options(leaderboard)
+    return {'leaderboard': leaderboard.page(sort, direction, offset, limit), 'total': len(leaderboard),
+            'sort': sort, 'dir': direction, 'offset': offset, 'limit': limit}
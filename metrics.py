@@ -0,0 +1,149 @@
+import bisect
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from flask import Response, g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+logger = logging.getLogger(__name__)
+
+PHASES = ['query', 'compute', 'serialize']
+LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+PLAYER_PARAMS = ['Pitcher', 'Hitter', 'Batter', 'Catcher', 'Umpire']
+
+
+def _tracking():
+    return has_request_context() and 'phases' in g
+
+
+@contextmanager
+def phase(name):
+    if not _tracking() or name in g.active_phases:
+        yield
+        return
+    g.active_phases.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        g.phases[name] += time.perf_counter() - start
+        g.active_phases.discard(name)
+
+
+def add_rows(rows):
+    if _tracking():
+        g.rows += rows
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    def dumps(self, obj, **kwargs):
+        with phase('serialize'):
+            return super().dumps(obj, **kwargs)
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metrics:
+    def __init__(self, app=None, slow_request_ms=None):
+        self.slow_request_ms = slow_request_ms
+        self._lock = threading.Lock()
+        self._requests = defaultdict(int)
+        self._buckets = defaultdict(lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+        self._seconds = defaultdict(float)
+        self._phase_seconds = defaultdict(float)
+        self._rows = defaultdict(int)
+        self._bytes = defaultdict(int)
+        self._collectors = []
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.json = TimedJSONProvider(app)
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.add_url_rule('/metrics', 'metrics', self.render)
+
+    def register(self, name, kind, description, collect):
+        self._collectors.append((name, kind, description, collect))
+
+    def _start(self):
+        g.request_start = time.perf_counter()
+        g.phases = defaultdict(float)
+        g.active_phases = set()
+        g.rows = 0
+
+    def _finish(self, response):
+        if 'request_start' not in g:
+            return response
+        total = time.perf_counter() - g.request_start
+        timings = {'query': g.phases['query'], 'serialize': g.phases['serialize']}
+        timings['compute'] = max(total - timings['query'] - timings['serialize'], 0.0)
+
+        response.headers['Server-Timing'] = ', '.join(
+            [f'{name};dur={timings[name] * 1000:.2f}' for name in PHASES] + [f'total;dur={total * 1000:.2f}'])
+
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        size = response.content_length or 0
+        with self._lock:
+            self._requests[(route, response.status_code)] += 1
+            self._buckets[route][bisect.bisect_left(LATENCY_BUCKETS, total)] += 1
+            self._seconds[route] += total
+            for name in PHASES:
+                self._phase_seconds[(route, name)] += timings[name]
+            self._rows[route] += g.rows
+            self._bytes[route] += size
+
+        if self.slow_request_ms is not None and total * 1000 >= self.slow_request_ms:
+            player = next((f'{param}={request.values[param]}' for param in PLAYER_PARAMS if param in request.values),
+                          '-')
+            logger.warning("Slow request %s %s %.1fms (%s) query=%.1fms compute=%.1fms serialize=%.1fms "
+                           "rows=%d bytes=%d", request.method, route, total * 1000, player, timings['query'] * 1000,
+                           timings['compute'] * 1000, timings['serialize'] * 1000, g.rows, size)
+        return response
+
+    def render(self):
+        lines = []
+
+        def family(name, kind, description):
+            lines.append(f'# HELP {name} {description}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        with self._lock:
+            family('flsavant_requests_total', 'counter', 'Requests served, by route and status.')
+            for (route, status), count in sorted(self._requests.items()):
+                lines.append(f'flsavant_requests_total{{route="{_label(route)}",status="{status}"}} {count}')
+
+            family('flsavant_request_duration_seconds', 'histogram', 'Request latency by route.')
+            for route, buckets in sorted(self._buckets.items()):
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ['+Inf'], buckets):
+                    cumulative += count
+                    lines.append(f'flsavant_request_duration_seconds_bucket{{route="{_label(route)}",le="{bound}"}} '
+                                 f'{cumulative}')
+                lines.append(f'flsavant_request_duration_seconds_sum{{route="{_label(route)}"}} '
+                             f'{self._seconds[route]:.6f}')
+                lines.append(f'flsavant_request_duration_seconds_count{{route="{_label(route)}"}} {cumulative}')
+
+            family('flsavant_request_phase_seconds_total', 'counter', 'Time spent per request phase, by route.')
+            for (route, name), seconds in sorted(self._phase_seconds.items()):
+                lines.append(f'flsavant_request_phase_seconds_total{{route="{_label(route)}",phase="{name}"}} '
+                             f'{seconds:.6f}')
+
+            family('flsavant_query_rows_total', 'counter', 'Rows read from SQLite and the pitch store, by route.')
+            for route, rows in sorted(self._rows.items()):
+                lines.append(f'flsavant_query_rows_total{{route="{_label(route)}"}} {rows}')
+
+            family('flsavant_response_bytes_total', 'counter', 'Response body bytes sent, by route.')
+            for route, size in sorted(self._bytes.items()):
+                lines.append(f'flsavant_response_bytes_total{{route="{_label(route)}"}} {size}')
+
+        for name, kind, description, collect in self._collectors:
+            family(name, kind, description)
+            lines.append(f'{name} {collect()}')
+
+        return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
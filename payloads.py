@@ -0,0 +1,67 @@
+import base64
+import gzip
+
+import numpy as np
+import pandas as pd
+from flask import request
+
+from metrics import phase
+
+DATA_FORMATS = ['records', 'columnar']
+MIN_COMPRESS_BYTES = 1024
+
+
+def get_data_format():
+    data_format = request.values.get('format', 'records')
+    return data_format if data_format in DATA_FORMATS else 'records'
+
+
+def _pack(values):
+    return base64.b64encode(np.ascontiguousarray(values).tobytes()).decode('ascii')
+
+
+def _code_dtype(n_values):
+    if n_values < np.iinfo(np.uint8).max:
+        return 'uint8'
+    if n_values < np.iinfo(np.uint16).max:
+        return 'uint16'
+    return 'uint32'
+
+
+def columnar(frame):
+    columns = {}
+    for name, series in frame.items():
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            columns[name] = {'type': 'float32', 'data': _pack(series.to_numpy(dtype='<f4', na_value=np.nan))}
+        else:
+            codes, values = pd.factorize(series, sort=True)
+            dtype = _code_dtype(len(values))
+            codes = np.where(codes < 0, len(values), codes).astype(np.dtype(dtype).newbyteorder('<'))
+            columns[name] = {'type': 'dictionary', 'dtype': dtype, 'values': [str(value) for value in values],
+                             'codes': _pack(codes)}
+    return {'format': 'columnar', 'length': len(frame), 'columns': columns}
+
+
+def encode_frame(frame, data_format='records'):
+    with phase('serialize'):
+        if data_format == 'columnar':
+            return columnar(frame)
+        return frame.to_dict(orient='records')
+
+
+def accepts_gzip():
+    return 'gzip' in request.accept_encodings
+
+
+def compress_response(response):
+    if (response.status_code != 200 or response.direct_passthrough
+            or 'Content-Encoding' in response.headers or not accepts_gzip()):
+        return response
+    body = response.get_data()
+    if len(body) < MIN_COMPRESS_BYTES:
+        return response
+    with phase('serialize'):
+        response.set_data(gzip.compress(body, compresslevel=6))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
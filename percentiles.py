@@ -0,0 +1,235 @@
+import itertools
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+from flask import abort, request
+
+from heatmap import fastballs
+from splits import DATE_KEY_COLUMN, SPLITS_COLUMN, get_pitch_filter, resolve_window
+from zone_grid import STRIKE_ZONE, SWINGS, in_zone
+
+HARD_HIT_SPEED = 95
+SWEET_SPOT_ANGLES = (8, 32)
+GROUND_BALL_ANGLE = 10
+
+LIVE_METRICS = {
+    'Pitcher': ['FastballVelo', 'AvgEV', 'Chase%', 'Whiff%', 'Barrel%', 'HardHit%', 'GB%', 'Extension'],
+    'Batter': ['AvgEV', 'Barrel%', 'HardHit%', 'SweetSpot%', 'Chase%', 'Whiff%'],
+}
+LOWER_IS_BETTER = {
+    'Pitcher': {'AvgEV', 'Barrel%', 'HardHit%'},
+    'Batter': {'Chase%', 'Whiff%'},
+}
+HAND_COLUMNS = {'Pitcher': 'PitcherThrows', 'Batter': 'BatterSide'}
+DEFAULT_MIN_PITCHES = {'Pitcher': 300, 'Batter': 100}
+PEER_GROUPS = ['league', 'hand']
+MAX_POPULATIONS = 64
+
+_versions = itertools.count(1)
+
+PercentileView = namedtuple('PercentileView', ['positions', 'pitches', 'left', 'values', 'sorted_values'])
+
+
+def _flags(series):
+    return series.to_numpy(dtype=bool, na_value=False)
+
+
+def barrels(exit_speed, angle):
+    low = np.maximum(26 - (exit_speed - 98), 8)
+    high = np.minimum(30 + 2 * (exit_speed - 98), 50)
+    return (exit_speed >= 98) & (angle >= low) & (angle <= high)
+
+
+def metric_terms(pitches_df):
+    exit_speed = pitches_df['ExitSpeed'].to_numpy(dtype='float64')
+    angle = pitches_df['Angle'].to_numpy(dtype='float64')
+    batted = _flags(pitches_df['PitchCall'] == 'InPlay') & ~np.isnan(exit_speed)
+    launched = batted & ~np.isnan(angle)
+    swings = _flags(pitches_df['PitchCall'].isin(SWINGS))
+    located = _flags(pitches_df['PlateLocSide'].notna() & pitches_df['PlateLocHeight'].notna())
+    chase_chances = located & ~_flags(in_zone(pitches_df, STRIKE_ZONE))
+    velocity = pitches_df['RelSpeed'].to_numpy(dtype='float64')
+
+    terms = {
+        'FastballVelo': (velocity, _flags(pitches_df['AutoPitchType'].isin(fastballs)) & ~np.isnan(velocity)),
+        'AvgEV': (exit_speed, batted),
+        'HardHit%': ((exit_speed >= HARD_HIT_SPEED) * 100.0, batted),
+        'Barrel%': (barrels(exit_speed, angle) * 100.0, launched),
+        'SweetSpot%': (((angle >= SWEET_SPOT_ANGLES[0]) & (angle <= SWEET_SPOT_ANGLES[1])) * 100.0, launched),
+        'GB%': ((angle < GROUND_BALL_ANGLE) * 100.0, launched),
+        'Whiff%': (_flags(pitches_df['PitchCall'] == 'StrikeSwinging') * 100.0, swings),
+        'Chase%': (swings * 100.0, chase_chances),
+    }
+    if 'Extension' in pitches_df:
+        extension = pitches_df['Extension'].to_numpy(dtype='float64')
+        terms['Extension'] = (extension, ~np.isnan(extension))
+    return terms
+
+
+def player_sums(pitches_df, role):
+    players = pitches_df[role]
+    if not isinstance(players.dtype, pd.CategoricalDtype):
+        players = players.astype('category')
+    codes = players.cat.codes.to_numpy()
+    names = players.cat.categories
+    known = codes >= 0
+    codes = codes[known]
+    size = len(names)
+
+    sums = {'pitches': np.bincount(codes, minlength=size).astype('float64')}
+    hand = pitches_df[HAND_COLUMNS[role]]
+    sums['left'] = np.bincount(codes, weights=_flags(hand == 'Left')[known], minlength=size)
+    for metric, (values, selected) in metric_terms(pitches_df).items():
+        if metric not in LIVE_METRICS[role]:
+            continue
+        selected = selected[known]
+        sums[f'{metric}_sum'] = np.bincount(codes[selected], weights=values[known][selected], minlength=size)
+        sums[f'{metric}_count'] = np.bincount(codes[selected], minlength=size).astype('float64')
+    return pd.DataFrame(sums, index=pd.Index(names, name=role))
+
+
+def get_percentile_options(live=False):
+    min_pitches = request.values.get('min_pitches')
+    peers = request.values.get('peers')
+    if (not live and min_pitches is None and peers is None and request.values.get('percentiles') != 'live'
+            and get_pitch_filter() is None):
+        return None
+    if min_pitches is not None:
+        if not min_pitches.isdigit():
+            abort(400, description=f'Invalid min_pitches {min_pitches!r}; use a whole number.')
+        min_pitches = int(min_pitches)
+    if peers not in (None, *PEER_GROUPS):
+        abort(400, description=f'Invalid peers {peers!r}; use one of {", ".join(PEER_GROUPS)}.')
+    return {'pitch_filter': get_pitch_filter(), 'min_pitches': min_pitches, 'peers': peers or 'league'}
+
+
+class Population:
+    def __init__(self, role, start, end, mask):
+        self.role = role
+        self.start = start
+        self.end = end
+        self.mask = mask
+        self.frame = None
+        self.sums = None
+        self.last_key = None
+        self.processed = 0
+        self.version = None
+
+    def _window(self, keys):
+        low = 0 if self.start is None else int(np.searchsorted(keys, self.start, 'left'))
+        high = len(keys) if self.end is None else int(np.searchsorted(keys, self.end, 'right'))
+        return low, high
+
+    def _sums(self, pitches_df, low, high):
+        rows = pitches_df.iloc[low:high]
+        if self.mask:
+            rows = rows[(rows[SPLITS_COLUMN].to_numpy() & self.mask) == self.mask]
+        return player_sums(rows, self.role)
+
+    def sync(self, pitches_df):
+        if pitches_df is self.frame:
+            return
+        keys = pitches_df[DATE_KEY_COLUMN].to_numpy()
+        low, high = self._window(keys)
+        appended = None
+        if self.sums is not None and self.last_key is not None:
+            boundary = int(np.searchsorted(keys, self.last_key, 'right'))
+            if low <= boundary <= high and boundary - low == self.processed:
+                appended = boundary
+
+        if appended is None:
+            self.sums = self._sums(pitches_df, low, high)
+        elif appended < high:
+            self.sums = pd.concat([self.sums, self._sums(pitches_df, appended, high)]).groupby(level=0).sum()
+
+        self.frame = pitches_df
+        self.last_key = int(keys[high - 1]) if high > low else None
+        self.processed = high - low
+        self.version = next(_versions)
+
+
+class PercentileEngine:
+    def __init__(self, pitch_stores, max_populations=MAX_POPULATIONS):
+        self.pitch_stores = pitch_stores
+        self.max_populations = max_populations
+        self._lock = threading.Lock()
+        self._populations = OrderedDict()
+        self._views = OrderedDict()
+
+    def _remember(self, cache, key, value):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_populations:
+            cache.popitem(last=False)
+
+    def population(self, season, role, pitch_filter=None):
+        start, end, mask = (pitch_filter.start, pitch_filter.end, pitch_filter.mask) if pitch_filter else (None,) * 3
+        key = (season, role, start, end, mask or 0)
+        population = self._populations.get(key)
+        if population is None:
+            population = Population(role, start, end, mask)
+            self._remember(self._populations, key, population)
+        population.sync(self.pitch_stores[season].frame)
+        return population
+
+    def _view(self, role, seasons, pitch_filter, min_pitches, hand):
+        populations = [self.population(season, role, pitch_filter) for season in seasons]
+        key = (role, tuple(seasons), pitch_filter, min_pitches, hand)
+        versions = tuple(population.version for population in populations)
+        cached = self._views.get(key)
+        if cached is not None and cached[0] == versions:
+            return cached[1]
+
+        if len(populations) == 1:
+            sums = populations[0].sums
+        else:
+            sums = pd.concat([population.sums for population in populations]).groupby(level=0).sum()
+        pitches = sums['pitches'].to_numpy()
+        left = sums['left'].to_numpy()
+        qualified = pitches >= max(min_pitches, 1)
+        if hand is not None:
+            qualified &= (left * 2 > pitches) == (hand == 'Left')
+
+        values, sorted_values = {}, {}
+        for metric in LIVE_METRICS[role]:
+            if f'{metric}_sum' not in sums:
+                continue
+            counts = sums[f'{metric}_count'].to_numpy()
+            values[metric] = np.divide(sums[f'{metric}_sum'].to_numpy(), counts, out=np.full(len(counts), np.nan),
+                                       where=counts > 0)
+            sorted_values[metric] = np.sort(values[metric][qualified & (counts > 0)])
+
+        view = PercentileView({name: i for i, name in enumerate(sums.index)}, pitches, left, values, sorted_values)
+        self._remember(self._views, key, (versions, view))
+        return view
+
+    def percentiles(self, role, name, seasons, pitch_filter=None, min_pitches=None, peers='league'):
+        if pitch_filter is not None and pitch_filter.days is not None:
+            pitch_filter = resolve_window(pitch_filter, self.pitch_stores[seasons[-1]].last_date)
+        if min_pitches is None:
+            min_pitches = DEFAULT_MIN_PITCHES[role]
+
+        with self._lock:
+            view = self._view(role, seasons, pitch_filter, min_pitches, None)
+            position = view.positions.get(name)
+            if position is None or not view.pitches[position]:
+                return None
+            if peers == 'hand':
+                hand = 'Left' if view.left[position] * 2 > view.pitches[position] else 'Right'
+                view = self._view(role, seasons, pitch_filter, min_pitches, hand)
+
+        result = {'Pitches': int(view.pitches[position])}
+        for metric, population in view.sorted_values.items():
+            value = view.values[metric][position]
+            if np.isnan(value) or not len(population):
+                result[metric] = result[f'{metric}_percentile'] = None
+                continue
+            rank = (population.searchsorted(value, 'left') + population.searchsorted(value, 'right')) / 2
+            percentile = int(round(100 * rank / len(population)))
+            if metric in LOWER_IS_BETTER[role]:
+                percentile = 100 - percentile
+            result[metric] = round(float(value), 1)
+            result[f'{metric}_percentile'] = min(max(percentile, 1), 100)
+        return result
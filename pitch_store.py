@@ -0,0 +1,189 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from db import PITCH_TABLE, column_list, partition
+from metrics import add_rows, phase
+from shared_pitches import attach_pitches, current_generation, export_pitches, manifest_token
+from splits import DATE_KEY_COLUMN, SPLITS_COLUMN, date_keys, filter_positions, resolve_window, split_codes
+
+PITCH_COLUMNS = ['Date', 'Pitcher', 'PitcherThrows', 'PitcherTeam', 'Batter', 'BatterSide', 'BatterTeam', 'Catcher',
+                 'CatcherTeam', 'Umpire', 'AutoPitchType', 'PitchCall', 'PlayResult', 'RelSpeed', 'SpinRate',
+                 'HorzBreak', 'InducedVertBreak', 'ExitSpeed', 'Angle', 'Direction', 'PlateLocSide', 'PlateLocHeight',
+                 'RV', 'xwOBAcon_gb', 'Extension']
+COUNT_COLUMNS = ['Balls', 'Strikes']
+TRACKING_COLUMNS = ['RelSpeed', 'SpinRate', 'HorzBreak', 'InducedVertBreak', 'ExitSpeed', 'Angle', 'Direction',
+                    'PlateLocSide', 'PlateLocHeight', 'Extension']
+VALUE_COLUMNS = ['RV', 'xwOBAcon_gb']
+INDEX_COLUMNS = ['Pitcher', 'Batter', 'Catcher', 'Umpire']
+
+_NO_ROWS = np.array([], dtype=np.intp)
+
+
+def compact_pitches(pitches_df):
+    pitches_df = pitches_df.assign(**{DATE_KEY_COLUMN: date_keys(pitches_df['Date'])})
+    pitches_df = pitches_df.sort_values(DATE_KEY_COLUMN, kind='stable').reset_index(drop=True)
+    pitches_df[SPLITS_COLUMN] = split_codes(pitches_df)
+    pitches_df = pitches_df.drop(columns=COUNT_COLUMNS, errors='ignore')
+
+    for column in TRACKING_COLUMNS:
+        if column in pitches_df:
+            pitches_df[column] = pd.to_numeric(pitches_df[column], errors='coerce').astype('float32')
+
+    for column in VALUE_COLUMNS:
+        if column in pitches_df:
+            pitches_df[column] = pd.to_numeric(pitches_df[column], errors='coerce').astype('float64')
+
+    for column in pitches_df.select_dtypes('float64').columns.difference(VALUE_COLUMNS):
+        pitches_df[column] = pitches_df[column].astype('float32')
+
+    return categorize_strings(pitches_df)
+
+
+def categorize_strings(pitches_df):
+    for column in pitches_df.select_dtypes(exclude=['number', 'bool', 'category']).columns:
+        pitches_df[column] = pitches_df[column].astype('category')
+    return pitches_df
+
+
+def build_groups(pitches_df):
+    return {column: pitches_df.groupby(column, observed=True, sort=False).indices
+            for column in INDEX_COLUMNS if column in pitches_df}
+
+
+class PitchStore:
+    def __init__(self, database, table, shared_dir=None):
+        self.database = database
+        self.table = table
+        self.shared_dir = shared_dir
+        self._lock = threading.Lock()
+        self._state = None
+
+    def _read_table(self):
+        existing = set(self.database.table_columns(self.table))
+        columns = [column for column in PITCH_COLUMNS + COUNT_COLUMNS if column in existing]
+        return self.database.read_sql(f"SELECT {column_list(columns)} FROM '{self.table}'")
+
+    def _token(self):
+        if not self.shared_dir:
+            return self.database.version()
+        return manifest_token(self.shared_dir), self.database.version()
+
+    def _current_generation(self):
+        current = current_generation(self.shared_dir) if self.shared_dir else None
+        if current is None or current['version'] == self.database.version():
+            return current
+        return current if current.get('source') == self.database.table_version(self.table) else None
+
+    def _build(self):
+        token = self._token()
+        current = self._current_generation()
+        if current is not None:
+            pitches_df, groups = attach_pitches(self.shared_dir, current['generation'])
+            return pitches_df, groups, {}, token, current['generation']
+        pitches_df = compact_pitches(self._read_table())
+        return pitches_df, build_groups(pitches_df), {}, token, None
+
+    def reload(self):
+        state = self._build()
+        self._state = state
+        return state
+
+    def export(self):
+        version, source = self.database.version(), self.database.table_version(self.table)
+        pitches_df = compact_pitches(self._read_table())
+        generation = export_pitches(pitches_df, self.shared_dir, version, source, INDEX_COLUMNS)
+        self.reload()
+        return generation
+
+    def refresh(self):
+        if self.shared_dir and current_generation(self.shared_dir) is not None:
+            return self.export()
+        self.reload()
+        return None
+
+    def _snapshot(self):
+        state = self._state
+        if state is None or state[3] != self._token():
+            with self._lock:
+                if self._state is None or self._state is state:
+                    self._state = self._build()
+                state = self._state
+        return state
+
+    @property
+    def frame(self):
+        return self._snapshot()[0]
+
+    @property
+    def generation(self):
+        return self._snapshot()[4]
+
+    @property
+    def last_date(self):
+        keys = self.frame[DATE_KEY_COLUMN]
+        return int(keys.iloc[-1]) if len(keys) else None
+
+    def rows(self, role, name, columns=None, pitch_filter=None):
+        with phase('query'):
+            pitches_df, groups, _, _, _ = self._snapshot()
+            positions = groups[role].get(name, _NO_ROWS)
+            if pitch_filter is not None:
+                positions = filter_positions(positions, pitches_df[DATE_KEY_COLUMN].to_numpy(),
+                                             pitches_df[SPLITS_COLUMN].to_numpy(), pitch_filter)
+            if columns is None:
+                player_df = pitches_df.iloc[positions]
+            else:
+                player_df = pitches_df.iloc[positions, pitches_df.columns.get_indexer(columns)]
+            player_df = player_df.reset_index(drop=True)
+        add_rows(len(player_df))
+        return player_df
+
+    def derived(self, key, compute):
+        pitches_df, _, cache, _, _ = self._snapshot()
+        if key not in cache:
+            cache[key] = compute(pitches_df)
+        return cache[key]
+
+
+class SeasonPitchStores:
+    def __init__(self, database, shared_dir=None):
+        self.database = database
+        self.shared_dir = shared_dir
+        self._lock = threading.Lock()
+        self._stores = {}
+        self._combined = {}
+
+    def __getitem__(self, season):
+        store = self._stores.get(season)
+        if store is None:
+            with self._lock:
+                store = self._stores.get(season)
+                if store is None:
+                    shared_dir = os.path.join(self.shared_dir, str(season)) if self.shared_dir else None
+                    store = self._stores[season] = PitchStore(self.database, partition(PITCH_TABLE, season),
+                                                              shared_dir)
+        return store
+
+    def rows(self, role, name, seasons, columns=None, pitch_filter=None):
+        if pitch_filter is not None and pitch_filter.days is not None:
+            pitch_filter = resolve_window(pitch_filter, self[seasons[-1]].last_date)
+        if len(seasons) == 1:
+            return self[seasons[0]].rows(role, name, columns, pitch_filter)
+        return categorize_strings(pd.concat([self[season].rows(role, name, columns, pitch_filter)
+                                             for season in seasons], ignore_index=True))
+
+    def combined(self, seasons, key, compute):
+        if len(seasons) == 1:
+            return self[seasons[0]].derived(key, lambda pitches_df: compute([pitches_df]))
+        frames = [self[season].frame for season in seasons]
+        cache_key = (tuple(seasons), key)
+        cached = self._combined.get(cache_key)
+        if cached is not None and all(a is b for a, b in zip(cached[0], frames)):
+            return cached[1]
+        value = compute(frames)
+        with self._lock:
+            self._combined[cache_key] = (frames, value)
+        return value
@@ -0,0 +1,170 @@
+import gzip
+import hashlib
+import importlib
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from flask import g, request
+from werkzeug.exceptions import HTTPException
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+ROSTER_PARAMS = {'pitchers': 'Pitcher', 'hitters': 'Hitter', 'catchers': 'Catcher', 'umpires': 'Umpire'}
+ROSTER_COLUMNS = {'pitchers': 'Pitcher', 'hitters': 'Batter', 'catchers': 'Catcher', 'umpires': 'Umpire'}
+ROUTE_ROSTERS = {
+    '/pitch_summary': 'pitchers', '/update_pitcher_table': 'pitchers', '/update_pitcher_stats': 'pitchers',
+    '/update_pitch_chart': 'pitchers', '/update_pitcher_percentiles': 'pitchers', '/update_yakker_pitcher': 'pitchers',
+    '/update_rv_pitcher': 'pitchers', '/pitcher_bundle': 'pitchers', '/pitch_comps': 'pitchers',
+    '/hit_summary': 'hitters', '/update_hitter_stats': 'hitters', '/update_hitter_sz': 'hitters',
+    '/update_hitter_percentiles': 'hitters', '/update_rv_hitter': 'hitters', '/update_discipline': 'hitters',
+    '/hitter_bundle': 'hitters',
+    '/catch_summary': 'catchers', '/catcher_data': 'catchers',
+    '/ump_summary': 'umpires', '/ump_data': 'umpires',
+}
+SHARED_ROUTES = ['/catcher_leaderboard', '/ump_leaderboard']
+COLUMNAR_ROUTES = ['/update_pitch_chart', '/pitcher_bundle', '/update_hitter_sz', '/hitter_bundle', '/catcher_data',
+                   '/ump_data']
+
+MANIFEST_FILE = 'manifest.json'
+DATA_DIR = 'data'
+HASH_LENGTH = 16
+
+_app = None
+
+
+def player_digests(pitches_df, column):
+    players = pitches_df[column]
+    if not isinstance(players.dtype, pd.CategoricalDtype):
+        players = players.astype('category')
+    codes = players.cat.codes.to_numpy()
+    known = codes >= 0
+    hashes = pd.util.hash_pandas_object(pitches_df, index=False).to_numpy()
+    sums = np.zeros(len(players.cat.categories), dtype=np.uint64)
+    np.add.at(sums, codes[known], hashes[known])
+    counts = np.bincount(codes[known], minlength=len(sums))
+    return {name: f'{total:016x}-{count}' for name, total, count in zip(players.cat.categories, sums, counts)}
+
+
+def write_payload(output_dir, body):
+    name = f'{hashlib.sha256(body).hexdigest()[:HASH_LENGTH]}.json'
+    path = os.path.join(output_dir, DATA_DIR, name)
+    if not os.path.exists(path):
+        encodings = {'': body, '.gz': gzip.compress(body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            encodings['.br'] = brotli.compress(body)
+        for suffix, payload in encodings.items():
+            temporary = f'{path}{suffix}.{os.getpid()}.tmp'
+            with open(temporary, 'wb') as f:
+                f.write(payload)
+            os.replace(temporary, path + suffix)
+    return f'{DATA_DIR}/{name}'
+
+
+def render(app, path, params=None):
+    with app.test_request_context(path, query_string=params or {}):
+        g.prewarming = True
+        view = app.view_functions[request.url_rule.endpoint]
+        try:
+            response = app.make_response(getattr(view, '__wrapped__', view)())
+        except HTTPException:
+            return None
+        if response.status_code != 200:
+            return None
+        return response.get_data()
+
+
+def _init_worker(import_name):
+    global _app
+    _app = importlib.import_module(import_name).app
+
+
+def route_params(path):
+    return {'format': 'columnar'} if path in COLUMNAR_ROUTES else {}
+
+
+def _render_player(task):
+    output_dir, roster, name = task
+    files = {}
+    for path in (route for route, route_roster in ROUTE_ROSTERS.items() if route_roster == roster):
+        try:
+            body = render(_app, path, {ROSTER_PARAMS[roster]: name, **route_params(path)})
+        except Exception:
+            logger.exception("Prerendering %s for %s failed", path, name)
+            body = None
+        if body is not None:
+            files[path] = write_payload(output_dir, body)
+    return roster, name, files
+
+
+def _read_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def prerender(app, rosters, digests, output_dir, version, seasons, workers=None, full=False):
+    os.makedirs(os.path.join(output_dir, DATA_DIR), exist_ok=True)
+    previous = _read_manifest(output_dir)
+    routes = {path: {'roster': roster, 'param': ROSTER_PARAMS[roster], 'params': route_params(path)}
+              for path, roster in ROUTE_ROSTERS.items()}
+    if previous.get('seasons') != seasons or previous.get('routes') != routes:
+        full = True
+    previous_players = previous.get('players', {})
+
+    players = {roster: {} for roster in rosters}
+    tasks = []
+    for roster, names in rosters.items():
+        for name in names:
+            digest = digests[roster].get(name)
+            entry = previous_players.get(roster, {}).get(name)
+            if not full and entry is not None and entry['digest'] == digest:
+                players[roster][name] = entry
+            else:
+                players[roster][name] = {'digest': digest, 'files': {}}
+                tasks.append((output_dir, roster, name))
+
+    if tasks:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(app.import_name,)) as executor:
+            for roster, name, files in executor.map(_render_player, tasks, chunksize=8):
+                players[roster][name]['files'] = files
+
+    shared = {}
+    for path in SHARED_ROUTES:
+        body = render(app, path)
+        if body is not None:
+            shared[path] = write_payload(output_dir, body)
+    manifest = {
+        'version': version,
+        'seasons': seasons,
+        'generated': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'encodings': ['gzip'] + (['br'] if brotli is not None else []),
+        'routes': routes,
+        'players': players,
+        'shared': shared,
+    }
+    temporary = os.path.join(output_dir, f'{MANIFEST_FILE}.tmp')
+    with open(temporary, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(temporary, os.path.join(output_dir, MANIFEST_FILE))
+
+    referenced = {os.path.basename(file) for entry in players.values() for player in entry.values()
+                  for file in player['files'].values()} | {os.path.basename(file) for file in shared.values()}
+    removed = 0
+    for entry in os.listdir(os.path.join(output_dir, DATA_DIR)):
+        if entry.partition('.json')[0] + '.json' not in referenced:
+            os.remove(os.path.join(output_dir, DATA_DIR, entry))
+            removed += 1
+    return {'rendered': len(tasks), 'reused': sum(map(len, rosters.values())) - len(tasks), 'removed': removed}
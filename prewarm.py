@@ -0,0 +1,140 @@
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import g
+from werkzeug.exceptions import HTTPException
+
+logger = logging.getLogger(__name__)
+
+PREWARM_TOP_N = 200
+PREWARM_WORKERS = 2
+PREWARM_POLL_SECONDS = 5.0
+LIVE_REQUEST_LIMIT = 4
+MAX_TRACKED_REQUESTS = 10000
+
+
+class Prewarmer:
+    def __init__(self, app=None, version=None, top_n=PREWARM_TOP_N, workers=PREWARM_WORKERS,
+                 poll_seconds=PREWARM_POLL_SECONDS, live_limit=LIVE_REQUEST_LIMIT):
+        self.version = version
+        self.top_n = top_n
+        self.workers = workers
+        self.poll_seconds = poll_seconds
+        self.live_limit = live_limit
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._wake = threading.Event()
+        self._counts = Counter()
+        self._pending = set()
+        self._executor = None
+        self._thread = None
+        self._seen_version = None
+        self._live = 0
+        self.renders = 0
+        self.failures = 0
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.before_request(self._live_start)
+        app.teardown_request(self._live_end)
+
+    def _live_start(self):
+        g.live_request = True
+        with self._lock:
+            self._live += 1
+
+    def _live_end(self, exc=None):
+        if g.pop('live_request', False):
+            with self._idle:
+                self._live -= 1
+                self._idle.notify_all()
+
+    @property
+    def enabled(self):
+        return self.app is not None and self.top_n > 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None or not self.enabled:
+                return
+            self._seen_version = self.version()
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='prewarm')
+            self._thread = threading.Thread(target=self._watch, name='prewarm-watch', daemon=True)
+            self._thread.start()
+
+    def record(self, base):
+        if not self.enabled:
+            return
+        if self._thread is None:
+            self.start()
+        with self._lock:
+            self._counts[base] += 1
+            if len(self._counts) > MAX_TRACKED_REQUESTS:
+                self._counts = Counter(dict(self._counts.most_common(MAX_TRACKED_REQUESTS // 2)))
+
+    def refresh(self, base):
+        self._submit([base])
+
+    def trigger(self):
+        self._wake.set()
+
+    def _watch(self):
+        settling = None
+        while True:
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+            version = self.version()
+            if version == self._seen_version or version != settling:
+                settling = None if version == self._seen_version else version
+                continue
+            self._seen_version, settling = version, None
+            self.prewarm()
+
+    def prewarm(self):
+        with self._lock:
+            hot = [base for base, _ in self._counts.most_common(self.top_n)]
+            self._counts = Counter({base: count // 2 for base, count in self._counts.items() if count > 1})
+        self._submit(hot)
+        return len(hot)
+
+    def _submit(self, bases):
+        if not self.enabled:
+            return
+        if self._thread is None:
+            self.start()
+        with self._lock:
+            bases = [base for base in bases if base not in self._pending]
+            self._pending.update(bases)
+        for base in bases:
+            self._executor.submit(self._render, base)
+
+    def _render(self, base):
+        path, values, gzip = base
+        try:
+            with self._idle:
+                self._idle.wait_for(lambda: self._live < self.live_limit)
+            headers = {'Accept-Encoding': 'gzip'} if gzip else {}
+            with self.app.test_request_context(path, query_string=list(values), headers=headers):
+                g.prewarming = True
+                self.app.dispatch_request()
+            with self._lock:
+                self.renders += 1
+        except HTTPException:
+            pass
+        except Exception:
+            with self._lock:
+                self.failures += 1
+            logger.exception("Prewarming %s failed", path)
+        finally:
+            with self._lock:
+                self._pending.discard(base)
+
+    def stats(self):
+        with self._lock:
+            return {'tracked': len(self._counts), 'pending': len(self._pending), 'renders': self.renders,
+                    'failures': self.failures, 'live_requests': self._live}
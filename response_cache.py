@@ -0,0 +1,111 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import Response, g, make_response, request
+
+from payloads import accepts_gzip, compress_response
+
+
+class ResponseCache:
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._latest = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def stale(self, base):
+        with self._lock:
+            key = self._latest.get(base)
+            return None if key is None else self._entries.get(key)
+
+    def _discard(self, key):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.bytes -= len(previous[0])
+        if self._latest.get(key[0]) == key:
+            del self._latest[key[0]]
+        return previous
+
+    def put(self, key, entry):
+        size = len(entry[0])
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            superseded = self._latest.get(key[0])
+            if superseded is not None and superseded != key:
+                self._discard(superseded)
+            self._discard(key)
+            self._entries[key] = entry
+            self._latest[key[0]] = key
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._latest.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self.bytes, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+def cached_view(cache, version, prewarmer=None):
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            base = (request.path, tuple(sorted(request.values.items(multi=True))), accepts_gzip())
+            key = (base, version())
+            prewarming = g.get('prewarming', False)
+            if prewarmer is not None and not prewarming:
+                prewarmer.record(base)
+            entry = cache.get(key)
+            if entry is None and prewarmer is not None and not prewarming:
+                entry = cache.stale(base)
+                if entry is not None:
+                    prewarmer.refresh(base)
+            if entry is None:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                response = compress_response(response)
+                body = response.get_data()
+                entry = (body, hashlib.sha1(body).hexdigest(), response.mimetype,
+                         response.headers.get('Content-Encoding'))
+                cache.put(key, entry)
+
+            body, etag, mimetype, encoding = entry
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+            else:
+                response = Response(body, mimetype=mimetype)
+                if encoding:
+                    response.headers['Content-Encoding'] = encoding
+            response.vary.add('Accept-Encoding')
+            response.set_etag(etag)
+            response.cache_control.no_cache = True
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,64 @@
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class RosterIndex:
+    def __init__(self, database, cache_path):
+        self.database = database
+        self.cache_path = cache_path
+        self._loaders = {}
+        self._lock = threading.Lock()
+        self._version = None
+        self._rosters = {}
+
+    def register(self, name, loader):
+        self._loaders[name] = loader
+
+    def _read_sidecar(self, version):
+        try:
+            with open(self.cache_path) as f:
+                payload = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if payload.get('version') != version:
+            return {}
+        return {key: roster for key, roster in payload.get('rosters', {}).items()
+                if key.partition('/')[0] in self._loaders}
+
+    def _write_sidecar(self):
+        temporary = f'{self.cache_path}.{os.getpid()}.tmp'
+        try:
+            with open(temporary, 'w') as f:
+                json.dump({'version': self._version, 'rosters': self._rosters}, f)
+            os.replace(temporary, self.cache_path)
+        except OSError as e:
+            logger.warning("Could not write roster cache %s: %s", self.cache_path, e)
+
+    def _season_roster(self, name, season):
+        key = f'{name}/{season}'
+        if key not in self._rosters:
+            self._rosters[key] = self._loaders[name](season)
+            self._write_sidecar()
+        return self._rosters[key]
+
+    def get(self, name, seasons):
+        version = self.database.version()
+        with self._lock:
+            if self._version != version:
+                self._version = version
+                self._rosters = self._read_sidecar(version)
+            if len(seasons) == 1:
+                return self._season_roster(name, seasons[0])
+            return sorted(set().union(*(self._season_roster(name, season) for season in seasons)))
+
+    def refresh(self):
+        with self._lock:
+            self._version = self.database.version()
+            self._rosters = {f'{name}/{season}': loader(season) for name, loader in self._loaders.items()
+                             for season in self.database.seasons()}
+            self._write_sidecar()
+            return {key: len(roster) for key, roster in self._rosters.items()}
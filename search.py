@@ -0,0 +1,80 @@
+import bisect
+import difflib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+
+SEARCH_ROLES = {'pitcher': 'pitchers', 'hitter': 'hitters', 'catcher': 'catchers', 'umpire': 'umpires'}
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+FUZZY_CUTOFF = 0.7
+MAX_INDEXES = 16
+
+
+def normalize_name(name):
+    name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode()
+    return ' '.join(re.sub(r'[^a-z0-9 ]+', ' ', name.lower()).split())
+
+
+class NameIndex:
+    def __init__(self, rosters):
+        entries = set()
+        for role, names in rosters.items():
+            for name in names:
+                tokens = normalize_name(name).split()
+                entries.update((' '.join(tokens[start:]), start, name, role) for start in range(len(tokens)))
+        self.entries = sorted(entries)
+        self.keys = [entry[0] for entry in self.entries]
+        self.fuzzy_keys = sorted(set(self.keys))
+
+    def _collect(self, entries, role, limit, seen):
+        results = []
+        for _, _, name, entry_role in entries:
+            if (role is None or entry_role == role) and (name, entry_role) not in seen:
+                seen.add((name, entry_role))
+                results.append({'name': name, 'role': entry_role})
+                if len(results) >= limit:
+                    break
+        return results
+
+    def search(self, query, role=None, limit=DEFAULT_SEARCH_LIMIT):
+        query = normalize_name(query)
+        if not query:
+            return []
+        low = bisect.bisect_left(self.keys, query)
+        high = bisect.bisect_left(self.keys, query + '\x7f', low)
+        prefix = sorted(self.entries[low:high], key=lambda entry: (entry[1], entry[2]))
+        seen = set()
+        results = self._collect(prefix, role, limit, seen)
+        if len(results) < limit:
+            close = difflib.get_close_matches(query, self.fuzzy_keys, n=limit * 2, cutoff=FUZZY_CUTOFF)
+            fuzzy = [entry for key in close
+                     for entry in self.entries[bisect.bisect_left(self.keys, key):bisect.bisect_right(self.keys, key)]]
+            results += self._collect(fuzzy, role, limit - len(results), seen)
+        return results
+
+
+class PlayerSearch:
+    def __init__(self, database, rosters):
+        self.database = database
+        self.rosters = rosters
+        self._lock = threading.Lock()
+        self._indexes = OrderedDict()
+
+    def index(self, seasons):
+        key = (tuple(seasons), self.database.version())
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                return index
+        index = NameIndex({role: self.rosters.get(roster, seasons) for role, roster in SEARCH_ROLES.items()})
+        with self._lock:
+            self._indexes[key] = index
+            while len(self._indexes) > MAX_INDEXES:
+                self._indexes.popitem(last=False)
+        return index
+
+    def search(self, query, seasons, role=None, limit=DEFAULT_SEARCH_LIMIT):
+        return self.index(seasons).search(query, role, limit)
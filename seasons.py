@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+from flask import abort, request
+
+CAREER_VALUES = ['all', 'career']
+
+RATE_WEIGHTS = {'AvgEV': 'BBE', 'LA': 'BBE', 'SweetSpot%': 'BBE', 'HardHit%': 'BBE', 'xBA': 'BBE', 'xSLG': 'BBE'}
+CAREER_COMBINERS = {
+    'pitcher_yakker': {'sums': ['Pitches', 'BBE', 'Barrels'], 'maxes': ['Max EV'],
+                       'ratios': {'Barrel%': ('Barrels', 'BBE', 100)}, 'weights': RATE_WEIGHTS},
+    'pitcher_rv': {'keys': ['AutoPitchType'], 'sums': ['Pitches', 'RV'], 'ratios': {'RV/100': ('RV', 'Pitches', 100)}},
+    'hitter_rv': {'keys': ['AutoPitchType'], 'sums': ['Pitches', 'RV'], 'ratios': {'RV/100': ('RV', 'Pitches', 100)}},
+    'discipline': {'sums': ['Pitches']},
+}
+
+
+def parse_seasons(value, available):
+    if not available:
+        abort(404, description='No seasons are loaded.')
+    if not value:
+        return available[-1:]
+    if value.lower() in CAREER_VALUES:
+        return list(available)
+
+    start, _, end = value.partition('-')
+    try:
+        start, end = int(start), int(end or start)
+    except ValueError:
+        abort(400, description=f'Invalid season {value!r}; use a year, a range like 2021-2023, or "career".')
+    start, end = (start + 2000 if start < 100 else start), (end + 2000 if end < 100 else end)
+
+    seasons = [season for season in available if start <= season <= end]
+    if not seasons:
+        abort(404, description=f'No data for season {value}.')
+    return seasons
+
+
+def get_seasons(database):
+    return parse_seasons(request.values.get('season'), database.seasons())
+
+
+def combine_partials(frames, keys=(), sums=(), maxes=(), ratios=None, weights=None, weight='Pitches'):
+    frames = [frame for frame in frames if not frame.empty]
+    if len(frames) <= 1:
+        return frames[0] if frames else pd.DataFrame()
+
+    combined_df = pd.concat(frames, ignore_index=True)
+    groups = [combined_df[key] for key in keys] if keys else np.zeros(len(combined_df), dtype=np.int64)
+    result = {}
+    for column in combined_df.columns.difference(list(keys), sort=False):
+        values = pd.to_numeric(combined_df[column], errors='coerce')
+        if column in sums:
+            result[column] = values.groupby(groups, sort=False).sum()
+        elif column in maxes:
+            result[column] = values.groupby(groups, sort=False).max()
+        else:
+            column_weight = (weights or {}).get(column, weight)
+            weight_values = combined_df[column_weight].where(values.notna(), 0)
+            result[column] = ((values * weight_values).groupby(groups, sort=False).sum()
+                              / weight_values.groupby(groups, sort=False).sum()).round(3)
+
+    result_df = pd.DataFrame(result)
+    for column, (numerator, denominator, scale) in (ratios or {}).items():
+        result_df[column] = (result_df[numerator] / result_df[denominator].where(result_df[denominator] > 0)
+                             * scale).round(2)
+    if keys:
+        result_df = result_df.reset_index(names=list(keys))
+    return result_df[list(combined_df.columns)]
+
+
+def read_seasons(database, name, params, seasons):
+    if len(seasons) == 1:
+        return database.read(name, *params, season=seasons[0])
+    if name not in CAREER_COMBINERS:
+        return pd.DataFrame()
+    return combine_partials([database.read(name, *params, season=season) for season in seasons],
+                            **CAREER_COMBINERS[name])
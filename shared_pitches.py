@@ -0,0 +1,102 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+MANIFEST = 'CURRENT'
+COLUMNS_FILE = 'columns.json'
+KEEP_GENERATIONS = 2
+
+
+def _write_json(path, payload):
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w') as f:
+        json.dump(payload, f)
+    os.replace(temporary, path)
+
+
+def _generation_dir(directory, generation):
+    return os.path.join(directory, f'gen-{generation}')
+
+
+def manifest_token(directory):
+    try:
+        return os.stat(os.path.join(directory, MANIFEST)).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def current_generation(directory):
+    try:
+        with open(os.path.join(directory, MANIFEST)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def export_pitches(pitches_df, directory, version, source, index_columns):
+    os.makedirs(directory, exist_ok=True)
+    current = current_generation(directory)
+    generation = current['generation'] + 1 if current else 1
+    generation_dir = _generation_dir(directory, generation)
+    shutil.rmtree(generation_dir, ignore_errors=True)
+    os.makedirs(generation_dir)
+
+    columns = []
+    for position, (name, series) in enumerate(pitches_df.items()):
+        path = os.path.join(generation_dir, f'{position:02d}.npy')
+        if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            np.save(path, series.to_numpy())
+            columns.append({'name': name, 'kind': 'numeric'})
+            continue
+
+        is_category = isinstance(series.dtype, pd.CategoricalDtype)
+        categorical = series.array if is_category else pd.Categorical(series)
+        np.save(path, categorical.codes)
+        columns.append({'name': name, 'kind': 'category' if is_category else 'dictionary', 'dtype': str(series.dtype),
+                        'values': categorical.categories.tolist()})
+
+        if name in index_columns:
+            codes = categorical.codes
+            order = np.argsort(codes, kind='stable')
+            counts = np.bincount(codes[codes >= 0], minlength=len(categorical.categories))
+            offsets = np.concatenate([[0], np.cumsum(counts)]) + np.count_nonzero(codes < 0)
+            np.save(os.path.join(generation_dir, f'{position:02d}.order.npy'), order)
+            np.save(os.path.join(generation_dir, f'{position:02d}.offsets.npy'), offsets)
+            columns[-1]['indexed'] = True
+
+    _write_json(os.path.join(generation_dir, COLUMNS_FILE), columns)
+    _write_json(os.path.join(directory, MANIFEST),
+                {'generation': generation, 'version': version, 'source': source, 'rows': len(pitches_df)})
+
+    for entry in os.listdir(directory):
+        if entry.startswith('gen-') and entry[4:].isdigit() and int(entry[4:]) <= generation - KEEP_GENERATIONS:
+            shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+    return generation
+
+
+def attach_pitches(directory, generation):
+    generation_dir = _generation_dir(directory, generation)
+    with open(os.path.join(generation_dir, COLUMNS_FILE)) as f:
+        columns = json.load(f)
+
+    data = {}
+    groups = {}
+    for position, column in enumerate(columns):
+        values = np.load(os.path.join(generation_dir, f'{position:02d}.npy'), mmap_mode='r')
+        name = column['name']
+        if column['kind'] == 'numeric':
+            data[name] = pd.Series(values, name=name, copy=False)
+            continue
+
+        data[name] = pd.Series(pd.Categorical.from_codes(values, categories=column['values']), name=name, copy=False)
+
+        if column.get('indexed'):
+            order = np.load(os.path.join(generation_dir, f'{position:02d}.order.npy'), mmap_mode='r')
+            offsets = np.load(os.path.join(generation_dir, f'{position:02d}.offsets.npy'))
+            groups[name] = {value: order[start:end]
+                            for value, start, end in zip(column['values'], offsets[:-1], offsets[1:]) if end > start}
+
+    return pd.DataFrame(data, copy=False), groups
@@ -0,0 +1,100 @@
+from collections import namedtuple
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from flask import abort, request
+
+DATE_KEY_COLUMN = 'DateKey'
+SPLITS_COLUMN = 'Splits'
+MISSING_DATE = np.iinfo(np.int32).min
+
+HAND_VALUES = {'l': 'Left', 'left': 'Left', 'r': 'Right', 'right': 'Right'}
+BATTER_SIDE_BITS = {'Left': 1 << 0, 'Right': 1 << 1}
+PITCHER_THROWS_BITS = {'Left': 1 << 2, 'Right': 1 << 3}
+COUNT_BITS = {'first_pitch': 1 << 4, 'even': 1 << 5, 'pitcher_ahead': 1 << 6, 'hitter_ahead': 1 << 7,
+              'two_strikes': 1 << 8, 'three_balls': 1 << 9}
+
+PitchFilter = namedtuple('PitchFilter', ['start', 'end', 'days', 'mask'])
+
+
+def date_keys(dates):
+    parsed = pd.to_datetime(dates, errors='coerce')
+    days = parsed.to_numpy(dtype='datetime64[ns]').astype('datetime64[D]').astype(np.int64)
+    return np.where(parsed.isna().to_numpy(), MISSING_DATE, days).astype(np.int32)
+
+
+def split_codes(pitches_df):
+    codes = np.zeros(len(pitches_df), dtype=np.uint16)
+    for column, bits in (('BatterSide', BATTER_SIDE_BITS), ('PitcherThrows', PITCHER_THROWS_BITS)):
+        if column in pitches_df:
+            for value, bit in bits.items():
+                codes[(pitches_df[column] == value).to_numpy(dtype=bool, na_value=False)] |= bit
+
+    if 'Balls' in pitches_df and 'Strikes' in pitches_df:
+        balls = pd.to_numeric(pitches_df['Balls'], errors='coerce').to_numpy(dtype='float64')
+        strikes = pd.to_numeric(pitches_df['Strikes'], errors='coerce').to_numpy(dtype='float64')
+        states = {
+            'first_pitch': (balls == 0) & (strikes == 0),
+            'even': balls == strikes,
+            'pitcher_ahead': strikes > balls,
+            'hitter_ahead': balls > strikes,
+            'two_strikes': strikes == 2,
+            'three_balls': balls == 3,
+        }
+        for state, rows in states.items():
+            codes[rows] |= COUNT_BITS[state]
+    return codes
+
+
+def _date_param(name):
+    value = request.values.get(name)
+    if not value:
+        return None
+    try:
+        return (date.fromisoformat(value) - date(1970, 1, 1)).days
+    except ValueError:
+        abort(400, description=f'Invalid {name} {value!r}; use YYYY-MM-DD.')
+
+
+def _bit_param(name, bits, aliases=None):
+    value = request.values.get(name)
+    if not value:
+        return 0
+    key = (aliases or {}).get(value.lower(), value.lower())
+    if key not in bits:
+        abort(400, description=f'Invalid {name} {value!r}; use one of {", ".join(bits)}.')
+    return bits[key]
+
+
+def get_pitch_filter():
+    start, end = _date_param('start'), _date_param('end')
+    days = request.values.get('days', type=int)
+    if days is not None and days < 1:
+        abort(400, description='days must be a positive number of days.')
+    mask = (_bit_param('batter_side', BATTER_SIDE_BITS, HAND_VALUES)
+            | _bit_param('pitcher_throws', PITCHER_THROWS_BITS, HAND_VALUES)
+            | _bit_param('count', COUNT_BITS))
+    if start is None and end is None and days is None and not mask:
+        return None
+    return PitchFilter(start, end, days, mask)
+
+
+def resolve_window(pitch_filter, last_date):
+    if last_date is None:
+        return pitch_filter._replace(days=None)
+    start = last_date - pitch_filter.days + 1
+    if pitch_filter.start is not None:
+        start = max(start, pitch_filter.start)
+    return pitch_filter._replace(start=start, days=None)
+
+
+def filter_positions(positions, keys, codes, pitch_filter):
+    if pitch_filter.start is not None or pitch_filter.end is not None:
+        player_keys = keys[positions]
+        low = 0 if pitch_filter.start is None else np.searchsorted(player_keys, pitch_filter.start, 'left')
+        high = len(positions) if pitch_filter.end is None else np.searchsorted(player_keys, pitch_filter.end, 'right')
+        positions = positions[low:high]
+    if pitch_filter.mask:
+        positions = positions[(codes[positions] & pitch_filter.mask) == pitch_filter.mask]
+    return positions
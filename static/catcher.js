@@ -1,12 +1,13 @@
 var MIN_FRAMING_RUNS = -15.0;
 var MAX_FRAMING_RUNS = 15.0;
+var LEADERBOARD_PAGE_SIZE = 500;
 
 function getCatcherSummary() {
     return new Promise((resolve, reject) => {
         var selectedCatcher = $("#catcher").val();
         console.log(selectedCatcher);
         $.ajax({
-            type: "POST",
+            type: "GET",
             url: "/catch_summary",
             data: {
                 "Catcher": selectedCatcher,
@@ -31,13 +32,14 @@ function updateCatcherChart() {
         var selectedCatcher = $("#catcher").val();
         console.log(selectedCatcher);
         $.ajax({
-            type: "POST",
+            type: "GET",
             url: "/catcher_data",
             data: {
                 "Catcher": selectedCatcher,
+                "format": "columnar",
             },
             success: function (response) {
-                createCatcherChart(response.data);
+                createCatcherChart(decodeColumnar(response.data));
                 resolve();
             },
             error: function (error) {
@@ -133,6 +135,21 @@ function updateCatcherContent() {
 
 
 
+function fetchLeaderboard(url, rows) {
+    var data = rows.length ? {offset: rows.length, limit: LEADERBOARD_PAGE_SIZE} : undefined;
+    return $.ajax({type: "GET", url: url, data: data}).then(function (response) {
+        rows = rows.concat(response.leaderboard);
+        if (rows.length < response.total && response.leaderboard.length) {
+            return fetchLeaderboard(url, rows);
+        }
+        return rows;
+    });
+}
+
+function fixed(value, digits) {
+    return value == null ? '' : value.toFixed(digits);
+}
+
 function updateCatcherLeaderboard(data) {
     console.log(data);
     $('#framingBody').empty();
@@ -142,8 +159,8 @@ function updateCatcherLeaderboard(data) {
         var newRow = `<tr>
                         <td>${row.Catcher}</td>
                         <td>${row.Pitches}</td>
-                        <td style="background-color: ${color}; color: white;">${framingRuns.toFixed(2)}</td>
-                        <td>${row['Strike%'].toFixed(1)}</td>
+                        <td style="background-color: ${color}; color: white;">${fixed(framingRuns, 2)}</td>
+                        <td>${fixed(row['Strike%'], 1)}</td>
                      </tr>`;
         $('#framingBody').append(newRow);
     });
@@ -176,22 +193,11 @@ function hideLoadingScreen() {
 
 $(document).ready(function () {
     updateCatcherContent();
-    $.ajax({
-        type: "POST",
-        url: "/catcher_leaderboard",
-
-        success: function (response) {
-            updateCatcherLeaderboard(response.leaderboard);
-        },
-        error: function (error) {
-            console.error("Error fetching catcher leaders:", error);
-            reject("Error fetching catcher leaders");
-        }
+    fetchLeaderboard("/catcher_leaderboard", []).then(updateCatcherLeaderboard, function (error) {
+        console.error("Error fetching catcher leaders:", error);
     });
     $("#catcher").change(function () {
         updateCatcherContent();
     });
-    $('.select2').select2({
-        width: '80%'
-    });
+    playerSelect('catcher');
 });
\ No newline at end of file
@@ -0,0 +1,42 @@
+const columnarArrays = {
+    'uint8': Uint8Array,
+    'uint16': Uint16Array,
+    'uint32': Uint32Array,
+    'float32': Float32Array
+};
+
+function decodeBase64(encoded) {
+    const binary = atob(encoded);
+    const bytes = new Uint8Array(binary.length);
+    for (let i = 0; i < binary.length; i++) {
+        bytes[i] = binary.charCodeAt(i);
+    }
+    return bytes.buffer;
+}
+
+function decodeColumnar(payload) {
+    if (!payload || payload.format !== 'columnar') {
+        return payload;
+    }
+
+    const columns = {};
+    for (const name in payload.columns) {
+        const column = payload.columns[name];
+        if (column.type === 'dictionary') {
+            const codes = new columnarArrays[column.dtype](decodeBase64(column.codes));
+            columns[name] = Array.from(codes, code => code < column.values.length ? column.values[code] : null);
+        } else {
+            columns[name] = new columnarArrays[column.type](decodeBase64(column.data));
+        }
+    }
+
+    const rows = new Array(payload.length);
+    for (let i = 0; i < payload.length; i++) {
+        const row = {};
+        for (const name in columns) {
+            row[name] = columns[name][i];
+        }
+        rows[i] = row;
+    }
+    return rows;
+}
@@ -0,0 +1,16 @@
+const pageFilterParams = ['season', 'start', 'end', 'days', 'batter_side', 'pitcher_throws', 'count', 'min_pitches', 'peers',
+    'percentiles'];
+const pageFilters = new URLSearchParams(window.location.search);
+
+$.ajaxPrefilter(function (options) {
+    const params = [];
+    pageFilterParams.forEach(function (name) {
+        const value = pageFilters.get(name);
+        if (value && !new RegExp('(^|&)' + name + '=').test(options.data || '')) {
+            params.push(name + '=' + encodeURIComponent(value));
+        }
+    });
+    if (params.length) {
+        options.data = options.data ? options.data + '&' + params.join('&') : params.join('&');
+    }
+});
@@ -50,51 +50,6 @@ function createVeloTable(data) {
 }
 
 
-function getHitterSummary() {
-    return new Promise((resolve, reject) => {
-        var selectedHitter = $("#hitter").val();
-        console.log(selectedHitter);
-
-        $.ajax({
-            type: "POST",
-            url: "/hit_summary",
-            data: {
-                "Hitter": selectedHitter,
-            },
-            success: function (response) {
-                createHitterBattedBall(response.batted_ball);
-                $("#hitSummaryContainer").html(response.summary);
-                $("#hitterName").text(selectedHitter);
-                $("#hitterTeam").text(response.teamAndHand);
-                createVeloTable(response.data);
-                resolve();
-            },
-            error: function (error) {
-                console.error("Error fetching hitter summary:", error);
-                reject("Error fetching hitter summary");
-            }
-        });
-    });
-}
-
-
-function updateHittingStats() {
-    var hitter = $('#hitter').val();
-    $.ajax({
-        type: 'POST',
-        url: '/update_hitter_stats',
-        data: {
-            'Hitter': hitter
-        },
-        success: function (response) {
-            if (response.success) {
-                updateHittingTable(response.data);
-            }
-        }
-    });
-    return false;
-}
-
 function createHitterHeatmap(data) {
     const canvasWidth = 500;
     const canvasHeight = 500;
@@ -189,32 +144,6 @@ function createHitterHeatmap(data) {
 }
 
 
-function updateHitterSZ() {
-    return new Promise((resolve, reject) => {
-        $('#hitChart').empty();
-        var hitter = $('#hitter').val();
-
-        $.ajax({
-            type: 'POST',
-            url: '/update_hitter_sz',
-            data: {
-                'Hitter': hitter
-            },
-            success: function (response) {
-                if (response.success) {
-                    createHitterHeatmap(response.data);
-                    resolve();
-                } else {
-                    reject('Error updating percentiles');
-                }
-            },
-            error: function (error) {
-                reject('AJAX error');
-            }
-        });
-    });
-}
-
 function createHitterBattedBall(data) {
     $('#battedBallTableBody').empty();
 
@@ -235,11 +164,15 @@ function createHitterBattedBall(data) {
     });
 }
 
+function fixed(value, digits) {
+    return value == null ? '' : value.toFixed(digits);
+}
+
 function updateYakkerHTML(data) {
     $('#yakkerTableBody').empty();
 
     data.forEach(function (row) {
-        var newRow = `<tr><td>${row.Pitches}</td><td>${row['BBE']}</td><td>${(row['Barrels']).toFixed(0)}</td><td>${(row['Barrel%']).toFixed(1)}</td><td>${(row['AvgEV']).toFixed(1)}</td><td>${(row['Max EV']).toFixed(1)}</td><td>${(row['LA']).toFixed(1)}</td><td>${(row['SweetSpot%']).toFixed(1)}</td><td>${(row['xBA']).toFixed(3)}</td><td>${(row['xSLG']).toFixed(3)}</td><td>${(row['xwOBA']).toFixed(3)}</td><td>${(row['HardHit%']).toFixed(1)}</td><td>${(row['K%']).toFixed(1)}</td><td>${(row['BB%']).toFixed(1)}</td>t</tr>`;
+        var newRow = `<tr><td>${row.Pitches}</td><td>${row['BBE']}</td><td>${fixed(row['Barrels'], 0)}</td><td>${fixed(row['Barrel%'], 1)}</td><td>${fixed(row['AvgEV'], 1)}</td><td>${fixed(row['Max EV'], 1)}</td><td>${fixed(row['LA'], 1)}</td><td>${fixed(row['SweetSpot%'], 1)}</td><td>${fixed(row['xBA'], 3)}</td><td>${fixed(row['xSLG'], 3)}</td><td>${fixed(row['xwOBA'], 3)}</td><td>${fixed(row['HardHit%'], 1)}</td><td>${fixed(row['K%'], 1)}</td><td>${fixed(row['BB%'], 1)}</td>t</tr>`;
 
         $('#yakkerTableBody').append(newRow);
     });
@@ -265,31 +198,6 @@ function updateRunValueTable(data) {
     });
 }
 
-function updateDiscipline() {
-    return new Promise((resolve, reject) => {
-        var hitter = $('#hitter').val();
-
-        $.ajax({
-            type: 'POST',
-            url: '/update_discipline',
-            data: {
-                'Hitter': hitter
-            },
-            success: function (response) {
-                if (response.success) {
-                    updateDisciplineTable(response.data);
-                    resolve();
-                } else {
-                    reject('Error updating discipline');
-                }
-            },
-            error: function (error) {
-                reject('AJAX error');
-            }
-        });
-    });
-}
-
 function updateDisciplineTable(data) {
     return new Promise((resolve, reject) => {
         try {
@@ -322,58 +230,6 @@ function updateDisciplineTable(data) {
 }
 
 
-function updateRV() {
-    return new Promise((resolve, reject) => {
-        var hitter = $('#hitter').val();
-
-        $.ajax({
-            type: 'POST',
-            url: '/update_rv_hitter',
-            data: {
-                'Hitter': hitter
-            },
-            success: function (response) {
-                if (response.success) {
-                    updateRunValueTable(response.data);
-                    resolve();
-                } else {
-                    reject('Error updating RV');
-                }
-            },
-            error: function (error) {
-                reject('AJAX error');
-            }
-        });
-    });
-}
-
-function updateHitPercentiles() {
-    return new Promise((resolve, reject) => {
-        $('#percentileHitChart').empty();
-        var hitter = $('#hitter').val();
-
-        $.ajax({
-            type: 'POST',
-            url: '/update_hitter_percentiles',
-            data: {
-                'Hitter': hitter
-            },
-            success: function (response) {
-                if (response.success) {
-                    createHitPercentiles(response.data);
-                    updateYakkerHTML(response.data);
-                    resolve();
-                } else {
-                    reject('Error updating percentiles');
-                }
-            },
-            error: function (error) {
-                reject('AJAX error');
-            }
-        });
-    });
-}
-
 function createHitPercentiles(data) {
     var margin = {
             top: 30,
@@ -384,7 +240,7 @@ function createHitPercentiles(data) {
         width = 500 - margin.left - margin.right,
         height = 600 - margin.top - margin.bottom;
 
-    getX = (percentile) => ((width * percentile) / 100);
+    getX = (percentile) => percentile == null ? null : (width * percentile) / 100;
 
     percentileData = [{
             label: 'xwOBAcon',
@@ -602,7 +458,7 @@ function createHitPercentiles(data) {
         .attr('fill', 'rgb(155, 155, 155)');
 
     circles = svg.selectAll('.ranks')
-        .data(percentileData)
+        .data(percentileData.filter(d => d.cx !== null))
         .enter()
         .append('circle')
         .attr('class', 'ranks')
@@ -637,7 +493,7 @@ function createHitPercentiles(data) {
     };
 
     text = svg.selectAll('.percentRank')
-        .data(percentileData)
+        .data(percentileData.filter(d => d.cx !== null))
         .enter()
         .append('text')
         .attr('class', 'percentRank')
@@ -651,7 +507,7 @@ function createHitPercentiles(data) {
             'white' : 'black');
 
     percentileLines = svg.selectAll('.percentileLine')
-        .data(percentileData)
+        .data(percentileData.filter(d => d.cx !== null))
         .enter()
         .append('line')
         .attr('class', 'percentileLine')
@@ -665,17 +521,56 @@ function createHitPercentiles(data) {
     d3.select('#percentileHitChart').node().append(svg.node());
 }
 
+function loadHitterBundle() {
+    return new Promise((resolve, reject) => {
+        var selectedHitter = $("#hitter").val();
+        $('#hitChart').empty();
+        $('#percentileHitChart').empty();
+
+        $.ajax({
+            type: 'GET',
+            url: '/hitter_bundle',
+            data: {
+                'Hitter': selectedHitter,
+                'format': 'columnar'
+            },
+            success: function (response) {
+                createHitterBattedBall(response.summary.batted_ball);
+                $("#hitSummaryContainer").html(response.summary.summary);
+                $("#hitterName").text(selectedHitter);
+                $("#hitterTeam").text(response.summary.teamAndHand);
+                createVeloTable(response.summary.data);
+
+                if (response.stats.success) {
+                    updateHittingTable(response.stats.data);
+                }
+                if (response.sz.success) {
+                    createHitterHeatmap(decodeColumnar(response.sz.data));
+                }
+                if (response.percentiles.success) {
+                    createHitPercentiles(response.percentiles.data);
+                    updateYakkerHTML(response.percentiles.data);
+                }
+                if (response.rv.success) {
+                    updateRunValueTable(response.rv.data);
+                }
+                if (response.discipline.success) {
+                    updateDisciplineTable(response.discipline.data);
+                }
+                resolve();
+            },
+            error: function (error) {
+                console.error("Error fetching hitter bundle:", error);
+                reject('AJAX error');
+            }
+        });
+    });
+}
+
 function updateHitterContent() {
     showLoadingScreen();
 
-    Promise.all([
-            getHitterSummary(),
-            updateHittingStats(),
-            updateHitPercentiles(),
-            updateHitterSZ(),
-            updateRV(),
-            updateDiscipline()
-        ])
+    loadHitterBundle()
         .then(() => {
             hideLoadingScreen();
         })
@@ -704,7 +599,5 @@ $(document).ready(function () {
     $("#hitter").change(function () {
         updateHitterContent();
     });
-    $('.select2').select2({
-        width: '80%'
-    });
+    playerSelect('hitter');
 });
\ No newline at end of file
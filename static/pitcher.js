@@ -14,56 +14,6 @@ const pitchColors = {
     'Offspeed': 'darkorange'
 };
 
-function getPitcherSummary() {
-    return new Promise((resolve, reject) => {
-        var selectedPitcher = $("#pitcher").val();
-
-        $.ajax({
-            type: "POST",
-            url: "/pitch_summary",
-            data: {
-                "Pitcher": selectedPitcher,
-            },
-            success: function (response) {
-                $("#pitchNamesContainer").html(response.summary);
-                $("#pitcherName").text(selectedPitcher);
-                $("#pitcherTeamHand").text(response.teamAndHand);
-
-                resolve();
-            },
-            error: function (error) {
-                console.error("Error fetching unique pitch names:", error);
-                reject("Error fetching unique pitch names");
-            }
-        });
-    });
-}
-
-function updateTable() {
-    return new Promise((resolve, reject) => {
-        var pitcher = $('#pitcher').val();
-
-        $.ajax({
-            type: 'POST',
-            url: '/update_pitcher_table',
-            data: {
-                'Pitcher': pitcher
-            },
-            success: function (response) {
-                if (response.success) {
-                    updateHTMLTable(response.data);
-                    resolve();
-                } else {
-                    reject('Error updating table');
-                }
-            },
-            error: function (error) {
-                reject('AJAX error');
-            }
-        });
-    });
-}
-
 function updatePitchingTable(data) {
     return new Promise((resolve, reject) => {
         try {
@@ -93,36 +43,15 @@ function updatePitchingTable(data) {
 }
 
 
-function updatePitchingStats() {
-    return new Promise((resolve, reject) => {
-        var pitcher = $('#pitcher').val();
-
-        $.ajax({
-            type: 'POST',
-            url: '/update_pitcher_stats',
-            data: {
-                'Pitcher': pitcher
-            },
-            success: function (response) {
-                if (response.success) {
-                    updatePitchingTable(response.data);
-                    resolve();
-                } else {
-                    reject('Error updating table');
-                }
-            },
-            error: function (error) {
-                reject('AJAX error');
-            }
-        });
-    });
+function fixed(value, digits) {
+    return value == null ? '' : value.toFixed(digits);
 }
 
 function updateYakkerHTML(data) {
     $('#yakkerTableBody').empty();
 
     data.forEach(function (row) {
-        var newRow = `<tr><td>${row.Pitches}</td><td>${row['BBE']}</td><td>${(row['Barrels']).toFixed(0)}</td><td>${(row['Barrel%']).toFixed(1)}</td><td>${(row['AvgEV']).toFixed(1)}</td><td>${(row['Max EV']).toFixed(1)}</td><td>${(row['LA']).toFixed(1)}</td><td>${(row['SweetSpot%']).toFixed(1)}</td><td>${(row['xBA']).toFixed(3)}</td><td>${(row['xSLG']).toFixed(3)}</td><td>${((row['xERA']) / 10).toFixed(3)}</td><td>${(row['HardHit%']).toFixed(1)}</td><td>${(row['K%']).toFixed(1)}</td><td>${(row['BB%']).toFixed(1)}</td>t</tr>`;
+        var newRow = `<tr><td>${row.Pitches}</td><td>${row['BBE']}</td><td>${fixed(row['Barrels'], 0)}</td><td>${fixed(row['Barrel%'], 1)}</td><td>${fixed(row['AvgEV'], 1)}</td><td>${fixed(row['Max EV'], 1)}</td><td>${fixed(row['LA'], 1)}</td><td>${fixed(row['SweetSpot%'], 1)}</td><td>${fixed(row['xBA'], 3)}</td><td>${fixed(row['xSLG'], 3)}</td><td>${fixed(row['xERA'] == null ? null : row['xERA'] / 10, 3)}</td><td>${fixed(row['HardHit%'], 1)}</td><td>${fixed(row['K%'], 1)}</td><td>${fixed(row['BB%'], 1)}</td>t</tr>`;
 
         $('#yakkerTableBody').append(newRow);
     });
@@ -143,52 +72,63 @@ function updateHTMLTable(data) {
 }
 
 
-function updatePitcherContent() {
-    showLoadingScreen();
-
-    Promise.all([
-            getPitcherSummary(),
-            updatePitchingStats(),
-            updateTable(),
-            updateRV(),
-            updatePitchChart(),
-            updatePercentiles()
-        ])
-        .then(() => {
-            hideLoadingScreen();
-        })
-        .catch(error => {
-            console.error('Error updating pitcher content:', error);
-            hideLoadingScreen();
-        });
-}
-
-function updatePitchChart() {
+function loadPitcherBundle() {
     return new Promise((resolve, reject) => {
+        var selectedPitcher = $("#pitcher").val();
         $('#pitchChart').empty();
-        var pitcher = $('#pitcher').val();
+        $('#percentileChart').empty();
 
         $.ajax({
-            type: 'POST',
-            url: '/update_pitch_chart',
+            type: 'GET',
+            url: '/pitcher_bundle',
             data: {
-                'Pitcher': pitcher
+                'Pitcher': selectedPitcher,
+                'format': 'columnar'
             },
             success: function (response) {
-                if (response.success) {
-                    createPitchChart(response.data);
-                    resolve();
-                } else {
-                    reject('Error updating charts');
+                $("#pitchNamesContainer").html(response.summary.summary);
+                $("#pitcherName").text(selectedPitcher);
+                $("#pitcherTeamHand").text(response.summary.teamAndHand);
+
+                if (response.stats.success) {
+                    updatePitchingTable(response.stats.data);
+                }
+                if (response.table.success) {
+                    updateHTMLTable(response.table.data);
+                }
+                if (response.rv.success) {
+                    updateRunValueTable(response.rv.data);
+                }
+                if (response.chart.success) {
+                    createPitchChart(decodeColumnar(response.chart.data));
+                }
+                if (response.percentiles.success) {
+                    createPercentiles(response.percentiles.data);
+                    updateYakkerHTML(response.percentiles.data);
                 }
+                resolve();
             },
             error: function (error) {
+                console.error("Error fetching pitcher bundle:", error);
                 reject('AJAX error');
             }
         });
     });
 }
 
+function updatePitcherContent() {
+    showLoadingScreen();
+
+    loadPitcherBundle()
+        .then(() => {
+            hideLoadingScreen();
+        })
+        .catch(error => {
+            console.error('Error updating pitcher content:', error);
+            hideLoadingScreen();
+        });
+}
+
 function createPitchChart(data) {
     var margin = {
             top: 30,
@@ -305,59 +245,6 @@ function createPitchChart(data) {
     }
 }
 
-function updatePercentiles() {
-    return new Promise((resolve, reject) => {
-        $('#percentileChart').empty();
-        var pitcher = $('#pitcher').val();
-
-        $.ajax({
-            type: 'POST',
-            url: '/update_pitcher_percentiles',
-            data: {
-                'Pitcher': pitcher
-            },
-            success: function (response) {
-                if (response.success) {
-                    createPercentiles(response.data);
-                    updateYakkerHTML(response.data);
-                    resolve();
-                } else {
-                    reject('Error updating percentiles');
-                }
-            },
-            error: function (error) {
-                reject('AJAX error');
-            }
-        });
-    });
-}
-
-function updateRV() {
-    return new Promise((resolve, reject) => {
-        var pitcher = $('#pitcher').val();
-
-        $.ajax({
-            type: 'POST',
-            url: '/update_rv_pitcher',
-            data: {
-                'Pitcher': pitcher
-            },
-            success: function (response) {
-                if (response.success) {
-                    updateRunValueTable(response.data);
-                    resolve();
-                } else {
-                    reject('Error updating RV');
-                }
-            },
-            error: function (error) {
-                reject('AJAX error');
-            }
-        });
-    });
-}
-
-
 function createPercentiles(data) {
     var margin = {
             top: 30,
@@ -368,7 +255,7 @@ function createPercentiles(data) {
         width = 500 - margin.left - margin.right,
         height = 625 - margin.top - margin.bottom;
 
-    getX = (percentile) => (width * percentile) / 100;
+    getX = (percentile) => percentile == null ? null : (width * percentile) / 100;
 
     percentileData = [{
             label: 'xERA',
@@ -601,7 +488,7 @@ function createPercentiles(data) {
         .attr('fill', 'rgb(155, 155, 155)');
 
     circles = svg.selectAll('.ranks')
-        .data(percentileData)
+        .data(percentileData.filter(d => d.cx !== null))
         .enter()
         .append('circle')
         .attr('class', 'ranks')
@@ -636,7 +523,7 @@ function createPercentiles(data) {
     };
 
     text = svg.selectAll('.percentRank')
-        .data(percentileData)
+        .data(percentileData.filter(d => d.cx !== null))
         .enter()
         .append('text')
         .attr('class', 'percentRank')
@@ -650,7 +537,7 @@ function createPercentiles(data) {
             'white' : 'black');
 
     percentileLines = svg.selectAll('.percentileLine')
-        .data(percentileData)
+        .data(percentileData.filter(d => d.cx !== null))
         .enter()
         .append('line')
         .attr('class', 'percentileLine')
@@ -703,7 +590,5 @@ $(document).ready(function () {
     $("#pitcher").change(function () {
         updatePitcherContent();
     });
-    $('.select2').select2({
-        width: '80%'
-    });
+    playerSelect('pitcher');
 });
\ No newline at end of file
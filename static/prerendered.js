@@ -0,0 +1,45 @@
+const prerenderedManifestUrl = document.currentScript.dataset.manifest;
+const prerenderedBase = prerenderedManifestUrl ? prerenderedManifestUrl.replace(/[^/]*$/, '') : '';
+let prerendered = null;
+
+if (prerenderedManifestUrl) {
+    $.ajax({
+        url: prerenderedManifestUrl,
+        dataType: 'json',
+        async: false,
+        success: function (manifest) {
+            prerendered = manifest;
+        },
+        error: function (error) {
+            console.error("Error fetching prerendered manifest:", error);
+        }
+    });
+}
+
+function prerenderedFile(url, params) {
+    if (url in prerendered.shared) {
+        return params.toString() ? null : prerendered.shared[url];
+    }
+    const route = prerendered.routes[url];
+    if (!route) {
+        return null;
+    }
+    const expected = Object.assign({[route.param]: params.get(route.param)}, route.params);
+    if (Array.from(params.keys()).length !== Object.keys(expected).length ||
+        Object.keys(expected).some(name => params.get(name) !== expected[name])) {
+        return null;
+    }
+    const player = prerendered.players[route.roster][expected[route.param]];
+    return player ? player.files[url] || null : null;
+}
+
+$.ajaxPrefilter(function (options) {
+    if (!prerendered || options.type.toUpperCase() !== 'GET') {
+        return;
+    }
+    const file = prerenderedFile(options.url, new URLSearchParams(options.data || ''));
+    if (file) {
+        options.url = prerenderedBase + file;
+        options.data = '';
+    }
+});
@@ -0,0 +1,21 @@
+function playerSelect(role) {
+    $('.select2').select2({
+        width: '80%',
+        minimumInputLength: 1,
+        ajax: {
+            url: '/search',
+            dataType: 'json',
+            delay: 150,
+            data: function (params) {
+                return {q: params.term, role: role};
+            },
+            processResults: function (response) {
+                return {
+                    results: response.results.map(function (result) {
+                        return {id: result.name, text: result.name};
+                    })
+                };
+            }
+        }
+    });
+}
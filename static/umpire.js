@@ -1,9 +1,11 @@
+var LEADERBOARD_PAGE_SIZE = 500;
+
 function getUmpireSummary() {
     return new Promise((resolve, reject) => {
         var selectedUmpire = $("#umpire").val();
         console.log(selectedUmpire);
         $.ajax({
-            type: "POST",
+            type: "GET",
             url: "/ump_summary",
             data: {
                 "Umpire": selectedUmpire,
@@ -26,13 +28,14 @@ function updateUmpChart() {
     return new Promise((resolve, reject) => {
         var selectedUmp = $("#umpire").val();
         $.ajax({
-            type: "POST",
+            type: "GET",
             url: "/ump_data",
             data: {
                 "Umpire": selectedUmp,
+                "format": "columnar",
             },
             success: function (response) {
-                createUmpChart(response.data);
+                createUmpChart(decodeColumnar(response.data));
                 resolve();
             },
             error: function (error) {
@@ -124,16 +127,31 @@ function updateUmpireContent() {
         });
 }
 
+function fetchLeaderboard(url, rows) {
+    var data = rows.length ? {offset: rows.length, limit: LEADERBOARD_PAGE_SIZE} : undefined;
+    return $.ajax({type: "GET", url: url, data: data}).then(function (response) {
+        rows = rows.concat(response.leaderboard);
+        if (rows.length < response.total && response.leaderboard.length) {
+            return fetchLeaderboard(url, rows);
+        }
+        return rows;
+    });
+}
+
+function fixed(value, digits) {
+    return value == null ? '' : value.toFixed(digits);
+}
+
 function updateUmpLeaderboard(data) {
     $('#umpLeadersBody').empty();
     data.forEach(function (row) {
         var newRow = `<tr>
                         <td>${row.Umpire}</td>
                         <td>${row.Pitches}</td>
-                        <td>${row['Total Pitch Accuracy'].toFixed(1)}</td>                        
-                        <td>${row['Called Strike Accuracy'].toFixed(1)}</td>
-                        <td>${row['Called Ball Accuracy'].toFixed(1)}</td>
-                        <td>${(row['Zone Size'] * 12).toFixed(1)}</td>
+                        <td>${fixed(row['Total Pitch Accuracy'], 1)}</td>                        
+                        <td>${fixed(row['Called Strike Accuracy'], 1)}</td>
+                        <td>${fixed(row['Called Ball Accuracy'], 1)}</td>
+                        <td>${row['Zone Above Average'] == null ? '' : (row['Zone Above Average'] * 100).toFixed(1)}</td>
                      </tr>`;
         $('#umpLeadersBody').append(newRow);
     });
@@ -156,22 +174,11 @@ function hideLoadingScreen() {
 
 $(document).ready(function () {
     updateUmpireContent();
-    $.ajax({
-        type: "POST",
-        url: "/ump_leaderboard",
-
-        success: function (response) {
-            updateUmpLeaderboard(response.leaderboard);
-        },
-        error: function (error) {
-            console.error("Error fetching ump leaders:", error);
-            reject("Error fetching ump leaders");
-        }
+    fetchLeaderboard("/ump_leaderboard", []).then(updateUmpLeaderboard, function (error) {
+        console.error("Error fetching ump leaders:", error);
     });
     $("#umpire").change(function () {
         updateUmpireContent();
     });
-    $('.select2').select2({
-        width: '80%'
-    });
+    playerSelect('umpire');
 });
\ No newline at end of file
@@ -0,0 +1,395 @@
+import argparse
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from db import DISCIPLINE_COLUMNS, HITTER_PERCENTILE_COLUMNS, PITCHER_PERCENTILE_COLUMNS, YAKKER_COLUMNS
+from ingest import PITCH_RUN_VALUES, PLAY_RUN_VALUES
+from zone_grid import SWINGS
+
+LAST_SEASON = 2023
+TEAMS = ['Boomers', 'Miners', 'Grizzlies', 'Otters', 'ValleyCats', 'Aigles', 'Jackals', 'Crushers', 'Titans',
+         'Slammers', 'Boulders', 'Capitales', 'Frontier Greys', 'Wild Things', 'Empire State', 'Sussex County']
+FIRST_NAMES = ['Aaron', 'Alex', 'Andrew', 'Austin', 'Ben', 'Blake', 'Brandon', 'Brett', 'Caleb', 'Carlos', 'Chase',
+               'Chris', 'Cody', 'Cole', 'Connor', 'Dalton', 'Daniel', 'David', 'Derek', 'Dylan', 'Eli', 'Eric',
+               'Ethan', 'Evan', 'Garrett', 'Grant', 'Hunter', 'Jack', 'Jacob', 'Jake', 'Jared', 'Jason', 'Javier',
+               'Jordan', 'Jose', 'Josh', 'Juan', 'Justin', 'Kyle', 'Logan', 'Luis', 'Luke', 'Marcus', 'Matt', 'Max',
+               'Michael', 'Miguel', 'Nate', 'Nick', 'Noah', 'Owen', 'Parker', 'Ryan', 'Sam', 'Sean', 'Seth', 'Tanner',
+               'Travis', 'Trevor', 'Tyler', 'Will', 'Zach']
+LAST_NAMES = ['Adams', 'Allen', 'Alvarez', 'Bailey', 'Baker', 'Bell', 'Brooks', 'Brown', 'Butler', 'Campbell',
+              'Carter', 'Castillo', 'Clark', 'Collins', 'Cook', 'Cooper', 'Cruz', 'Davis', 'Diaz', 'Edwards', 'Evans',
+              'Fisher', 'Flores', 'Foster', 'Garcia', 'Gomez', 'Gonzalez', 'Gray', 'Green', 'Hall', 'Harris', 'Hayes',
+              'Hernandez', 'Hill', 'Howard', 'Hughes', 'Jackson', 'James', 'Jenkins', 'Johnson', 'Jones', 'Kelly',
+              'King', 'Lee', 'Lewis', 'Long', 'Lopez', 'Martin', 'Martinez', 'Miller', 'Mitchell', 'Moore', 'Morales',
+              'Morgan', 'Murphy', 'Nelson', 'Nguyen', 'Ortiz', 'Parker', 'Perez', 'Peterson', 'Phillips', 'Price',
+              'Ramirez', 'Reed', 'Reyes', 'Rivera', 'Roberts', 'Robinson', 'Rodriguez', 'Rogers', 'Ross', 'Russell',
+              'Sanchez', 'Sanders', 'Scott', 'Smith', 'Stewart', 'Sullivan', 'Taylor', 'Thomas', 'Thompson', 'Torres',
+              'Turner', 'Walker', 'Ward', 'Watson', 'White', 'Williams', 'Wilson', 'Wood', 'Wright', 'Young']
+
+PITCH_SHAPES = pd.DataFrame({
+    'RelSpeed': [90.5, 89.5, 86.5, 81.5, 75.5, 82.0, 83.0],
+    'SpinRate': [2250, 2150, 2300, 2400, 2500, 1750, 1450],
+    'HorzBreak': [8.0, 15.0, -2.5, -5.5, -8.0, 14.0, 10.0],
+    'InducedVertBreak': [16.0, 8.0, 9.0, 2.0, -8.0, 6.0, 3.0],
+}, index=['Fastball', 'Sinker', 'Cutter', 'Slider', 'Curveball', 'Changeup', 'Splitter'])
+SECONDARY_PITCHES = ['Cutter', 'Slider', 'Curveball', 'Changeup', 'Splitter']
+BREAKING_WHIFF = {'Slider': 0.33, 'Curveball': 0.3, 'Changeup': 0.3, 'Splitter': 0.34}
+
+STRIKE_ZONE = (-0.83, 0.83, 1.5, 3.5)
+
+DEFAULT_PITCHES_PER_SEASON = 220000
+
+
+def _names(rng, count, taken):
+    names = []
+    while len(names) < count:
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+        if name not in taken:
+            taken.add(name)
+            names.append(name)
+    return names
+
+
+def _players(rng, count, taken, **attributes):
+    players = pd.DataFrame({'Name': _names(rng, count, taken)})
+    for column, sample in attributes.items():
+        players[column] = sample(count)
+    return players
+
+
+def _season_rosters(rng, seasons, per_team, taken, retention=0.65, **attributes):
+    rosters = []
+    pool = _players(rng, per_team * len(TEAMS), taken, **attributes)
+    pool['Team'] = np.repeat(np.arange(len(TEAMS)), per_team)
+    for season in range(seasons):
+        if season:
+            kept = pool[rng.random(len(pool)) < retention].copy()
+            kept['Team'] = np.where(rng.random(len(kept)) < 0.2, rng.integers(0, len(TEAMS), len(kept)), kept['Team'])
+            filled = kept.groupby('Team').size().reindex(range(len(TEAMS)), fill_value=0)
+            openings = per_team - filled.clip(upper=per_team)
+            new = _players(rng, int(openings.sum()), taken, **attributes)
+            new['Team'] = np.repeat(openings.index.to_numpy(), openings.to_numpy())
+            pool = pd.concat([kept, new], ignore_index=True)
+        rosters.append(pool.assign(Weight=rng.lognormal(0, 0.7, len(pool))))
+    return rosters
+
+
+def _pick_within_team(rng, teams, roster):
+    picked = np.empty(len(teams), dtype=np.int64)
+    for team, members in roster.groupby('Team').indices.items():
+        mask = teams == team
+        weights = roster['Weight'].to_numpy()[members]
+        picked[mask] = rng.choice(members, mask.sum(), p=weights / weights.sum())
+    return picked
+
+
+def _arsenal(rng):
+    primary = 'Sinker' if rng.random() < 0.25 else 'Fastball'
+    secondary = list(rng.choice(SECONDARY_PITCHES, rng.integers(1, 4), replace=False))
+    pitches = [primary] + secondary
+    usage = rng.dirichlet(np.r_[4.0, np.full(len(secondary), 1.5)])
+    return pitches, usage
+
+
+def generate_pitches(rng, seasons, pitches_per_season):
+    taken = set()
+    pitcher_rosters = _season_rosters(rng, seasons, 24, taken,
+                                      Throws=lambda n: np.where(rng.random(n) < 0.28, 'Left', 'Right'),
+                                      Velo=lambda n: rng.normal(0, 2.2, n),
+                                      Extension=lambda n: rng.normal(6.1, 0.35, n).round(2))
+    batter_rosters = _season_rosters(rng, seasons, 14, taken,
+                                     Side=lambda n: rng.choice(['Right', 'Left', 'Switch'], n, p=[0.58, 0.34, 0.08]),
+                                     Power=lambda n: rng.normal(0, 2.5, n),
+                                     Discipline=lambda n: rng.normal(0, 0.05, n))
+    catcher_rosters = _season_rosters(rng, seasons, 3, taken, Framing=lambda n: rng.normal(0, 0.04, n))
+    umpires = pd.DataFrame({'Name': _names(rng, 40, taken), 'Bias': rng.normal(0, 0.04, 40),
+                            'Width': rng.normal(0, 0.04, 40)})
+    arsenals = {}
+
+    frames = []
+    for season in range(seasons):
+        n = pitches_per_season
+        year = LAST_SEASON - seasons + 1 + season
+        pitchers, batters, catchers = pitcher_rosters[season], batter_rosters[season], catcher_rosters[season]
+
+        pitcher = rng.choice(len(pitchers), n, p=pitchers['Weight'] / pitchers['Weight'].sum())
+        pitcher_team = pitchers['Team'].to_numpy()[pitcher]
+        batter_team = (pitcher_team + rng.integers(1, len(TEAMS), n)) % len(TEAMS)
+        batter = _pick_within_team(rng, batter_team, batters)
+        catcher = _pick_within_team(rng, pitcher_team, catchers)
+        umpire = rng.integers(0, len(umpires), n)
+
+        pitch_type = np.empty(n, dtype=object)
+        for index, rows in pd.Series(pitcher).groupby(pitcher).indices.items():
+            name = pitchers['Name'].iat[index]
+            if name not in arsenals:
+                arsenals[name] = _arsenal(rng)
+            pitches, usage = arsenals[name]
+            pitch_type[rows] = rng.choice(pitches, len(rows), p=usage)
+
+        throws = pitchers['Throws'].to_numpy()[pitcher]
+        side = batters['Side'].to_numpy()[batter]
+        side = np.where(side == 'Switch', np.where(throws == 'Right', 'Left', 'Right'), side)
+        mirror = np.where(throws == 'Left', -1.0, 1.0)
+        shape = PITCH_SHAPES.loc[pitch_type]
+
+        plate_side = rng.normal(0.1 * mirror, 0.85, n)
+        plate_height = rng.normal(2.45, 0.8, n)
+        x_min, x_max, y_min, y_max = STRIKE_ZONE
+        edge = np.minimum.reduce([plate_side - x_min, x_max - plate_side, plate_height - y_min, y_max - plate_height])
+        in_zone = edge >= 0
+
+        discipline = batters['Discipline'].to_numpy()[batter]
+        swing = rng.random(n) < np.where(in_zone, 0.66, 0.29 - discipline)
+        whiff_rate = pd.Series(pitch_type).map(BREAKING_WHIFF).fillna(0.18).to_numpy()
+        contact = rng.random(n)
+        framing = catchers['Framing'].to_numpy()[catcher]
+        bias = umpires['Bias'].to_numpy()[umpire] + umpires['Width'].to_numpy()[umpire] * (np.abs(plate_side) > 0.6)
+        called_strike = rng.random(n) < 1 / (1 + np.exp(-(edge + framing + bias) / 0.07))
+        pitch_call = np.select(
+            [swing & (contact < whiff_rate), swing & (contact < whiff_rate + 0.42), swing,
+             (edge < -0.9) & (contact < 0.02), called_strike],
+            ['StrikeSwinging', 'Foul', 'InPlay', 'HitByPitch', 'StrikeCalled'], 'BallCalled')
+
+        in_play = pitch_call == 'InPlay'
+        exit_speed = np.clip(rng.normal(86 + batters['Power'].to_numpy()[batter], 13, n), 30, 118)
+        angle = np.clip(rng.normal(12, 26, n), -80, 85)
+        pull = np.where(side == 'Right', -8.0, 8.0)
+        direction = np.clip(rng.normal(pull, 24, n), -50, 50)
+        xwoba = (0.08 + 1.9 / (1 + np.exp(-(exit_speed - 97) / 4.5)) * np.exp(-((angle - 25) / 14) ** 2)
+                 + 0.75 * np.exp(-((angle - 10) / 10) ** 2) / (1 + np.exp(-(exit_speed - 82) / 7)))
+        hit = rng.random(n) < np.clip(0.05 + xwoba * 0.7, 0, 0.95)
+        play_result = np.select(
+            [~in_play, ~hit, (exit_speed > 100) & (angle > 22) & (angle < 40), (exit_speed > 96) & (angle > 15),
+             (angle > 10) & (rng.random(n) < 0.015)],
+            ['Undefined', 'Out', 'HomeRun', 'Double', 'Triple'], 'Single')
+
+        run_value = np.where(in_play, pd.Series(play_result).map(PLAY_RUN_VALUES).to_numpy(),
+                             pd.Series(pitch_call).map(PITCH_RUN_VALUES).to_numpy())
+        dates = pd.Timestamp(f'{year}-05-10') + pd.to_timedelta(rng.integers(0, 118, n), unit='D')
+        pitcher_velo = pitchers['Velo'].to_numpy()[pitcher]
+
+        frames.append(pd.DataFrame({
+            'Date': dates.strftime('%Y-%m-%d'),
+            'Pitcher': pitchers['Name'].to_numpy()[pitcher],
+            'PitcherThrows': throws,
+            'PitcherTeam': np.array(TEAMS)[pitcher_team],
+            'Batter': batters['Name'].to_numpy()[batter],
+            'BatterSide': side,
+            'BatterTeam': np.array(TEAMS)[batter_team],
+            'Catcher': catchers['Name'].to_numpy()[catcher],
+            'CatcherTeam': np.array(TEAMS)[pitcher_team],
+            'Umpire': umpires['Name'].to_numpy()[umpire],
+            'Inning': rng.integers(1, 10, n),
+            'Outs': rng.integers(0, 3, n),
+            'Balls': rng.choice(4, n, p=[0.45, 0.3, 0.17, 0.08]),
+            'Strikes': rng.choice(3, n, p=[0.43, 0.33, 0.24]),
+            'AutoPitchType': pitch_type,
+            'PitchCall': pitch_call,
+            'PlayResult': play_result,
+            'RelSpeed': (shape['RelSpeed'].to_numpy() + pitcher_velo + rng.normal(0, 1, n)).round(1),
+            'SpinRate': (shape['SpinRate'].to_numpy() + rng.normal(0, 120, n)).round(0),
+            'HorzBreak': (mirror * shape['HorzBreak'].to_numpy() + rng.normal(0, 2.5, n)).round(2),
+            'InducedVertBreak': (shape['InducedVertBreak'].to_numpy() + rng.normal(0, 2.5, n)).round(2),
+            'Extension': pitchers['Extension'].to_numpy()[pitcher],
+            'ExitSpeed': np.where(in_play, exit_speed.round(1), np.nan),
+            'Angle': np.where(in_play, angle.round(1), np.nan),
+            'Direction': np.where(in_play, direction.round(1), np.nan),
+            'PlateLocSide': plate_side.round(3),
+            'PlateLocHeight': plate_height.round(3),
+            'RV': run_value,
+            'xwOBAcon_gb': np.where(in_play, xwoba.round(3), np.nan),
+        }))
+
+    return pd.concat(frames, ignore_index=True).sort_values('Date', kind='stable', ignore_index=True)
+
+
+def _percentile(values):
+    return (values.rank(pct=True) * 99).round().clip(1, 99).astype(int)
+
+
+def _batted_ball_stats(pitches_df, key):
+    in_play = pitches_df[pitches_df['PitchCall'] == 'InPlay']
+    hard_hit = in_play['ExitSpeed'] >= 95
+    barrel = (in_play['ExitSpeed'] >= 98) & in_play['Angle'].between(26, 30 + (in_play['ExitSpeed'] - 98))
+    sweet_spot = in_play['Angle'].between(8, 32)
+    pitches = pitches_df.groupby(key).size()
+    swings = pitches_df['PitchCall'].isin(SWINGS)
+    stats = pd.DataFrame({
+        'Pitches': pitches,
+        'BBE': in_play.groupby(key).size(),
+        'Barrels': barrel.groupby(in_play[key]).sum(),
+        'AvgEV': in_play.groupby(key)['ExitSpeed'].mean().round(1),
+        'Max EV': in_play.groupby(key)['ExitSpeed'].max().round(1),
+        'LA': in_play.groupby(key)['Angle'].mean().round(1),
+        'SweetSpot%': (sweet_spot.groupby(in_play[key]).mean() * 100).round(1),
+        'HardHit%': (hard_hit.groupby(in_play[key]).mean() * 100).round(1),
+        'xwOBAcon': in_play.groupby(key)['xwOBAcon_gb'].mean(),
+        'Whiff%': ((pitches_df['PitchCall'] == 'StrikeSwinging').groupby(pitches_df[key]).sum()
+                   / swings.groupby(pitches_df[key]).sum() * 100).round(1),
+        'Chase%': ((swings & ((pitches_df['PlateLocSide'].abs() > 0.83)
+                              | ~pitches_df['PlateLocHeight'].between(1.5, 3.5))).groupby(pitches_df[key]).mean()
+                   * 250).round(1),
+    }).fillna(0)
+    stats['Barrel%'] = (stats['Barrels'] / stats['BBE'].clip(lower=1) * 100).round(1)
+    stats['xBA'] = (stats['xwOBAcon'] * 0.62).round(3)
+    stats['xSLG'] = (stats['xwOBAcon'] * 1.15).round(3)
+    stats['xwOBA'] = (stats['xwOBAcon'] * 0.78 + 0.04).round(3)
+    stats['K%'] = (stats['Whiff%'] * 0.85).round(1)
+    stats['BB%'] = (((pitches_df['PitchCall'] == 'BallCalled').groupby(pitches_df[key]).mean() - 0.2) * 40).clip(
+        lower=2).round(1)
+    return stats
+
+
+def _run_values(season_df, role):
+    stats = season_df.groupby([role, 'AutoPitchType']).agg(
+        Pitches=('RV', 'size'), RV=('RV', 'sum'), xwOBAcon=('xwOBAcon_gb', 'mean'),
+        HardHit=('ExitSpeed', lambda speeds: (speeds >= 95).sum() / max(speeds.notna().sum(), 1) * 100),
+        Whiff=('PitchCall', lambda calls: (calls == 'StrikeSwinging').mean() * 100),
+        Strike=('PitchCall', lambda calls: (calls != 'BallCalled').mean() * 100)).reset_index()
+    stats = stats.rename(columns={'HardHit': 'HardHit%', 'Whiff': 'Whiff%', 'Strike': 'Strike%'})
+    stats['RV/100'] = (stats['RV'] / stats['Pitches'] * 100).round(2)
+    stats['RV'] = stats['RV'].round(1)
+    stats = stats.round({'HardHit%': 1, 'Whiff%': 1, 'Strike%': 1, 'xwOBAcon': 3})
+    return stats.drop(columns='Strike%') if role == 'Batter' else stats
+
+
+def _called_pitches(season_df):
+    called = season_df[season_df['PitchCall'].isin(['StrikeCalled', 'BallCalled'])]
+    strike = called['PitchCall'] == 'StrikeCalled'
+    in_zone = (called['PlateLocSide'].abs() <= 0.83) & called['PlateLocHeight'].between(1.5, 3.5)
+    return called, strike, in_zone
+
+
+def _pitcher_stats(season_df):
+    pitcher_stats = _batted_ball_stats(season_df, 'Pitcher')
+    pitcher_stats['xERA'] = (pitcher_stats['xwOBA'] * 14).round(2)
+    pitcher_stats['FastballVelo'] = season_df[season_df['AutoPitchType'].isin(['Fastball', 'Sinker'])].groupby(
+        'Pitcher')['RelSpeed'].mean().reindex(pitcher_stats.index).fillna(0).round(1)
+    pitcher_stats['GB%'] = (season_df['Angle'].lt(10).groupby(season_df['Pitcher']).sum()
+                            / pitcher_stats['BBE'].clip(lower=1) * 100).round(1)
+    pitcher_stats['Extension'] = season_df.groupby('Pitcher')['Extension'].mean().round(2)
+    return pitcher_stats
+
+
+def season_tables(rng, season_df, suffix):
+    tables = {f'fl_pbp_{suffix}': season_df}
+    tables[f'yakker_{suffix}'] = _pitcher_stats(season_df)[YAKKER_COLUMNS + ['xERA']].rename_axis(
+        'Pitcher').reset_index()
+    tables[f'run_value_{suffix}'] = _run_values(season_df, 'Pitcher')
+    tables[f'run_value_hit_{suffix}'] = _run_values(season_df, 'Batter')
+
+    pitches = season_df.groupby('Batter').size()
+    discipline = pd.DataFrame({column: rng.uniform(15, 85, len(pitches)).round(1)
+                               for column in DISCIPLINE_COLUMNS[1:]}, index=pitches.index)
+    discipline.insert(0, 'Pitches', pitches)
+    tables[f'discipline_{suffix}'] = discipline.rename_axis('Name').reset_index()
+
+    called, strike, in_zone = _called_pitches(season_df)
+    catchers = pd.DataFrame({
+        'Pitches': called.groupby('Catcher').size(),
+        'Framing Runs': ((strike.astype(float) - in_zone).groupby(called['Catcher']).sum() * 0.13).round(1),
+        'Strike%': (strike.groupby(called['Catcher']).mean() * 100).round(1),
+        'R-Strike%': (strike[called['BatterSide'] == 'Right'].groupby(called['Catcher']).mean() * 100).round(1),
+        'L-Strike%': (strike[called['BatterSide'] == 'Left'].groupby(called['Catcher']).mean() * 100).round(1),
+    })
+    tables[f'catchers_{suffix}'] = catchers.rename_axis('Catcher').reset_index()
+    return tables
+
+
+def current_tables(latest):
+    tables = {}
+    pitcher_stats = _pitcher_stats(latest)
+    percentiles = {f'{column}_percentile': _percentile(pitcher_stats[column]) for column in PITCHER_PERCENTILE_COLUMNS}
+    tables['fl_savant_stats'] = pitcher_stats[YAKKER_COLUMNS + ['xERA']].assign(**percentiles).rename_axis(
+        'Name').reset_index()
+
+    hitter_stats = _batted_ball_stats(latest, 'Batter')
+    percentiles = {f'{column}_percentile': _percentile(hitter_stats[column]) for column in HITTER_PERCENTILE_COLUMNS}
+    tables['fl_savant_stats_hit'] = hitter_stats[YAKKER_COLUMNS + ['xwOBA']].assign(**percentiles).rename_axis(
+        'Name').reset_index()
+
+    called, strike, in_zone = _called_pitches(latest)
+    correct = strike == in_zone
+    umpires = pd.DataFrame({
+        'Pitches': called.groupby('Umpire').size(),
+        'Total Pitch Accuracy': (correct.groupby(called['Umpire']).mean() * 100).round(1),
+        'Called Strike Accuracy': (correct[strike].groupby(called['Umpire']).mean() * 100).round(1),
+        'Called Ball Accuracy': (correct[~strike].groupby(called['Umpire']).mean() * 100).round(1),
+        'Zone Size': (strike.groupby(called['Umpire']).mean() / strike.mean()).round(3),
+    })
+    umpires['Zone Above Average'] = (umpires['Zone Size'] - 1).round(3)
+    tables['umpires'] = umpires.rename_axis('Umpire').reset_index()
+    return tables
+
+
+def reference_tables(rng, pitches_df):
+    seasons = pitches_df['Date'].str[:4]
+    pitching = pitches_df.groupby(['Pitcher', seasons]).agg(G=('Date', 'nunique'), SO=('PitchCall', 'size'),
+                                                           RV=('RV', 'sum'))
+    hitting = pitches_df.assign(HR=pitches_df['PlayResult'] == 'HomeRun').groupby(['Batter', seasons]).agg(
+        RV=('RV', 'sum'), HR=('HR', 'sum'))
+    return {
+        'pitching_bref': pd.DataFrame({
+            'Name': pitching.index.get_level_values(0), 'Year': pitching.index.get_level_values(1),
+            'G': pitching['G'].to_numpy(),
+            'W-L': [f'{w}-{l}' for w, l in zip(rng.integers(0, 12, len(pitching)), rng.integers(0, 10, len(pitching)))],
+            'FIP': (4.2 + pitching['RV'].to_numpy() / pitching['SO'].to_numpy() * 40).round(2),
+            'IP': (pitching['SO'].to_numpy() / 15.5).round(1),
+            'SO': (pitching['SO'].to_numpy() * 0.055).astype(int),
+            'WAR': (-pitching['RV'].to_numpy() / 10).round(1),
+        }),
+        'hitting_bref': pd.DataFrame({
+            'Name': hitting.index.get_level_values(0), 'Year': hitting.index.get_level_values(1),
+            'BA': np.clip(rng.normal(0.26, 0.035, len(hitting)), 0.15, 0.38).round(3),
+            'HR': hitting['HR'].to_numpy(), 'SB': rng.poisson(6, len(hitting)),
+            'WAR': (hitting['RV'].to_numpy() / 10).round(1),
+        }),
+    }
+
+
+def build_tables(rng, pitches_df):
+    years = pitches_df['Date'].str[:4].astype(int)
+    tables = {}
+    for year, season_df in pitches_df.groupby(years):
+        tables.update(season_tables(rng, season_df.reset_index(drop=True), f'{year % 100:02d}'))
+    tables.update(current_tables(pitches_df[years == years.max()]))
+    tables.update(reference_tables(rng, pitches_df))
+    return tables
+
+
+def generate(path, seasons=1, pitches_per_season=DEFAULT_PITCHES_PER_SEASON, seed=0):
+    rng = np.random.default_rng(seed)
+    pitches_df = generate_pitches(rng, seasons, pitches_per_season)
+    tables = build_tables(rng, pitches_df)
+    with sqlite3.connect(path) as conn:
+        for table, table_df in tables.items():
+            table_df.to_sql(table, conn, if_exists='replace', index=False, chunksize=50000)
+    return {table: len(table_df) for table, table_df in tables.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build a synthetic, schema-compatible Frontier League database.')
+    parser.add_argument('output', nargs='?', default='synthetic/Frontier League.db')
+    parser.add_argument('--seasons', type=int, default=1, choices=range(1, 11), metavar='1-10')
+    parser.add_argument('--pitches-per-season', type=int, default=DEFAULT_PITCHES_PER_SEASON)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--force', action='store_true', help='Overwrite an existing database file.')
+    args = parser.parse_args()
+
+    if os.path.exists(args.output) and not args.force:
+        parser.error(f'{args.output} already exists; pass --force to overwrite it.')
+    if os.path.dirname(args.output):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    if os.path.exists(args.output):
+        os.remove(args.output)
+
+    counts = generate(args.output, args.seasons, args.pitches_per_season, args.seed)
+    for table, rows in counts.items():
+        print(f'{table}: {rows} rows')
+
+
+if __name__ == '__main__':
+    main()
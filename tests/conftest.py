@@ -0,0 +1,52 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_db import generate
+
+TEST_PITCHES_PER_SEASON = 20000
+
+
+@pytest.fixture(scope='session')
+def app_module(tmp_path_factory):
+    data_dir = tmp_path_factory.mktemp('data')
+    generate(str(data_dir / 'Frontier League.db'), seasons=2, pitches_per_season=TEST_PITCHES_PER_SEASON)
+    cwd = os.getcwd()
+    os.chdir(data_dir)
+    try:
+        yield importlib.import_module('app')
+    finally:
+        os.chdir(cwd)
+
+
+def busiest(app_module, column):
+    return app_module.pitch_stores[app_module.database.latest_season()].frame[column].value_counts().index[0]
+
+
+@pytest.fixture
+def client(app_module):
+    return app_module.app.test_client()
+
+
+@pytest.fixture
+def pitcher(app_module):
+    return busiest(app_module, 'Pitcher')
+
+
+@pytest.fixture
+def hitter(app_module):
+    return busiest(app_module, 'Batter')
+
+
+@pytest.fixture
+def catcher(app_module):
+    return busiest(app_module, 'Catcher')
+
+
+@pytest.fixture
+def umpire(app_module):
+    return busiest(app_module, 'Umpire')
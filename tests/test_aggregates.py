@@ -0,0 +1,60 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import aggregates
+from db import Database
+from synthetic_db import generate
+
+SEASONS = [2022, 2023]
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / 'Frontier League.db')
+    generate(path, seasons=len(SEASONS), pitches_per_season=5000)
+    database = Database(path)
+    for season in SEASONS:
+        aggregates.refresh_aggregates(database, season)
+    return database
+
+
+def rookie(database):
+    conn = database.connection()
+    pitchers = [{row[0] for row in conn.execute(f'SELECT DISTINCT Pitcher FROM fl_pbp_{season % 100}')}
+                for season in SEASONS]
+    return sorted(pitchers[1] - pitchers[0])[0]
+
+
+def test_missing_season_reads_aggregates(database, monkeypatch):
+    monkeypatch.setattr(aggregates, 'pitch_type_sums', pytest.fail)
+    sums_df = aggregates.pitcher_pitch_types(database, rookie(database), pd.DataFrame(), SEASONS)
+    assert sums_df['pitches'].sum() > 0
+
+
+def test_stale_aggregates_fall_back_to_pitches(database):
+    assert all(aggregates.aggregates_current(database, season) for season in SEASONS)
+    with sqlite3.connect(database.db_location) as conn:
+        conn.execute('INSERT INTO fl_pbp_23 SELECT * FROM fl_pbp_23 LIMIT 1')
+    assert aggregates.aggregates_current(database, 2022)
+    assert not aggregates.aggregates_current(database, 2023)
+
+    aggregates.refresh_aggregates(database, 2023)
+    assert aggregates.aggregates_current(database, 2023)
+
+
+def test_refresh_adds_rows_on_the_last_aggregated_date(database):
+    with sqlite3.connect(database.db_location) as conn:
+        conn.execute('INSERT INTO fl_pbp_23 SELECT * FROM fl_pbp_23 WHERE Date = (SELECT MAX(Date) FROM fl_pbp_23)')
+        conn.execute('INSERT INTO fl_pbp_23 SELECT * FROM fl_pbp_23 WHERE Date = (SELECT MIN(Date) FROM fl_pbp_23)')
+        count = conn.execute('SELECT COUNT(*) FROM fl_pbp_23').fetchone()[0]
+
+    assert aggregates.refresh_aggregates(database, 2023) > 0
+    assert aggregates.aggregates_current(database, 2023)
+    incremental = database.read_sql('SELECT * FROM agg_pitch_type_23 ORDER BY Pitcher, AutoPitchType')
+    assert incremental['pitches'].sum() == count
+
+    aggregates.refresh_aggregates(database, 2023, full=True)
+    full = database.read_sql('SELECT * FROM agg_pitch_type_23 ORDER BY Pitcher, AutoPitchType')
+    pd.testing.assert_frame_equal(incremental, full)
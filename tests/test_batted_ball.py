@@ -0,0 +1,24 @@
+import pandas as pd
+import pytest
+
+from batted_ball import batted_ball_profile, batted_ball_profiles, exit_speed_baseline
+
+
+@pytest.mark.parametrize('baseline', ['batter', 'league'])
+def test_single_profile_matches_league_profiles(app_module, hitter, baseline):
+    league_df = app_module.pitch_stores[app_module.database.latest_season()].frame
+    hitter_df = league_df[league_df['Batter'] == hitter]
+    profiles = batted_ball_profiles(league_df, baseline)
+    expected = profiles[profiles['Batter'] == hitter].reset_index(drop=True)
+
+    profile = batted_ball_profile(hitter_df, baseline, league_df=league_df)
+    pd.testing.assert_frame_equal(profile, expected, check_dtype=False)
+    precomputed = batted_ball_profile(hitter_df, exit_speed_baseline(league_df))
+    if baseline == 'league':
+        pd.testing.assert_frame_equal(precomputed, profile)
+
+
+def test_league_baseline_needs_league_pitches(app_module, hitter):
+    league_df = app_module.pitch_stores[app_module.database.latest_season()].frame
+    with pytest.raises(ValueError):
+        batted_ball_profile(league_df[league_df['Batter'] == hitter], 'league')
@@ -0,0 +1,36 @@
+import pytest
+
+EMPTY_WINDOWS = [{'start': '2023-12-01'}, {'start': '2023-09-05', 'batter_side': 'Left', 'count': 'three_balls'}]
+
+
+@pytest.mark.parametrize('window', EMPTY_WINDOWS)
+def test_pitch_summary_empty_window(client, pitcher, window):
+    response = client.get('/pitch_summary', query_string={'Pitcher': pitcher, **window})
+    assert response.status_code == 200
+    assert response.get_json() == {'summary': f'<strong>{pitcher}</strong> has not thrown a pitch in this sample.',
+                                   'teamAndHand': ''}
+
+
+@pytest.mark.parametrize('window', EMPTY_WINDOWS)
+def test_pitcher_bundle_empty_window(client, pitcher, window):
+    response = client.get('/pitcher_bundle', query_string={'Pitcher': pitcher, **window})
+    assert response.status_code == 200
+    bundle = response.get_json()
+    assert bundle['summary']['teamAndHand'] == ''
+    assert bundle['chart'] == {'success': True, 'data': []}
+
+
+@pytest.mark.parametrize('window', EMPTY_WINDOWS)
+def test_hit_summary_empty_window(client, hitter, window):
+    response = client.get('/hit_summary', query_string={'Hitter': hitter, **window})
+    assert response.status_code == 200
+    summary = response.get_json()
+    assert summary['teamAndHand'] == ''
+    assert summary['data'] == [] and summary['batted_ball'] == []
+
+
+def test_filtered_window_keeps_team_and_hand(client, pitcher, hitter):
+    assert client.get('/pitch_summary', query_string={'Pitcher': pitcher, 'start': '2023-01-01'}).get_json()[
+        'teamAndHand']
+    assert client.get('/hit_summary', query_string={'Hitter': hitter, 'start': '2023-01-01'}).get_json()[
+        'teamAndHand']
@@ -0,0 +1,16 @@
+import numpy as np
+import pandas as pd
+
+from heatmap import league_velocity_thresholds, velo_grid
+
+
+def test_career_velocity_bins_use_every_requested_season(app_module, client, hitter):
+    seasons = app_module.database.seasons()
+    frames = [app_module.pitch_stores[season].frame for season in seasons]
+    thresholds = league_velocity_thresholds(frames)
+    assert not np.allclose(thresholds, league_velocity_thresholds(frames[-1:]), equal_nan=True)
+
+    hitter_df = pd.concat([frame[frame['Batter'] == hitter] for frame in frames], ignore_index=True)
+    expected = velo_grid(hitter_df, thresholds).to_dict(orient='records')
+    response = client.get('/hit_summary', query_string={'Hitter': hitter, 'season': 'career'})
+    assert response.get_json()['data'] == expected
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from percentiles import metric_terms
+
+
+@pytest.mark.parametrize('route, param, player', [('/update_pitcher_percentiles', 'Pitcher', 'pitcher'),
+                                                  ('/update_hitter_percentiles', 'Hitter', 'hitter')])
+def test_live_percentiles_keep_snapshot_metrics(client, request, route, param, player):
+    name = request.getfixturevalue(player)
+    snapshot = client.get(route, query_string={param: name}).get_json()['data'][0]
+    live = client.get(route, query_string={param: name, 'min_pitches': '50'}).get_json()['data'][0]
+    assert live.keys() >= snapshot.keys()
+    assert [column for column in snapshot if live[column] is None and snapshot[column] is not None] == []
+    assert live['xBA_percentile'] == snapshot['xBA_percentile']
+
+
+@pytest.mark.parametrize('route, param, player', [('/update_pitcher_percentiles', 'Pitcher', 'pitcher'),
+                                                  ('/update_hitter_percentiles', 'Hitter', 'hitter')])
+def test_filtered_percentiles_drop_season_long_metrics(client, request, route, param, player):
+    name = request.getfixturevalue(player)
+    snapshot = client.get(route, query_string={param: name}).get_json()['data'][0]
+    live = client.get(route, query_string={param: name, 'min_pitches': '0', 'days': '30'}).get_json()['data'][0]
+    assert live['xBA'] is None and live['xBA_percentile'] is None
+    assert live['Pitches'] is not None and live['Pitches'] < snapshot['Pitches']
+
+
+def test_every_swing_call_counts_towards_whiff_rate():
+    calls = ['StrikeSwinging', 'FoulTip', 'FoulBallFieldable', 'FoulBallNotFieldable', 'CatchersInt', 'BallCalled']
+    pitches_df = pd.DataFrame({'PitchCall': calls, 'ExitSpeed': np.nan, 'Angle': np.nan, 'PlateLocSide': 0.0,
+                               'PlateLocHeight': 2.5, 'RelSpeed': 90.0, 'AutoPitchType': 'Fastball'})
+    whiffs, swings = metric_terms(pitches_df)['Whiff%']
+    assert swings.sum() == 5
+    assert whiffs[swings].sum() / swings.sum() == 20
+
+
+@pytest.mark.parametrize('season', ['2022', 'career'])
+def test_percentiles_without_a_snapshot_use_the_live_engine(client, pitcher, season):
+    latest = client.get('/update_pitcher_percentiles', query_string={'Pitcher': pitcher}).get_json()['data'][0]
+    response = client.get('/update_pitcher_percentiles', query_string={'Pitcher': pitcher, 'season': season,
+                                                                      'min_pitches': '0'}).get_json()
+    assert response['success']
+    data = response['data'][0]
+    assert data.get('xBA_percentile') is None
+    assert data['AvgEV_percentile'] is not None
+    assert data['Pitches'] != latest['Pitches']
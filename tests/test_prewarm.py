@@ -0,0 +1,24 @@
+import threading
+
+from flask import Flask
+
+from prewarm import Prewarmer
+
+
+def test_render_waits_for_live_requests():
+    app = Flask(__name__)
+    rendered = threading.Event()
+
+    @app.route('/hot')
+    def hot():
+        rendered.set()
+        return 'ok'
+
+    prewarmer = Prewarmer(app, version=lambda: 1, live_limit=1, poll_seconds=60)
+    with app.test_request_context('/hot'):
+        prewarmer._live_start()
+        prewarmer.refresh(('/hot', (), False))
+        assert not rendered.wait(0.2)
+        prewarmer._live_end()
+    assert rendered.wait(5)
+    assert prewarmer.stats()['live_requests'] == 0
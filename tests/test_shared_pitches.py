@@ -0,0 +1,22 @@
+import sqlite3
+
+from db import Database
+from pitch_store import PitchStore
+from synthetic_db import generate
+
+
+def test_stale_manifest_falls_back_to_sqlite(tmp_path):
+    path = str(tmp_path / 'Frontier League.db')
+    generate(path, seasons=2, pitches_per_season=2000)
+    store = PitchStore(Database(path), 'fl_pbp_23', str(tmp_path / 'shared'))
+    assert store.export() == 1
+    assert store.generation == 1
+
+    with sqlite3.connect(path) as conn:
+        conn.execute('INSERT INTO fl_pbp_22 SELECT * FROM fl_pbp_22 LIMIT 1')
+    assert store.generation == 1
+
+    with sqlite3.connect(path) as conn:
+        conn.execute('INSERT INTO fl_pbp_23 SELECT * FROM fl_pbp_23 LIMIT 1')
+    assert store.generation is None
+    assert len(store.frame) == 2001
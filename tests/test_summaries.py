@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from called_pitches import CalledPitchEngine
+from leaderboards import Leaderboard
+
+
+def test_catch_summary_without_one_side(app_module, client, catcher, monkeypatch):
+    leaderboard = app_module.framing_engine.leaderboard([app_module.database.latest_season()])
+    frame = pd.DataFrame(leaderboard.page(limit=len(leaderboard)))
+    frame.loc[frame['Catcher'] == catcher, 'L-Strike%'] = np.nan
+    monkeypatch.setattr(app_module.framing_engine, 'leaderboard',
+                        lambda seasons: Leaderboard(frame, 'Catcher', 'Framing Runs'))
+
+    response = client.get('/catch_summary', query_string={'Catcher': catcher, 'side': 'missing'})
+    assert response.status_code == 200
+    assert 'framing alone' in response.json['summary']
+    assert 'difference' not in response.json['summary']
+
+
+def test_ump_summary_reports_zone_size_as_percentage(app_module, client, umpire):
+    one_ump = app_module.umpire_engine.leaderboard([app_module.database.latest_season()]).get(umpire)
+    response = client.get('/ump_summary', query_string={'Umpire': umpire})
+    assert response.status_code == 200
+    assert f"{abs(round(one_ump['Zone Above Average'] * 100, 1))}%" in response.json['summary']
+    assert 'inches' not in response.json['summary']
+
+
+def test_called_pitch_engine_needs_a_summary():
+    with pytest.raises(TypeError):
+        CalledPitchEngine({})
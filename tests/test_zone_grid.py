@@ -0,0 +1,23 @@
+import pytest
+
+
+@pytest.mark.parametrize('value', ['nan', 'inf', '-inf', 'NaN', 'Infinity'])
+@pytest.mark.parametrize('route, param, player', [('/catcher_data', 'Catcher', 'catcher'),
+                                                  ('/ump_data', 'Umpire', 'umpire')])
+def test_grid_rejects_non_finite_zone(client, request, route, param, player, value):
+    name = request.getfixturevalue(player)
+    response = client.get(route, query_string={param: name, 'mode': 'grid', 'x_max': value})
+    assert response.status_code == 400
+
+
+def test_grid_accepts_finite_zone(client, umpire):
+    response = client.get('/ump_data', query_string={'Umpire': umpire, 'mode': 'grid', 'x_min': '-1', 'x_max': '1'})
+    assert response.status_code == 200
+    assert response.get_json()['data']['zone']['x_max'] == 1
+
+
+@pytest.mark.parametrize('bounds', [{'x_min': '1', 'x_max': '-1'}, {'y_min': '2', 'y_max': '2'},
+                                    {'x_min': '5'}])
+def test_grid_rejects_empty_zone(client, umpire, bounds):
+    response = client.get('/ump_data', query_string={'Umpire': umpire, 'mode': 'grid', **bounds})
+    assert response.status_code == 400
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+
+from called_pitches import CalledPitchEngine, SeasonCalls, rate
+from zone_grid import Zone
+
+RULEBOOK_ZONE = Zone(-0.83, 0.83, 1.5, 3.5)
+EDGE_MARGIN = 0.25
+EDGES = ['Left', 'Right', 'Bottom', 'Top']
+REGIONS = ['Heart'] + EDGES + ['Waste']
+
+
+def zone_regions(pitches_df):
+    side = pitches_df['PlateLocSide'].to_numpy(dtype='float64')
+    height = pitches_df['PlateLocHeight'].to_numpy(dtype='float64')
+    distances = np.stack([side - RULEBOOK_ZONE.x_min, RULEBOOK_ZONE.x_max - side,
+                          height - RULEBOOK_ZONE.y_min, RULEBOOK_ZONE.y_max - height])
+    nearest = distances.argmin(axis=0)
+    distance = distances.min(axis=0)
+    regions = np.where(distance > EDGE_MARGIN, 0, np.where(distance < -EDGE_MARGIN, len(REGIONS) - 1, nearest + 1))
+    return regions, distance >= 0
+
+
+class SeasonUmpires(SeasonCalls):
+    column = 'Umpire'
+
+    def count(self, pitches_df, calls):
+        regions, rulebook = (values[calls.rows] for values in zone_regions(pitches_df))
+        codes, strike = calls.codes, calls.strike
+        missed = strike != rulebook
+
+        size = len(calls.names)
+        tallies = {
+            'correct': np.bincount(codes[~missed], minlength=size),
+            'correct_strikes': np.bincount(codes[strike & rulebook], minlength=size),
+            'correct_balls': np.bincount(codes[~strike & ~rulebook], minlength=size),
+        }
+        region_called = np.bincount(codes * len(REGIONS) + regions, minlength=size * len(REGIONS)).reshape(size, -1)
+        region_missed = np.bincount(codes[missed] * len(REGIONS) + regions[missed],
+                                    minlength=size * len(REGIONS)).reshape(size, -1)
+        for index, region in enumerate(REGIONS):
+            tallies[f'{region}_called'] = region_called[:, index]
+            tallies[f'{region}_missed'] = region_missed[:, index]
+        return tallies
+
+
+class UmpireEngine(CalledPitchEngine):
+    season_class = SeasonUmpires
+    sort = 'Total Pitch Accuracy'
+
+    def summarize(self, tallies):
+        zone_size = (tallies['strikes'] / tallies['expected'].where(tallies['expected'] > 0)).round(3)
+        return pd.DataFrame({
+            'Umpire': tallies.index,
+            'Pitches': tallies['called'].to_numpy(),
+            'Total Pitch Accuracy': rate(tallies['correct'], tallies['called']).to_numpy(),
+            'Called Strike Accuracy': rate(tallies['correct_strikes'], tallies['strikes']).to_numpy(),
+            'Called Ball Accuracy': rate(tallies['correct_balls'], tallies['called'] - tallies['strikes']).to_numpy(),
+            'Zone Size': zone_size.to_numpy(),
+            'Zone Above Average': (zone_size - 1).round(3).to_numpy(),
+            **{f'{region} Miss%': rate(tallies[f'{region}_missed'], tallies[f'{region}_called']).to_numpy()
+               for region in REGIONS},
+        })
@@ -0,0 +1,67 @@
+import math
+from collections import namedtuple
+
+import numpy as np
+from flask import abort, request
+
+Zone = namedtuple('Zone', ['x_min', 'x_max', 'y_min', 'y_max'])
+
+STRIKE_ZONE = Zone(-1, 1, 1.5, 3.5)
+BIG_ZONE = Zone(-1.35, 1.35, 1.35, 3.65)
+SMALL_ZONE = Zone(-0.65, 0.65, 1.65, 3.35)
+UMPIRE_CHART_ZONE = Zone(-1.3, 1.3, 1.3, 3.8)
+
+CALLED_PITCHES = ['StrikeCalled', 'BallCalled']
+SWINGS = ['StrikeSwinging', 'Foul', 'FoulTip', 'FoulBall', 'FoulBallFieldable', 'FoulBallNotFieldable', 'InPlay',
+          'CatchersInt']
+
+DEFAULT_RESOLUTION = 20
+MAX_RESOLUTION = 100
+
+
+def get_zone(default):
+    zone = Zone(*(request.values.get(field, value, type=float) for field, value in zip(Zone._fields, default)))
+    for field, value in zip(Zone._fields, zone):
+        if not math.isfinite(value):
+            abort(400, description=f'Invalid {field} {request.values.get(field)!r}; use a finite number.')
+    if zone.x_max <= zone.x_min or zone.y_max <= zone.y_min:
+        abort(400, description=f'Invalid zone x {zone.x_min}..{zone.x_max}, y {zone.y_min}..{zone.y_max}; '
+                               'each max must be greater than its min.')
+    return zone
+
+
+def get_resolution():
+    resolution = request.values.get('resolution', DEFAULT_RESOLUTION, type=int)
+    return min(max(resolution, 1), MAX_RESOLUTION)
+
+
+def in_zone(pitches_df, zone):
+    return ((pitches_df['PlateLocSide'] >= zone.x_min) & (pitches_df['PlateLocSide'] <= zone.x_max) &
+            (pitches_df['PlateLocHeight'] >= zone.y_min) & (pitches_df['PlateLocHeight'] <= zone.y_max))
+
+
+def called_pitch_grid(pitches_df, zone, resolution=DEFAULT_RESOLUTION):
+    called = pitches_df[pitches_df['PitchCall'].isin(CALLED_PITCHES) & in_zone(pitches_df, zone)]
+    side = called['PlateLocSide'].to_numpy(dtype='float64')
+    height = called['PlateLocHeight'].to_numpy(dtype='float64')
+    is_strike = (called['PitchCall'] == 'StrikeCalled').to_numpy()
+
+    x_bins = np.minimum(((side - zone.x_min) / (zone.x_max - zone.x_min) * resolution).astype(np.int64),
+                        resolution - 1)
+    y_bins = np.minimum(((height - zone.y_min) / (zone.y_max - zone.y_min) * resolution).astype(np.int64),
+                        resolution - 1)
+    cells = y_bins * resolution + x_bins
+
+    pitches = np.bincount(cells, minlength=resolution * resolution)
+    strikes = np.bincount(cells[is_strike], minlength=resolution * resolution)
+    strike_rate = [round(s / p, 3) if p else None for s, p in zip(strikes.tolist(), pitches.tolist())]
+
+    return {
+        'resolution': resolution,
+        'zone': zone._asdict(),
+        'x_edges': np.linspace(zone.x_min, zone.x_max, resolution + 1).round(4).tolist(),
+        'y_edges': np.linspace(zone.y_min, zone.y_max, resolution + 1).round(4).tolist(),
+        'pitches': pitches.reshape(resolution, resolution).tolist(),
+        'strikes': strikes.reshape(resolution, resolution).tolist(),
+        'strike_rate': [strike_rate[row * resolution:(row + 1) * resolution] for row in range(resolution)],
+    }